@@ -1,10 +1,13 @@
 import os
 import sys
+import time
 
-from argparse import ArgumentError
+from argparse import ArgumentParser, Namespace
+from typing import TYPE_CHECKING
 
-from assembler.assembler import Assembler
-from schematic.schematic import create_schematic
+if TYPE_CHECKING:
+    from assembler.build_stats import BuildStats
+    from assembler.program_optimizer import ProgramOptimizer
 
 
 default_program: str = "example_program"
@@ -13,34 +16,190 @@ asm_folder: str = "asm_programs"
 mc_folder: str = "mc_programs"
 schem_folder: str = "schem_programs"
 
+max_emulated_instructions: int = 100_000_000
+max_profiled_instructions: int = 10_000_000
+collapsed_stacks_extension: str = "folded"
 
+output_flags: tuple[str, ...] = ("mc", "bin", "hex", "schem")
+
+
+def launch_program(program_name: str,
+                   incremental_schematic: bool = False,
+                   outputs: frozenset[str] | None = None,
+                   stats_format: str | None = None,
+                   optimize: bool = False) -> None:
+    from assembler.assembler import Assembler
+    from builder.program_builder import build_program, default_outputs
+
+    stats: BuildStats | None = None
+    if stats_format is not None:
+        from assembler.build_stats import BuildStats
+
+        stats = BuildStats()
+    optimizers: tuple[ProgramOptimizer, ...] = create_optimizers(optimize)
+
+    assembler: Assembler = build_program(program_name, asm_folder, mc_folder, schem_folder, incremental_schematic,
+                                         outputs=default_outputs if outputs is None else outputs, stats=stats,
+                                         optimizers=optimizers)
+
+    for register_allocator in assembler.register_allocators:
+        print(register_allocator.report())
+    for optimizer in optimizers:
+        print(optimizer.report())
+    if stats is not None:
+        print(stats.to_json() if stats_format == "json" else stats.report())
+
+
+def create_optimizers(optimize: bool) -> "tuple[ProgramOptimizer, ...]":
+    if not optimize:
+        return ()
+
+    from assembler.block_layout import BlockLayoutOptimizer
+    from assembler.dataflow_optimizer import DataflowOptimizer
+    from assembler.peephole_optimizer import PeepholeOptimizer
+    from builder.program_builder import amount_registers
+
+    return (BlockLayoutOptimizer(amount_registers), DataflowOptimizer(amount_registers),
+            PeepholeOptimizer(amount_registers))
+
+
+def launch_menu(outputs: frozenset[str] | None = None,
+                stats_format: str | None = None,
+                optimize: bool = False) -> None:
+    program_name: str = input("Enter a program name : ")
+    launch_program(program_name, outputs=outputs, stats_format=stats_format, optimize=optimize)
+
+
+def launch_batch(outputs: frozenset[str] | None = None) -> None:
+    from builder.batch_builder import build_all
+    from builder.program_builder import default_outputs
+
+    built_programs, skipped_programs, failed_programs = build_all(asm_folder, mc_folder, schem_folder,
+                                                                  outputs=default_outputs if outputs is None
+                                                                  else outputs)
+
+    print(f"Built {len(built_programs)} program(s), {len(skipped_programs)} up to date.")
+    for program_name, error in failed_programs.items():
+        print(f"Failed to build {program_name} : {error}")
+
+    if len(failed_programs) != 0:
+        sys.exit(1)
+
+
+def launch_watcher(outputs: frozenset[str] | None = None) -> None:
+    from builder.program_builder import default_outputs
+    from builder.watcher import ProgramWatcher
+
+    ProgramWatcher(asm_folder, mc_folder, schem_folder,
+                   outputs=default_outputs if outputs is None else outputs).watch()
+
+
+def launch_emulator(program_name: str) -> None:
+    from assembler.file_manipulations import read_machine_code_file
+    from emulator.block_compiler import BlockCompilerEmulator
 
-def launch_program(program_name: str) -> None:
     full_as_file: str = f"{os.path.join(asm_folder, program_name)}.as"
-    full_mc_file: str = f"{os.path.join(mc_folder, program_name)}.mc"
-    full_schem_file: str = os.path.join(schem_folder, program_name)
+    full_bin_file: str = f"{os.path.join(mc_folder, program_name)}.bin"
+    if os.path.exists(full_as_file) or not os.path.exists(full_bin_file):
+        launch_program(program_name, outputs=frozenset({"bin"}))
+
+    emulator = BlockCompilerEmulator(read_machine_code_file(full_bin_file))
+    start_time: float = time.perf_counter()
+    executed_instructions: int = emulator.run(max_emulated_instructions)
+    elapsed_time: float = time.perf_counter() - start_time
+
+    print(f"Executed {executed_instructions} instructions in {elapsed_time:.3f}s "
+          f"({executed_instructions / max(elapsed_time, 1e-9) / 1e6:.2f} MIPS)")
+    print(f"Registers : {emulator.registers}")
+    print(f"Flags : zero={emulator.zero_flag} carry={emulator.carry_flag}")
+    if not emulator.halted:
+        print(f"The program did not halt after {max_emulated_instructions} instructions.")
+
 
+def launch_profiler(program_name: str, optimize: bool = False, tick_costs_file: str | None = None) -> None:
+    from assembler.assembler import Assembler
+    from assembler.source_line import SourceLine
+    from builder.module_imports import find_linked_libraries
+    from builder.program_builder import amount_registers, max_instructions
+    from emulator.profiler import Profiler, default_tick_costs, load_tick_costs
+
+    full_as_file: str = f"{os.path.join(asm_folder, program_name)}.as"
     if not os.path.exists(full_as_file):
         raise FileNotFoundError(f"The file {full_as_file} does not exist.")
 
-    assembler = Assembler(16)
-    assembler.assemble_file(full_as_file, full_mc_file)
-    create_schematic(1024, full_mc_file, full_schem_file)
+    source_map: list[SourceLine] = []
+    optimizers: tuple[ProgramOptimizer, ...] = create_optimizers(optimize)
+    assembler = Assembler(amount_registers, optimizers=optimizers, source_map=source_map)
+    libraries: list[str] = find_linked_libraries(full_as_file, asm_folder)
+    if len(libraries) == 0:
+        machine_code: list[int] = assembler.assemble_file(full_as_file)
+    else:
+        from builder.object_builder import link_program
 
+        machine_code = link_program(program_name, full_as_file, libraries, asm_folder, mc_folder, assembler,
+                                    max_instructions)
+    for register_allocator in assembler.register_allocators:
+        print(register_allocator.report())
+    for optimizer in optimizers:
+        print(optimizer.report())
 
-def launch_menu() -> None:
-    program_name: str = input("Enter a program name : ")
-    launch_program(program_name)
+    tick_costs: dict[str, int] = default_tick_costs if tick_costs_file is None else load_tick_costs(tick_costs_file)
+    profiler = Profiler(machine_code, source_map, tick_costs)
+    profiler.run(max_profiled_instructions)
+
+    print(profiler.report())
+    if not profiler.emulator.halted:
+        print(f"The program did not halt after {max_profiled_instructions} instructions.")
+
+    collapsed_stacks_file: str = f"{os.path.join(mc_folder, program_name)}.{collapsed_stacks_extension}"
+    profiler.write_collapsed_stacks(collapsed_stacks_file)
+    print(f"Collapsed stacks written to {collapsed_stacks_file}")
+
+
+def parse_arguments() -> Namespace:
+    parser = ArgumentParser(prog="FlaPU", description="Assemble FlaPU programs into machine code and schematics.")
+    parser.add_argument("program", nargs="?", default=default_program, help="name of the program to build")
+
+    modes = parser.add_mutually_exclusive_group()
+    modes.add_argument("-m", "--menu", action="store_true", help="ask for the program name")
+    modes.add_argument("-a", "--all", action="store_true", help="build every stale program")
+    modes.add_argument("-w", "--watch", action="store_true", help="rebuild programs when they are saved")
+    modes.add_argument("-e", "--emulate", action="store_true", help="run the program in the emulator")
+    modes.add_argument("-p", "--patch", action="store_true", help="write a setblock delta of the schematic")
+    modes.add_argument("-P", "--profile", action="store_true",
+                       help="run the program and report where its instructions and ticks are spent")
+
+    for output in output_flags:
+        parser.add_argument(f"--{output}", action="store_true", help=f"write the .{output} output")
+
+    parser.add_argument("--stats", nargs="?", const="table", choices=("table", "json"),
+                        help="print the time and counters of each build stage")
+    parser.add_argument("-O", "--optimize", action="store_true",
+                        help="remove useless instructions before encoding and print what changed")
+    parser.add_argument("--ticks", metavar="FILE", help="JSON file giving the tick cost of each opcode when profiling")
+
+    return parser.parse_args()
+
+
+def selected_outputs(arguments: Namespace) -> frozenset[str] | None:
+    outputs: frozenset[str] = frozenset(output for output in output_flags if getattr(arguments, output))
+
+    return outputs if len(outputs) != 0 else None
 
 
 if __name__ == '__main__':
-    match len(sys.argv):
-        case 1:
-            launch_program(default_program)
-        case 2:
-            if sys.argv[1] == "-m":
-                launch_menu()
-            else:
-                launch_program(sys.argv[1])
-        case _:
-            raise ArgumentError(None, "Invalid argument")
+    arguments: Namespace = parse_arguments()
+    outputs: frozenset[str] | None = selected_outputs(arguments)
+
+    if arguments.menu:
+        launch_menu(outputs, arguments.stats, arguments.optimize)
+    elif arguments.all:
+        launch_batch(outputs)
+    elif arguments.watch:
+        launch_watcher(outputs)
+    elif arguments.emulate:
+        launch_emulator(arguments.program)
+    elif arguments.profile:
+        launch_profiler(arguments.program, arguments.optimize, arguments.ticks)
+    else:
+        launch_program(arguments.program, arguments.patch, outputs, arguments.stats, arguments.optimize)
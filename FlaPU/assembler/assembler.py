@@ -1,59 +1,280 @@
-from typing import Type
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import nullcontext
+from typing import TYPE_CHECKING
 
 from .exceptions.assembling_exception import AssemblingException
-from .file_manipulations import extract_file_content, write_to_file
+from .file_manipulations import MachineCodeWriter, extract_file_content, open_machine_code_writer
 from .exceptions.immediate_value_exception import ImmediateOperandsException
 from .exceptions.register_operands_exception import RegisterOperandsException
-from .instructions import Instruction, available_instructions
-from .instruction_parser import split_instruction_line
+from .instruction_parser import is_label, is_virtual_register
+from .instructions import InstructionSpec, available_instructions
+from .lexer import tokenize_definition_lines, tokenize_directive_lines, tokenize_lines
 from .preprocessor import Preprocessor
+from .source_line import SourceLine
+
+if TYPE_CHECKING:
+    from .build_stats import BuildStats
+    from .encoding_cache import EncodingCache
+    from .object_module import ObjectModule, Relocation
+    from .program_optimizer import ProgramOptimizer
+    from .register_allocator import RegisterAllocator
+
+
+assembly_stages: tuple[str, ...] = ("collect_definitions", "read", "tokenize", "remove_comments", "clean_instructions",
+                                    "associate_definitions", "allocate_registers", "optimize", "encode",
+                                    "resolve_labels", "write")
 
 
 class Assembler:
-    def __init__(self, amount_registers: int) -> None:
+    def __init__(self,
+                 amount_registers: int,
+                 encoding_cache: "EncodingCache | None" = None,
+                 stats: "BuildStats | None" = None,
+                 optimizers: "tuple[ProgramOptimizer, ...]" = (),
+                 source_map: list[SourceLine] | None = None) -> None:
         self.amount_available_registers: int = amount_registers
+        self.encoding_cache: EncodingCache | None = encoding_cache
+        self.stats: BuildStats | None = stats
+        self.optimizers: tuple[ProgramOptimizer, ...] = optimizers
+        self.source_map: list[SourceLine] | None = source_map
+        self.register_allocators: list[RegisterAllocator] = []
+
+    def assemble_line(self, instruction_line: SourceLine) -> int:
+        if self.encoding_cache is None:
+            return self.encode_line(instruction_line)
+
+        key: str = self.encoding_cache.make_key(instruction_line, self.amount_available_registers)
+        word: int | None = self.encoding_cache.get(key)
+        if word is None:
+            word = self.encode_line(instruction_line)
+            self.encoding_cache.put(key, word)
+
+        return word
 
-    def assemble_line(self, instruction_line: str) -> str:
+    def encode_line(self, instruction_line: SourceLine) -> int:
         try:
-            instruction: Instruction = self.parse_line(instruction_line)
-            instruction.are_operands_correct(self.amount_available_registers)
+            instruction: InstructionSpec = self.parse_line(instruction_line)
+            instruction.check_operands(instruction_line.operands, self.amount_available_registers)
         except (RegisterOperandsException, ImmediateOperandsException, AssemblingException) as e:
             new_message: str = f"Cannot assemble line : '{instruction_line}'. {str(e)}"
             raise RegisterOperandsException(new_message) from e
 
-        return instruction.assemble()
+        return instruction.encode(instruction_line.operands)
+
+    def assemble_file(self,
+                      asm_file_path: str,
+                      *machine_code_file_paths: str,
+                      keep_machine_code: bool = True) -> list[int]:
+        stats: BuildStats | None = self.stats
+        with stats.measure("collect_definitions") if stats is not None else nullcontext():
+            prepass_lines: list[SourceLine] = list(tokenize_definition_lines(extract_file_content(asm_file_path)))
+            definitions_table: dict[str, str] = Preprocessor.collect_definitions(prepass_lines)
+        uses_virtual_registers: bool = self.uses_virtual_registers(prepass_lines)
+
+        if stats is not None:
+            for stage_name in assembly_stages:
+                if ((stage_name != "optimize" or len(self.optimizers) != 0)
+                        and (stage_name != "allocate_registers" or uses_virtual_registers)):
+                    stats.stage(stage_name)
+
+        source_lines: Iterable[str] = extract_file_content(asm_file_path)
+        if stats is not None:
+            stats.count("collect_definitions", "definitions", len(definitions_table))
+            source_lines = stats.measure_iterator("read", source_lines)
+            source_lines = stats.measure_iterator("tokenize", tokenize_lines(source_lines))
+        else:
+            source_lines = tokenize_lines(source_lines)
+
+        instructions: Iterator[SourceLine] = Preprocessor.preprocess_lines(source_lines, definitions_table, stats)
+        if uses_virtual_registers:
+            instructions = self.allocate_registers(instructions)
+        for optimizer in self.optimizers:
+            instructions = optimizer.optimize_lines(instructions, stats)
+        if stats is not None and len(self.optimizers) != 0:
+            instructions = stats.measure_iterator("optimize", instructions)
+        words: Iterator[int] = self.assemble_lines(instructions)
+        if stats is not None:
+            words = stats.measure_iterator("resolve_labels", words)
+
+        machine_code_instructions: list[int] = []
+        writers: list[MachineCodeWriter] = []
+        try:
+            with stats.measure("write") if stats is not None else nullcontext():
+                for machine_code_file_path in machine_code_file_paths:
+                    writers.append(open_machine_code_writer(machine_code_file_path))
+
+                for word in words:
+                    for writer in writers:
+                        writer.write(word)
+                    if keep_machine_code:
+                        machine_code_instructions.append(word)
+        except BaseException:
+            for writer in writers:
+                writer.discard()
+            raise
+
+        with stats.measure("write") if stats is not None else nullcontext():
+            for writer in writers:
+                writer.close()
+
+        if stats is not None:
+            stats.count("write", "outputs", len(writers))
+
+        return machine_code_instructions
 
-    def assemble_file(self, asm_file_path: str, machine_code_file_path: str) -> None:
-        instructions: list[str] = extract_file_content(asm_file_path)
+    def assemble_object(self, asm_file_path: str, module_name: str) -> "ObjectModule":
+        from .object_module import ObjectModule
 
-        instructions = Preprocessor.preprocess_lines(instructions)
+        directive_lines: list[SourceLine] = list(tokenize_directive_lines(extract_file_content(asm_file_path)))
+        definitions_table: dict[str, str] = Preprocessor.collect_definitions(directive_lines)
+        exports: list[str] = Preprocessor.collect_module_directives(directive_lines, "export")
+        imports: list[str] = Preprocessor.collect_module_directives(directive_lines, "import")
 
-        machine_code_instructions: list[str] = self._assemble_lines(instructions)
+        instructions: Iterator[SourceLine] = Preprocessor.preprocess_lines(
+            tokenize_lines(extract_file_content(asm_file_path)), definitions_table, self.stats)
+        if self.uses_virtual_registers(directive_lines):
+            instructions = self.allocate_registers(instructions)
+        if len(exports) == 0:
+            for optimizer in self.optimizers:
+                instructions = optimizer.optimize_lines(instructions, self.stats)
 
-        write_to_file(machine_code_file_path, machine_code_instructions)
+        words: list[int] = []
+        symbols: dict[str, int] = {}
+        label_lines: dict[str, int] = {}
+        relocations: list[Relocation] = []
+        for address, instruction in enumerate(instructions):
+            for label in instruction.labels:
+                self.check_duplicate_label(label, label_lines, instruction.line_number, module_name)
+                symbols[label] = address
 
-    def _assemble_lines(self, instructions: list[str]) -> list[str]:
-        machine_code_instructions: list[str] = []
-        for instruction_line, instruction in enumerate(instructions):
             try:
-                machine_code_instructions.append(self.assemble_line(instruction))
+                words.append(self.assemble_line(instruction))
+            except (RegisterOperandsException, ImmediateOperandsException, AssemblingException) as e:
+                new_message: str = f"{str(e)} ({module_name} line {instruction.line_number})"
+                raise type(e)(new_message) from e
+            if self.source_map is not None:
+                self.source_map.append(instruction)
+
+            for operand in instruction.operands:
+                if is_label(operand):
+                    field_bits: int = available_instructions[instruction.opcode.upper()].label_field_bits
+                    relocations.append((address, operand, field_bits, instruction.line_number))
+
+        for label in exports:
+            if label not in symbols:
+                raise AssemblingException(f"Exported label '{label}' is not defined in {module_name}.")
+
+        return ObjectModule(module_name, words, symbols, exports, imports, relocations)
 
+    def allocate_registers(self, instructions: Iterator[SourceLine]) -> Iterator[SourceLine]:
+        from .register_allocator import RegisterAllocator
+
+        register_allocator = RegisterAllocator(self.amount_available_registers)
+        self.register_allocators.append(register_allocator)
+        instructions = register_allocator.allocate_lines(instructions, self.stats)
+        if self.stats is not None:
+            instructions = self.stats.measure_iterator("allocate_registers", instructions)
+
+        return instructions
+
+    @staticmethod
+    def uses_virtual_registers(prepass_lines: list[SourceLine]) -> bool:
+        return any(is_virtual_register(operand) for line in prepass_lines for operand in line.operands)
+
+    def assemble_lines(self, instructions: Iterable[SourceLine]) -> Iterator[int]:
+        labels_table: dict[str, int] = {}
+        label_lines: dict[str, int] = {}
+        fixups: dict[str, list[tuple[int, int, int]]] = {}
+        pending_words: list[int] = []
+        first_pending_address: int = 0
+        label_references: int = 0
+        forward_references: int = 0
+
+        stats: BuildStats | None = self.stats
+        source_map: list[SourceLine] | None = self.source_map
+        assemble_line: Callable[[SourceLine], int] = self.assemble_line
+        if stats is not None:
+            assemble_line = self.measured_assemble_line
+            cache_hits, cache_misses = self.cache_counters()
+
+        for address, instruction in enumerate(instructions):
+            for label in instruction.labels:
+                self.check_duplicate_label(label, label_lines, instruction.line_number)
+                labels_table[label] = address
+                for fixup_address, field_bits, line_number in fixups.pop(label, []):
+                    pending_words[fixup_address - first_pending_address] |= self.resolve_label(
+                        label, address, field_bits, line_number)
+
+            try:
+                word: int = assemble_line(instruction)
             except (RegisterOperandsException, ImmediateOperandsException, AssemblingException) as e:
-                new_message: str = f"{str(e)} (line {instruction_line + 1})"
+                new_message: str = f"{str(e)} (line {instruction.line_number})"
                 raise type(e)(new_message) from e
 
-        return machine_code_instructions
+            for operand in instruction.operands:
+                if is_label(operand):
+                    label_references += 1
+                    field_bits: int = available_instructions[instruction.opcode.upper()].label_field_bits
+                    if operand in labels_table:
+                        word |= self.resolve_label(operand, labels_table[operand], field_bits, instruction.line_number)
+                    else:
+                        forward_references += 1
+                        fixups.setdefault(operand, []).append((address, field_bits, instruction.line_number))
+
+            pending_words.append(word)
+            if source_map is not None:
+                source_map.append(instruction)
+            if len(fixups) == 0:
+                yield from pending_words
+                first_pending_address += len(pending_words)
+                pending_words.clear()
+
+        if len(fixups) != 0:
+            label, label_fixups = next(iter(fixups.items()))
+            raise AssemblingException(f"Label '{label}' is not defined (line {label_fixups[0][2]}).")
+
+        if stats is not None:
+            stats.count("resolve_labels", "labels", len(labels_table))
+            stats.count("resolve_labels", "label_references", label_references)
+            stats.count("resolve_labels", "forward_references", forward_references)
+            final_cache_hits, final_cache_misses = self.cache_counters()
+            stats.count("encode", "cache_hits", final_cache_hits - cache_hits)
+            stats.count("encode", "cache_misses", final_cache_misses - cache_misses)
+
+    def measured_assemble_line(self, instruction_line: SourceLine) -> int:
+        return self.stats.measure_call("encode", self.assemble_line, instruction_line)
+
+    def cache_counters(self) -> tuple[int, int]:
+        if self.encoding_cache is None:
+            return 0, 0
+
+        return self.encoding_cache.hits, self.encoding_cache.misses
 
     @staticmethod
-    def parse_line(line: str) -> Instruction:
-        tokens: list[str] = split_instruction_line(line)
+    def check_duplicate_label(label: str,
+                              label_lines: dict[str, int],
+                              line_number: int,
+                              module_name: str | None = None) -> None:
+        if label in label_lines:
+            location: str = "" if module_name is None else f" in {module_name}"
+            raise AssemblingException(f"Label '{label}' is defined twice{location} "
+                                      f"(lines {label_lines[label]} and {line_number}).")
 
-        operation: str = tokens[0].upper()
-        operation_operands: list[str] = tokens[1:]
+        label_lines[label] = line_number
+
+    @staticmethod
+    def resolve_label(label: str, label_address: int, field_bits: int, line_number: int) -> int:
+        if label_address >= 2**field_bits:
+            raise AssemblingException(f"Label '{label}' address {label_address} does not fit in {field_bits} "
+                                      f"bits (line {line_number}).")
+
+        return label_address
+
+    @staticmethod
+    def parse_line(line: SourceLine) -> InstructionSpec:
+        operation: str = line.opcode.upper()
 
         if operation not in available_instructions:
             raise AssemblingException(f"Undefined assembler instruction '{operation}'.")
 
-        instruction_class: Type[Instruction] = available_instructions[operation]
-
-        return instruction_class(operation_operands)
+        return available_instructions[operation]
@@ -0,0 +1,160 @@
+from .control_flow import (BasicBlock, build_basic_blocks, complementary_flags, expand_instruction, find_numeric_jump,
+                           find_reachable_blocks, find_undefined_target, map_label_blocks)
+from .instruction_parser import is_label
+from .program_optimizer import OptimizationChange, ProgramOptimizer
+from .source_line import SourceLine
+
+
+class BlockLayoutOptimizer(ProgramOptimizer):
+    name: str = "Block layout optimizer"
+
+    def optimize(self, instructions: list[SourceLine]) -> list[SourceLine]:
+        self.input_size = self.output_size = len(instructions)
+        if len(instructions) == 0:
+            return instructions
+
+        numeric_jump: SourceLine | None = find_numeric_jump(instructions, self.amount_registers)
+        if numeric_jump is not None:
+            self.disabled_reason = (f"line {numeric_jump.line_number} jumps to the address "
+                                    f"{numeric_jump.operands[-1]}, only programs using labels as jump targets "
+                                    f"are reordered")
+            return instructions
+
+        for instruction in instructions:
+            if expand_instruction(instruction, self.amount_registers) is None:
+                self.disabled_reason = f"line {instruction.line_number} is not a valid instruction"
+                return instructions
+
+        blocks: list[BasicBlock] = build_basic_blocks(instructions, self.amount_registers)
+        label_blocks: dict[str, int] = map_label_blocks(blocks)
+        undefined_target: str | None = find_undefined_target(blocks, label_blocks)
+        if undefined_target is not None:
+            self.disabled_reason = f"label '{undefined_target}' is not defined"
+            return instructions
+
+        self.thread_jumps(blocks, label_blocks)
+        instructions = self.flatten_blocks(self.place_blocks(blocks, label_blocks))
+
+        self.output_size = len(instructions)
+        return instructions
+
+    def thread_jumps(self, blocks: list[BasicBlock], label_blocks: dict[str, int]) -> None:
+        for block in blocks:
+            if block.terminator not in {"JMP", "BRH"}:
+                continue
+
+            target: str = block.target
+            visited_targets: set[str] = {target}
+            while blocks[label_blocks[target]].is_jump_only():
+                next_target: str = blocks[label_blocks[target]].target
+                if next_target in visited_targets:
+                    break
+                visited_targets.add(next_target)
+                target = next_target
+
+            if target != block.target:
+                jump_instruction: SourceLine = block.instructions[-1]
+                before: str = str(jump_instruction)
+                block.retarget(target)
+                self.changes.append(OptimizationChange("jump_chain", jump_instruction.line_number, before,
+                                                       str(jump_instruction)))
+
+    def place_blocks(self, blocks: list[BasicBlock], label_blocks: dict[str, int]) -> list[BasicBlock]:
+        reachable_blocks: set[int] = find_reachable_blocks(blocks, label_blocks)
+        referenced_labels: set[str] = {operand for index in reachable_blocks
+                                       for instruction in blocks[index].instructions
+                                       for operand in instruction.operands if is_label(operand)}
+
+        chains: dict[int, list[int]] = {}
+        previous_block: BasicBlock | None = None
+        for index, block in enumerate(blocks):
+            if index not in reachable_blocks:
+                removed_block: str = str(block.instructions[0])
+                if len(block.instructions) > 1:
+                    removed_block += f" ... ({len(block.instructions)} instructions)"
+                self.changes.append(OptimizationChange("unreachable_block", block.instructions[0].line_number,
+                                                       removed_block))
+                continue
+
+            if previous_block is None or not previous_block.falls_through():
+                chains[index] = []
+            chains[next(reversed(chains))].append(index)
+            previous_block = block
+
+        pinned_chain: int | None = next(reversed(chains)) if previous_block.falls_through() else None
+        if pinned_chain == 0:
+            return [blocks[index] for chain in chains.values() for index in chain]
+
+        unplaced_chains: list[int] = list(chains)
+        placed_chains: list[int] = []
+        current_chain: int = 0
+        while True:
+            placed_chains.append(current_chain)
+            unplaced_chains.remove(current_chain)
+            if len(unplaced_chains) == 0:
+                break
+
+            chain: list[int] = chains[current_chain]
+            tail: BasicBlock = blocks[chain[-1]]
+            candidate_chains: list[int] = []
+            if tail.terminator == "JMP":
+                candidate_chains.append(label_blocks[tail.target])
+                branch_block: BasicBlock | None = blocks[chain[-2]] if len(chain) > 1 else None
+                if (tail.is_jump_only() and branch_block is not None and branch_block.terminator == "BRH"
+                        and not any(label in referenced_labels for label in tail.labels)):
+                    candidate_chains.append(label_blocks[branch_block.target])
+
+            next_chain: int | None = next((candidate for candidate in candidate_chains
+                                           if candidate in unplaced_chains
+                                           and (candidate != pinned_chain or len(unplaced_chains) == 1)), None)
+            if next_chain is not None and next_chain != chain[-1] + 1:
+                moved_instruction: SourceLine = blocks[next_chain].instructions[0]
+                placement: str = f"placed after the block ending line {tail.instructions[-1].line_number}"
+                self.changes.append(OptimizationChange("moved_block", moved_instruction.line_number,
+                                                       str(moved_instruction), placement))
+            elif next_chain is None:
+                next_chain = next((chain for chain in unplaced_chains if chain != pinned_chain), pinned_chain)
+            current_chain = next_chain
+
+        return [blocks[index] for chain in placed_chains for index in chains[chain]]
+
+    def flatten_blocks(self, layout: list[BasicBlock]) -> list[SourceLine]:
+        referenced_labels: set[str] = {operand for block in layout for instruction in block.instructions
+                                       for operand in instruction.operands if is_label(operand)}
+
+        instructions: list[SourceLine] = []
+        pending_labels: list[str] = []
+        i: int = 0
+        while i < len(layout):
+            block: BasicBlock = layout[i]
+            next_block: BasicBlock | None = layout[i + 1] if i + 1 < len(layout) else None
+            block_instructions: list[SourceLine] = block.instructions
+            i += 1
+
+            if block.terminator in {"JMP", "BRH"} and next_block is not None and block.target in next_block.labels:
+                jump_instruction: SourceLine = block_instructions[-1]
+                self.changes.append(OptimizationChange("jump_to_next", jump_instruction.line_number,
+                                                       str(jump_instruction)))
+                if len(block_instructions) == 1:
+                    pending_labels.extend(jump_instruction.labels)
+                block_instructions = block_instructions[:-1]
+            elif (block.terminator == "BRH" and next_block is not None and next_block.is_jump_only()
+                  and i + 1 < len(layout) and block.target in layout[i + 1].labels
+                  and not any(label in referenced_labels for label in next_block.labels)):
+                branch_instruction: SourceLine = block_instructions[-1]
+                jump_instruction: SourceLine = next_block.instructions[0]
+                before: str = f"{branch_instruction} ; {jump_instruction}"
+                branch_instruction.operands = [complementary_flags[branch_instruction.operands[0].lower()],
+                                               next_block.target]
+                self.changes.append(OptimizationChange("inverted_branch", branch_instruction.line_number, before,
+                                                       str(branch_instruction)))
+                pending_labels.extend(next_block.labels)
+                i += 1
+
+            for instruction in block_instructions:
+                if len(pending_labels) != 0:
+                    instruction.labels = pending_labels + instruction.labels
+                    pending_labels = []
+                instructions.append(instruction)
+
+        return instructions
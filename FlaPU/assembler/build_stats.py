@@ -0,0 +1,101 @@
+import json
+import time
+
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+
+
+class StageStats:
+    __slots__ = ("name", "seconds", "lines", "counters")
+
+    def __init__(self, name: str) -> None:
+        self.name: str = name
+        self.seconds: float = 0.0
+        self.lines: int = 0
+        self.counters: dict[str, int] = {}
+
+    def count(self, counter: str, amount: int = 1) -> None:
+        self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    def to_dict(self) -> dict:
+        return {"seconds": self.seconds, "lines": self.lines, "counters": dict(self.counters)}
+
+
+class BuildStats:
+    def __init__(self) -> None:
+        self.stages: dict[str, StageStats] = {}
+        self.nested_seconds: float = 0.0
+
+    def stage(self, name: str) -> StageStats:
+        stage: StageStats | None = self.stages.get(name)
+        if stage is None:
+            stage = self.stages[name] = StageStats(name)
+
+        return stage
+
+    def count(self, name: str, counter: str, amount: int = 1) -> None:
+        self.stage(name).count(counter, amount)
+
+    @contextmanager
+    def measure(self, name: str) -> Iterator[StageStats]:
+        stage: StageStats = self.stage(name)
+        outer_nested_seconds: float = self.nested_seconds
+        self.nested_seconds = 0.0
+        start_time: float = time.perf_counter()
+        try:
+            yield stage
+        finally:
+            elapsed_time: float = time.perf_counter() - start_time
+            stage.seconds += elapsed_time - self.nested_seconds
+            self.nested_seconds = outer_nested_seconds + elapsed_time
+
+    def measure_call(self, name: str, function: Callable, *arguments) -> object:
+        stage: StageStats = self.stage(name)
+        outer_nested_seconds: float = self.nested_seconds
+        self.nested_seconds = 0.0
+        start_time: float = time.perf_counter()
+        try:
+            return function(*arguments)
+        finally:
+            elapsed_time: float = time.perf_counter() - start_time
+            stage.seconds += elapsed_time - self.nested_seconds
+            stage.lines += 1
+            self.nested_seconds = outer_nested_seconds + elapsed_time
+
+    def measure_iterator(self, name: str, items: Iterable) -> Iterator:
+        stage: StageStats = self.stage(name)
+        iterator: Iterator = iter(items)
+        while True:
+            outer_nested_seconds: float = self.nested_seconds
+            self.nested_seconds = 0.0
+            start_time: float = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                elapsed_time: float = time.perf_counter() - start_time
+                stage.seconds += elapsed_time - self.nested_seconds
+                self.nested_seconds = outer_nested_seconds + elapsed_time
+
+            stage.lines += 1
+            yield item
+
+    def total_seconds(self) -> float:
+        return sum(stage.seconds for stage in self.stages.values())
+
+    def to_dict(self) -> dict:
+        return {"total_seconds": self.total_seconds(),
+                "stages": {name: stage.to_dict() for name, stage in self.stages.items()}}
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=4)
+
+    def report(self) -> str:
+        lines: list[str] = [f"{'stage':<24}{'time (ms)':>12}{'lines':>10}  counters"]
+        for name, stage in self.stages.items():
+            counters: str = ", ".join(f"{counter}={value}" for counter, value in stage.counters.items())
+            lines.append(f"{name:<24}{stage.seconds * 1000:>12.3f}{stage.lines:>10}  {counters}")
+        lines.append(f"{'total':<24}{self.total_seconds() * 1000:>12.3f}")
+
+        return "\n".join(lines)
@@ -50,3 +50,8 @@ chars: dict[str, int] = {" ": 0, "A": 1, "B": 2, "C": 3, "D": 4, "E": 5,
                          "P": 16, "Q": 17, "R": 18, "S": 19, "T": 20,
                          "U": 21, "V": 22, "W": 23, "X": 24, "Y": 25, "Z": 26,
                          ".": 27, "!": 28, "?": 29}
+
+flag_setting_instructions: set[str] = {"ADD", "SUB", "NOR", "AND", "XOR", "ADI"}
+
+data_memory_size: int = 256
+call_stack_depth: int = 16
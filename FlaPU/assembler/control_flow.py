@@ -0,0 +1,162 @@
+from .config import flags
+from .exceptions.immediate_value_exception import ImmediateOperandsException
+from .exceptions.register_operands_exception import RegisterOperandsException
+from .flag_exception import FlagException
+from .instruction_parser import is_label
+from .instructions import available_instructions, base_instructions, pseudo_instructions
+from .source_line import SourceLine
+
+
+jump_instructions: set[str] = {"JMP", "BRH", "CAL"}
+block_ending_instructions: set[str] = {"JMP", "BRH", "RET", "HLT"}
+end_of_flow_instructions: set[str] = {"JMP", "RET", "HLT"}
+
+
+def build_complementary_flags() -> dict[str, str]:
+    flag_names: list[str] = list(flags)
+    complementary_flags: dict[str, str] = {}
+    for index, name in enumerate(flag_names):
+        complement: str = flag_names[index ^ 1]
+        if int(flags[name], 2) ^ 1 != int(flags[complement], 2):
+            raise ValueError(f"Flag {name} is not followed or preceded by its complement in the assembler config.")
+        complementary_flags[name] = complement
+
+    return complementary_flags
+
+
+complementary_flags: dict[str, str] = build_complementary_flags()
+
+
+def expand_instruction(instruction: SourceLine, amount_registers: int) -> tuple[str, list[str]] | None:
+    operation: str = instruction.opcode.upper()
+    if operation not in available_instructions:
+        return None
+
+    try:
+        available_instructions[operation].check_operands(instruction.operands, amount_registers)
+    except (RegisterOperandsException, ImmediateOperandsException, FlagException):
+        return None
+
+    if operation in base_instructions:
+        return operation, instruction.operands
+
+    target, template = pseudo_instructions[operation]
+    return target, [instruction.operands[source] if isinstance(source, int) else source for source in template]
+
+
+def find_numeric_jump(instructions: list[SourceLine], amount_registers: int) -> SourceLine | None:
+    for instruction in instructions:
+        expanded: tuple[str, list[str]] | None = expand_instruction(instruction, amount_registers)
+        if expanded is not None and expanded[0] in jump_instructions and not is_label(expanded[1][-1]):
+            return instruction
+
+    return None
+
+
+class BasicBlock:
+    __slots__ = ("instructions", "terminator", "target", "calls")
+
+    def __init__(self,
+                 instructions: list[SourceLine],
+                 terminator: str | None,
+                 target: str | None,
+                 calls: list[str]) -> None:
+        self.instructions: list[SourceLine] = instructions
+        self.terminator: str | None = terminator
+        self.target: str | None = target
+        self.calls: list[str] = calls
+
+    @property
+    def labels(self) -> list[str]:
+        return self.instructions[0].labels
+
+    def falls_through(self) -> bool:
+        return self.terminator not in end_of_flow_instructions
+
+    def is_jump_only(self) -> bool:
+        return len(self.instructions) == 1 and self.terminator == "JMP"
+
+    def retarget(self, target: str) -> None:
+        last_instruction: SourceLine = self.instructions[-1]
+        last_instruction.operands = last_instruction.operands[:-1] + [target]
+        self.target = target
+
+
+def build_basic_blocks(instructions: list[SourceLine], amount_registers: int) -> list[BasicBlock]:
+    blocks: list[BasicBlock] = []
+    block_instructions: list[SourceLine] = []
+    block_calls: list[str] = []
+
+    for instruction in instructions:
+        if len(instruction.labels) != 0 and len(block_instructions) != 0:
+            blocks.append(BasicBlock(block_instructions, None, None, block_calls))
+            block_instructions = []
+            block_calls = []
+
+        block_instructions.append(instruction)
+        expanded: tuple[str, list[str]] | None = expand_instruction(instruction, amount_registers)
+        if expanded is None:
+            continue
+
+        operation, operands = expanded
+        if operation == "CAL":
+            block_calls.append(operands[-1])
+        elif operation in block_ending_instructions:
+            target: str | None = operands[-1] if operation in jump_instructions else None
+            blocks.append(BasicBlock(block_instructions, operation, target, block_calls))
+            block_instructions = []
+            block_calls = []
+
+    if len(block_instructions) != 0:
+        blocks.append(BasicBlock(block_instructions, None, None, block_calls))
+
+    return blocks
+
+
+def map_label_blocks(blocks: list[BasicBlock]) -> dict[str, int]:
+    return {label: index for index, block in enumerate(blocks) for label in block.labels}
+
+
+def find_successors(blocks: list[BasicBlock], label_blocks: dict[str, int]) -> list[list[int]]:
+    successors: list[list[int]] = []
+    for index, block in enumerate(blocks):
+        block_successors: list[int] = []
+        if block.target in label_blocks:
+            block_successors.append(label_blocks[block.target])
+        if block.falls_through() and index + 1 < len(blocks):
+            block_successors.append(index + 1)
+        successors.append(block_successors)
+
+    return successors
+
+
+def find_undefined_target(blocks: list[BasicBlock], label_blocks: dict[str, int]) -> str | None:
+    for block in blocks:
+        for target in block.calls + ([] if block.target is None else [block.target]):
+            if target not in label_blocks:
+                return target
+
+    return None
+
+
+def find_data_labels(blocks: list[BasicBlock], label_blocks: dict[str, int]) -> set[str]:
+    return {operand for block in blocks for instruction in block.instructions
+            if instruction.opcode.upper() not in jump_instructions
+            for operand in instruction.operands if is_label(operand) and operand in label_blocks}
+
+
+def find_reachable_blocks(blocks: list[BasicBlock], label_blocks: dict[str, int]) -> set[int]:
+    data_labels: set[str] = find_data_labels(blocks, label_blocks)
+    successors: list[list[int]] = find_successors(blocks, label_blocks)
+    pending_blocks: list[int] = [0] + [label_blocks[label] for label in data_labels]
+    reachable_blocks: set[int] = set()
+    while len(pending_blocks) != 0:
+        index: int = pending_blocks.pop()
+        if index in reachable_blocks:
+            continue
+
+        reachable_blocks.add(index)
+        pending_blocks.extend(successors[index])
+        pending_blocks.extend(label_blocks[target] for target in blocks[index].calls)
+
+    return reachable_blocks
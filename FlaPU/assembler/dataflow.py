@@ -0,0 +1,295 @@
+from abc import ABC, abstractmethod
+from collections.abc import Collection
+
+from .config import flag_setting_instructions, flags
+from .control_flow import (BasicBlock, build_basic_blocks, expand_instruction, find_data_labels, find_successors,
+                           map_label_blocks)
+from .instruction_assembling import get_register_code
+from .instruction_parser import is_virtual_register
+from .operand_tables import register_codes
+from .peephole_optimizer import PeepholeOptimizer, register_result_instructions
+from .source_line import SourceLine
+
+
+Resource = int | str
+FlagFact = tuple[str, int] | tuple[str, int, int]
+
+flag_names: tuple[str, ...] = ("zero", "carry")
+entry_definition: int = -1
+
+
+def get_read_flag(flag: str) -> str:
+    return flag_names[int(flags[flag.lower()], 2) >> 1]
+
+
+def get_register_resource(register: str) -> Resource:
+    return register if is_virtual_register(register) else get_register_code(register)
+
+
+class InstructionEffect:
+    __slots__ = ("operation", "operands", "used", "defined", "clobbers")
+
+    def __init__(self,
+                 operation: str,
+                 operands: list[str],
+                 used: frozenset[Resource],
+                 defined: frozenset[Resource],
+                 clobbers: bool = False) -> None:
+        self.operation: str = operation
+        self.operands: list[str] = operands
+        self.used: frozenset[Resource] = used
+        self.defined: frozenset[Resource] = defined
+        self.clobbers: bool = clobbers
+
+    @property
+    def destination(self) -> int:
+        return PeepholeOptimizer.get_destination(self.operation, self.operands)
+
+
+def get_instruction_effect(operation: str, operands: list[str], resources: frozenset[Resource]) -> InstructionEffect:
+    used: set[Resource] = set()
+    defined: set[Resource] = set()
+
+    if operation in {"ADD", "SUB", "NOR", "AND", "XOR"}:
+        used.update(get_register_resource(operand) for operand in operands[:2])
+        defined.add(get_register_resource(operands[2]))
+    elif operation in {"RSH", "LOD"}:
+        used.add(get_register_resource(operands[0]))
+        defined.add(get_register_resource(operands[1]))
+    elif operation == "LDI":
+        defined.add(get_register_resource(operands[0]))
+    elif operation == "ADI":
+        used.add(get_register_resource(operands[0]))
+        defined.add(get_register_resource(operands[0]))
+    elif operation == "STR":
+        used.update(get_register_resource(operand) for operand in operands[:2])
+    elif operation == "BRH":
+        used.add(get_read_flag(operands[0]))
+    elif operation == "CAL":
+        return InstructionEffect(operation, operands, resources, frozenset(), True)
+    elif operation == "RET":
+        used.update(resources)
+    elif operation == "HLT":
+        used.update(resource for resource in resources if isinstance(resource, int))
+
+    if operation in flag_setting_instructions:
+        defined.update(flag_names)
+
+    return InstructionEffect(operation, operands, frozenset(used - {0}), frozenset(defined - {0}))
+
+
+class FlowGraph:
+    __slots__ = ("instructions", "effects", "blocks", "block_starts", "successors", "predecessors", "roots", "exits",
+                 "resources")
+
+    def __init__(self,
+                 instructions: list[SourceLine],
+                 amount_registers: int,
+                 local_registers: Collection[str] = frozenset()) -> None:
+        self.instructions: list[SourceLine] = instructions
+        self.resources: frozenset[Resource] = frozenset(get_register_resource(operand) for instruction in instructions
+                                                        for operand in instruction.operands
+                                                        if register_codes.get(operand, 0) != 0
+                                                        or (is_virtual_register(operand)
+                                                            and operand not in local_registers)) | frozenset(flag_names)
+        self.effects: list[InstructionEffect] = [get_instruction_effect(*expand_instruction(instruction,
+                                                                                            amount_registers),
+                                                                        self.resources)
+                                                 for instruction in instructions]
+
+        self.blocks: list[BasicBlock] = build_basic_blocks(instructions, amount_registers)
+        self.block_starts: list[int] = []
+        block_start: int = 0
+        for block in self.blocks:
+            self.block_starts.append(block_start)
+            block_start += len(block.instructions)
+
+        label_blocks: dict[str, int] = map_label_blocks(self.blocks)
+        self.successors: list[list[int]] = find_successors(self.blocks, label_blocks)
+        self.predecessors: list[list[int]] = [[] for _ in self.blocks]
+        for index, block_successors in enumerate(self.successors):
+            for successor in block_successors:
+                self.predecessors[successor].append(index)
+
+        self.exits: set[int] = {index for index, block in enumerate(self.blocks)
+                                if block.target is not None and block.target not in label_blocks}
+        if self.blocks[-1].falls_through():
+            self.exits.add(len(self.blocks) - 1)
+
+        self.roots: set[int] = {0}
+        self.roots.update(label_blocks[target] for block in self.blocks for target in block.calls
+                          if target in label_blocks)
+        self.roots.update(label_blocks[label] for label in find_data_labels(self.blocks, label_blocks))
+        self.roots.update(index for index, block_predecessors in enumerate(self.predecessors)
+                          if len(block_predecessors) == 0)
+
+    def get_instruction_indices(self, block_index: int) -> range:
+        block_start: int = self.block_starts[block_index]
+        return range(block_start, block_start + len(self.blocks[block_index].instructions))
+
+
+class DataflowProblem(ABC):
+    forward: bool = True
+
+    @abstractmethod
+    def boundary_state(self, graph: FlowGraph, block_index: int) -> frozenset:
+        pass
+
+    @abstractmethod
+    def meet(self, states: list[frozenset]) -> frozenset | None:
+        pass
+
+    @abstractmethod
+    def transfer(self, index: int, effect: InstructionEffect, state: frozenset) -> frozenset:
+        pass
+
+
+class LivenessProblem(DataflowProblem):
+    forward: bool = False
+
+    def __init__(self, resources: frozenset[Resource]) -> None:
+        self.resources: frozenset[Resource] = resources
+
+    def boundary_state(self, graph: FlowGraph, block_index: int) -> frozenset[Resource]:
+        return self.resources if block_index in graph.exits else frozenset()
+
+    def meet(self, states: list[frozenset[Resource]]) -> frozenset[Resource]:
+        return frozenset().union(*states)
+
+    def transfer(self, index: int, effect: InstructionEffect, state: frozenset[Resource]) -> frozenset[Resource]:
+        return (state - effect.defined) | effect.used
+
+
+class ReachingDefinitionsProblem(DataflowProblem):
+    def __init__(self, resources: frozenset[Resource]) -> None:
+        self.resources: frozenset[Resource] = resources
+
+    def boundary_state(self, graph: FlowGraph, block_index: int) -> frozenset[tuple[Resource, int]]:
+        return frozenset((resource, entry_definition) for resource in self.resources)
+
+    def meet(self, states: list[frozenset[tuple[Resource, int]]]) -> frozenset[tuple[Resource, int]]:
+        return frozenset().union(*states)
+
+    def transfer(self,
+                 index: int,
+                 effect: InstructionEffect,
+                 state: frozenset[tuple[Resource, int]]) -> frozenset[tuple[Resource, int]]:
+        if effect.clobbers:
+            return state | frozenset((resource, index) for resource in self.resources)
+        if len(effect.defined) == 0:
+            return state
+
+        return (frozenset(definition for definition in state if definition[0] not in effect.defined)
+                | frozenset((resource, index) for resource in effect.defined))
+
+
+class ConstantsProblem(DataflowProblem):
+    def boundary_state(self, graph: FlowGraph, block_index: int) -> frozenset[tuple[int, int | str]]:
+        return frozenset()
+
+    def meet(self, states: list[frozenset[tuple[int, int | str]]]) -> frozenset[tuple[int, int | str]] | None:
+        if len(states) == 0:
+            return None
+
+        return states[0].intersection(*states[1:])
+
+    def transfer(self,
+                 index: int,
+                 effect: InstructionEffect,
+                 state: frozenset[tuple[int, int | str]]) -> frozenset[tuple[int, int | str]]:
+        if effect.clobbers:
+            return frozenset()
+        if not any(isinstance(resource, int) for resource in effect.defined):
+            return state
+
+        destination: int = effect.destination
+        value: int | str | None = None
+        if effect.operation in register_result_instructions:
+            value = PeepholeOptimizer.compute_value(effect.operation, effect.operands, dict(state))
+
+        known_values: frozenset[tuple[int, int | str]] = frozenset(known_value for known_value in state
+                                                                   if known_value[0] != destination)
+        return known_values if value is None else known_values | {(destination, value)}
+
+
+class FlagFactsProblem(DataflowProblem):
+    def boundary_state(self, graph: FlowGraph, block_index: int) -> frozenset[FlagFact]:
+        return frozenset()
+
+    def meet(self, states: list[frozenset[FlagFact]]) -> frozenset[FlagFact] | None:
+        if len(states) == 0:
+            return None
+
+        return states[0].intersection(*states[1:])
+
+    def transfer(self, index: int, effect: InstructionEffect, state: frozenset[FlagFact]) -> frozenset[FlagFact]:
+        if effect.clobbers:
+            return frozenset()
+        if len(effect.defined) == 0:
+            return state
+
+        facts: set[FlagFact] = set(state)
+        if effect.operation in flag_setting_instructions:
+            facts.clear()
+            if effect.operation == "SUB":
+                facts.add(("compare", get_register_code(effect.operands[0]), get_register_code(effect.operands[1])))
+
+        facts = {fact for fact in facts if not any(register in effect.defined for register in fact[1:])}
+        if effect.operation in flag_setting_instructions and effect.destination != 0:
+            facts.add(("zero", effect.destination))
+
+        return frozenset(facts)
+
+
+def solve_dataflow(graph: FlowGraph, problem: DataflowProblem) -> list[frozenset | None]:
+    amount_blocks: int = len(graph.blocks)
+    if problem.forward:
+        incoming_edges: list[list[int]] = graph.predecessors
+        outgoing_edges: list[list[int]] = graph.successors
+        boundary_blocks: set[int] = graph.roots
+        pending_blocks: list[int] = list(reversed(range(amount_blocks)))
+    else:
+        incoming_edges = graph.successors
+        outgoing_edges = graph.predecessors
+        boundary_blocks = graph.exits | {index for index in range(amount_blocks) if len(graph.successors[index]) == 0}
+        pending_blocks = list(range(amount_blocks))
+
+    block_inputs: list[frozenset | None] = [None] * amount_blocks
+    block_outputs: list[frozenset | None] = [None] * amount_blocks
+    queued_blocks: set[int] = set(pending_blocks)
+    while len(pending_blocks) != 0:
+        index: int = pending_blocks.pop()
+        queued_blocks.discard(index)
+
+        states: list[frozenset] = [block_outputs[edge] for edge in incoming_edges[index]
+                                   if block_outputs[edge] is not None]
+        if index in boundary_blocks:
+            states.append(problem.boundary_state(graph, index))
+        state: frozenset | None = problem.meet(states)
+        if state is None or (state == block_inputs[index] and block_outputs[index] is not None):
+            continue
+
+        block_inputs[index] = state
+        instruction_indices: range = graph.get_instruction_indices(index)
+        for instruction_index in instruction_indices if problem.forward else reversed(instruction_indices):
+            state = problem.transfer(instruction_index, graph.effects[instruction_index], state)
+
+        if state != block_outputs[index]:
+            block_outputs[index] = state
+            for edge in outgoing_edges[index]:
+                if edge not in queued_blocks:
+                    pending_blocks.append(edge)
+                    queued_blocks.add(edge)
+
+    facts: list[frozenset | None] = [None] * len(graph.instructions)
+    for index in range(amount_blocks):
+        state = block_inputs[index]
+        if state is None:
+            continue
+
+        instruction_indices = graph.get_instruction_indices(index)
+        for instruction_index in instruction_indices if problem.forward else reversed(instruction_indices):
+            facts[instruction_index] = state
+            state = problem.transfer(instruction_index, graph.effects[instruction_index], state)
+
+    return facts
@@ -0,0 +1,170 @@
+from .config import flag_setting_instructions
+from .control_flow import (BasicBlock, build_basic_blocks, expand_instruction, find_numeric_jump, find_undefined_target,
+                           map_label_blocks)
+from .dataflow import (ConstantsProblem, FlagFactsProblem, FlowGraph, InstructionEffect, LivenessProblem,
+                       ReachingDefinitionsProblem, Resource, entry_definition, flag_names, solve_dataflow)
+from .instruction_assembling import get_register_code
+from .peephole_optimizer import byte_mask, get_immediate, register_result_instructions
+from .program_optimizer import OptimizationChange, ProgramOptimizer
+from .source_line import SourceLine
+
+
+max_dataflow_passes: int = 32
+
+
+class DataflowOptimizer(ProgramOptimizer):
+    name: str = "Dataflow optimizer"
+
+    def __init__(self, amount_registers: int, max_passes: int = max_dataflow_passes) -> None:
+        super().__init__(amount_registers)
+        self.max_passes: int = max_passes
+
+    def optimize(self, instructions: list[SourceLine]) -> list[SourceLine]:
+        self.input_size = self.output_size = len(instructions)
+        if len(instructions) == 0:
+            return instructions
+
+        numeric_jump: SourceLine | None = find_numeric_jump(instructions, self.amount_registers)
+        if numeric_jump is not None:
+            self.disabled_reason = (f"line {numeric_jump.line_number} jumps to the address "
+                                    f"{numeric_jump.operands[-1]}, only programs using labels as jump targets "
+                                    f"are analyzed")
+            return instructions
+
+        for instruction in instructions:
+            if expand_instruction(instruction, self.amount_registers) is None:
+                self.disabled_reason = f"line {instruction.line_number} is not a valid instruction"
+                return instructions
+
+        blocks: list[BasicBlock] = build_basic_blocks(instructions, self.amount_registers)
+        undefined_target: str | None = find_undefined_target(blocks, map_label_blocks(blocks))
+        if undefined_target is not None:
+            self.disabled_reason = f"label '{undefined_target}' is not defined"
+            return instructions
+
+        for _ in range(self.max_passes):
+            rewrites: dict[int, SourceLine | None] = self.find_rewrites(FlowGraph(instructions, self.amount_registers))
+            if len(rewrites) == 0:
+                break
+            instructions = self.apply_rewrites(instructions, rewrites)
+
+        self.output_size = len(instructions)
+        return instructions
+
+    def find_rewrites(self, graph: FlowGraph) -> dict[int, SourceLine | None]:
+        known_values: list[frozenset | None] = solve_dataflow(graph, ConstantsProblem())
+        flag_facts: list[frozenset | None] = solve_dataflow(graph, FlagFactsProblem())
+        live_resources: list[frozenset | None] = solve_dataflow(graph, LivenessProblem(graph.resources))
+        reaching_definitions: list[frozenset | None] = solve_dataflow(graph,
+                                                                      ReachingDefinitionsProblem(graph.resources))
+        last_index: int = len(graph.instructions) - 1
+
+        rewrites: dict[int, SourceLine | None] = {}
+        for index, effect in enumerate(graph.effects):
+            if known_values[index] is not None and index != last_index:
+                rule: str | None = self.find_redundant_instruction(effect, dict(known_values[index]),
+                                                                   flag_facts[index], live_resources[index])
+                if rule is not None:
+                    rewrites[index] = None
+                    self.record_removal(graph.instructions, index, rule, reaching_definitions[index])
+        if len(rewrites) != 0:
+            return rewrites
+
+        for index, effect in enumerate(graph.effects):
+            if known_values[index] is not None:
+                folded_value: int | None = self.fold_addition(effect, dict(known_values[index]),
+                                                              live_resources[index])
+                if folded_value is not None:
+                    instruction: SourceLine = graph.instructions[index]
+                    rewrites[index] = SourceLine(instruction.labels, "LDI", [effect.operands[0], str(folded_value)],
+                                                 instruction.line_number)
+                    self.changes.append(OptimizationChange("folded_addition", instruction.line_number,
+                                                           str(instruction), str(rewrites[index])))
+        if len(rewrites) != 0:
+            return rewrites
+
+        for index, effect in enumerate(graph.effects):
+            if index != last_index and self.is_dead_definition(effect, live_resources[index]):
+                rewrites[index] = None
+                self.record_removal(graph.instructions, index, "dead_definition", reaching_definitions[index])
+
+        return rewrites
+
+    def record_removal(self,
+                       instructions: list[SourceLine],
+                       index: int,
+                       rule: str,
+                       reaching_definitions: frozenset[tuple[Resource, int]] | None) -> None:
+        after: str | None = None
+        if rule == "redundant_compare" and reaching_definitions is not None:
+            flag_definitions: set[int] = {definition for resource, definition in reaching_definitions
+                                          if resource == flag_names[0]}
+            if len(flag_definitions) == 1 and min(flag_definitions) != entry_definition:
+                after = f"removed, flags already set line {instructions[min(flag_definitions)].line_number}"
+
+        self.changes.append(OptimizationChange(rule, instructions[index].line_number, str(instructions[index]), after))
+
+    @staticmethod
+    def find_redundant_instruction(effect: InstructionEffect,
+                                   known_values: dict[int, int | str],
+                                   flag_facts: frozenset,
+                                   live_resources: frozenset[Resource]) -> str | None:
+        if effect.operation == "LDI":
+            destination: int = effect.destination
+            if destination != 0 and known_values.get(destination) == get_immediate(effect.operands[1]):
+                return "redundant_load"
+            return None
+
+        if effect.operation != "SUB" or effect.destination != 0:
+            return None
+
+        first_register: int = get_register_code(effect.operands[0])
+        second_register: int = get_register_code(effect.operands[1])
+        if ("compare", first_register, second_register) in flag_facts:
+            return "redundant_compare"
+
+        second_value: int | str | None = 0 if second_register == 0 else known_values.get(second_register)
+        if second_value == 0 and ("zero", first_register) in flag_facts and "carry" not in live_resources:
+            return "redundant_compare"
+
+        return None
+
+    @staticmethod
+    def fold_addition(effect: InstructionEffect,
+                      known_values: dict[int, int | str],
+                      live_resources: frozenset[Resource]) -> int | None:
+        if effect.operation != "ADI" or any(flag in live_resources for flag in flag_names):
+            return None
+
+        value: int | str | None = known_values.get(effect.destination)
+        immediate: int | str = get_immediate(effect.operands[1])
+        if not isinstance(value, int) or not isinstance(immediate, int):
+            return None
+
+        return (value + immediate) & byte_mask
+
+    @staticmethod
+    def is_dead_definition(effect: InstructionEffect, live_resources: frozenset[Resource] | None) -> bool:
+        if live_resources is None or effect.operation not in register_result_instructions:
+            return False
+        if effect.operation in flag_setting_instructions and any(flag in live_resources for flag in flag_names):
+            return False
+
+        return effect.destination not in live_resources
+
+    @staticmethod
+    def apply_rewrites(instructions: list[SourceLine], rewrites: dict[int, SourceLine | None]) -> list[SourceLine]:
+        optimized_lines: list[SourceLine] = []
+        pending_labels: list[str] = []
+        for index, instruction in enumerate(instructions):
+            rewritten_instruction: SourceLine | None = rewrites.get(index, instruction)
+            if rewritten_instruction is None:
+                pending_labels.extend(instruction.labels)
+                continue
+
+            if len(pending_labels) != 0:
+                rewritten_instruction.labels = pending_labels + rewritten_instruction.labels
+                pending_labels = []
+            optimized_lines.append(rewritten_instruction)
+
+        return optimized_lines
@@ -0,0 +1,88 @@
+import hashlib
+import json
+import os
+
+from collections import OrderedDict
+from functools import lru_cache
+
+from . import config
+from .source_line import SourceLine
+
+
+default_cache_size: int = 8192
+encoder_source_files: tuple[str, ...] = ("config.py", "instructions.py", "operand_tables.py",
+                                         "instruction_assembling.py", "instruction_parser.py", "flag_exception.py")
+
+
+@lru_cache(maxsize=1)
+def compute_config_hash() -> str:
+    config_hash = hashlib.sha256()
+    for source_file in encoder_source_files:
+        with open(os.path.join(os.path.dirname(config.__file__), source_file), "rb") as f:
+            config_hash.update(f.read())
+
+    return config_hash.hexdigest()
+
+
+class EncodingCache:
+    def __init__(self, max_size: int = default_cache_size) -> None:
+        self.max_size: int = max_size
+        self.entries: OrderedDict[str, int] = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    @staticmethod
+    def make_key(instruction_line: SourceLine, amount_registers: int) -> str:
+        return f"{amount_registers}:{instruction_line.opcode.upper()} {' '.join(instruction_line.operands)}"
+
+    def get(self, key: str) -> int | None:
+        word: int | None = self.entries.get(key)
+        if word is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return word
+
+    def put(self, key: str, word: int) -> None:
+        self.entries[key] = word
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def reset_counters(self) -> None:
+        self.hits = 0
+        self.misses = 0
+
+    def hit_rate(self) -> float:
+        lookups: int = self.hits + self.misses
+        return self.hits / lookups if lookups != 0 else 0.0
+
+    def load(self, file_path: str) -> None:
+        if not os.path.exists(file_path):
+            return
+
+        with open(file_path, "r") as f:
+            try:
+                content: dict = json.load(f)
+            except json.JSONDecodeError:
+                return
+
+        if content.get("config_hash") != compute_config_hash():
+            return
+
+        for key, word in content.get("entries", []):
+            self.put(key, word)
+
+    def save(self, file_path: str) -> None:
+        folder: str = os.path.dirname(file_path)
+        if folder != "":
+            os.makedirs(folder, exist_ok=True)
+
+        content: dict = {"config_hash": compute_config_hash(), "entries": list(self.entries.items())}
+
+        temporary_file_path: str = f"{file_path}.tmp"
+        with open(temporary_file_path, "w") as f:
+            json.dump(content, f)
+        os.replace(temporary_file_path, file_path)
@@ -0,0 +1,3 @@
+class RegisterAllocationException(Exception):
+    def __init__(self, message: str) -> None:
+        super().__init__(message)
@@ -1,13 +1,164 @@
-def extract_file_content(file_path: str) -> list[str]:
-    content: list[str] = []
+import os
+import sys
+
+from abc import ABC, abstractmethod
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from io import IOBase
+
+from .instruction_assembling import render_machine_code
+
+
+intel_hex_record_size: int = 16
+binary_chunk_words: int = 4096
+
+
+def extract_file_content(file_path: str) -> Iterator[str]:
     with open(file_path, "r") as f:
         for line in f:
-            stripped_line: str = line.strip()
-            if stripped_line != "":
-                content.append(stripped_line)
-    return content
+            yield line.strip()
+
+
+def pack_machine_code(machine_code: Iterable[int]) -> bytes:
+    words: array = array("H", machine_code)
+    if sys.byteorder == "big":
+        words.byteswap()
+
+    return words.tobytes()
+
+
+def format_intel_hex_record(address: int, record_type: int, data: bytes) -> str:
+    record: bytes = bytes([len(data), address >> 8, address & 0xFF, record_type]) + data
+    checksum: int = -sum(record) & 0xFF
+
+    return f":{record.hex().upper()}{checksum:02X}"
+
+
+class MachineCodeWriter(ABC):
+    def __init__(self, file_path: str, mode: str) -> None:
+        self.file_path: str = file_path
+        self.temporary_file_path: str = f"{file_path}.tmp"
+        self.file: IOBase = open(self.temporary_file_path, mode)
+        self.amount_words: int = 0
+
+    def __enter__(self) -> "MachineCodeWriter":
+        return self
+
+    def __exit__(self, *exception_info) -> None:
+        if exception_info[0] is None:
+            self.close()
+        else:
+            self.discard()
+
+    def write_words(self, machine_code: Iterable[int]) -> None:
+        for word in machine_code:
+            self.write(word)
+
+    @abstractmethod
+    def write(self, word: int) -> None:
+        pass
+
+    def close(self) -> None:
+        self.file.close()
+        os.replace(self.temporary_file_path, self.file_path)
+
+    def discard(self) -> None:
+        self.file.close()
+        os.remove(self.temporary_file_path)
+
+
+class TextMachineCodeWriter(MachineCodeWriter):
+    def __init__(self, file_path: str) -> None:
+        super().__init__(file_path, "w")
+
+    def write(self, word: int) -> None:
+        if self.amount_words != 0:
+            self.file.write("\n")
+        self.file.write(render_machine_code(word))
+        self.amount_words += 1
+
 
+class BinaryMachineCodeWriter(MachineCodeWriter):
+    def __init__(self, file_path: str) -> None:
+        super().__init__(file_path, "wb")
+        self.pending_words: list[int] = []
 
-def write_to_file(file_path: str, content: list[str]) -> None:
-    with open(file_path, "w") as f:
-        f.write("\n".join(content))
+    def write(self, word: int) -> None:
+        self.pending_words.append(word)
+        self.amount_words += 1
+        if len(self.pending_words) == binary_chunk_words:
+            self.flush()
+
+    def flush(self) -> None:
+        self.file.write(pack_machine_code(self.pending_words))
+        self.pending_words.clear()
+
+    def close(self) -> None:
+        self.flush()
+        super().close()
+
+
+class IntelHexMachineCodeWriter(MachineCodeWriter):
+    def __init__(self, file_path: str) -> None:
+        super().__init__(file_path, "w")
+        self.pending_words: list[int] = []
+
+    def write(self, word: int) -> None:
+        self.pending_words.append(word)
+        self.amount_words += 1
+        if len(self.pending_words) * 2 == intel_hex_record_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if len(self.pending_words) == 0:
+            return
+
+        address: int = (self.amount_words - len(self.pending_words)) * 2
+        if address % 0x10000 == 0 and address != 0:
+            self.file.write(format_intel_hex_record(0, 0x04, (address >> 16).to_bytes(2, "big")) + "\n")
+        self.file.write(format_intel_hex_record(address & 0xFFFF, 0x00, pack_machine_code(self.pending_words)) + "\n")
+        self.pending_words.clear()
+
+    def close(self) -> None:
+        self.flush()
+        self.file.write(format_intel_hex_record(0, 0x01, b"") + "\n")
+        super().close()
+
+
+machine_code_writers: dict[str, type[MachineCodeWriter]] = {".mc": TextMachineCodeWriter,
+                                                            ".bin": BinaryMachineCodeWriter,
+                                                            ".hex": IntelHexMachineCodeWriter}
+
+
+def open_machine_code_writer(file_path: str) -> MachineCodeWriter:
+    extension: str = os.path.splitext(file_path)[1].lower()
+    writer_class: type[MachineCodeWriter] = machine_code_writers.get(extension, TextMachineCodeWriter)
+
+    return writer_class(file_path)
+
+
+def write_machine_code_file(file_path: str, machine_code: Iterable[int]) -> None:
+    with open_machine_code_writer(file_path) as writer:
+        writer.write_words(machine_code)
+
+
+def read_binary_machine_code(file_path: str) -> array:
+    words: array = array("H")
+    with open(file_path, "rb") as f:
+        file_size: int = os.fstat(f.fileno()).st_size
+        if file_size % 2 != 0:
+            raise ValueError(f"File : {file_path} does not contain a whole number of 16 bits words.")
+        words.fromfile(f, file_size // 2)
+
+    if sys.byteorder == "big":
+        words.byteswap()
+
+    return words
+
+
+def read_machine_code_file(file_path: str) -> Sequence[int]:
+    if os.path.splitext(file_path)[1].lower() == ".bin":
+        return read_binary_machine_code(file_path)
+
+    with open(file_path, "r") as f:
+        return [int(line, 2) for line in f if line.strip() != ""]
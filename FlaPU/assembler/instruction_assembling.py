@@ -1,85 +1,59 @@
-from .config import assembled_name, instructions_address_bits, chars
-from .instruction_parser import is_number
+from .config import instructions_address_bits, chars
+from .exceptions.register_operands_exception import RegisterOperandsException
+from .instruction_parser import is_number, is_label, is_virtual_register
+from .operand_tables import address_table, immediate_tables, opcode_codes, register_codes
 
 
-def assemble_reg_imm(name: str, operands: list[str]) -> str:
-    base_instruction_assembled: str = assembled_name[name]
-    binary_operand_receive: str = get_register_binary(operands[0])
-    binary_operand_value: str = get_assembled_immediate(operands[1], 8, True)
-    assembled_line: str = f"{base_instruction_assembled}{binary_operand_receive}{binary_operand_value}"
+opcode_shift: int = 12
+instruction_bits: int = 16
 
-    return assembled_line
 
+def render_machine_code(word: int) -> str:
+    return format(word, f"0{instruction_bits}b")
 
-def assemble_reg3(name: str, operands: list[str]) -> str:
-    base_instruction_assembled: str = assembled_name[name]
 
-    assembled_line: str = base_instruction_assembled
-    for register in operands:
-        binary_register: str = get_register_binary(register)
-        assembled_line += binary_register
+def get_opcode(name: str) -> int:
+    return opcode_codes[name] << opcode_shift
 
-    return assembled_line
 
-def assemble_address(name: str, operands: list[str]) -> str:
-    base_instruction_assembled: str = assembled_name[name]
-    binary_address_value: str = convert_int_to_binary(int(operands[0]))
-    binary_operand_value_normalized: str = normalize_length(binary_address_value, instructions_address_bits)
-    assembled_line: str = f"{base_instruction_assembled}00{binary_operand_value_normalized}"
+def get_address(address: str) -> int:
+    address_code: int | None = address_table.get(address)
+    if address_code is not None:
+        return address_code
 
-    return assembled_line
+    if is_label(address):
+        return 0
 
-
-def assemble_reg2_imm_opt(name: str, operands: list[str]) -> str:
-    max_amount_operands_needed: int = 3
-
-    base_instruction_assembled: str = assembled_name[name]
-
-    assembled_line: str = base_instruction_assembled
-    assembled_line += get_register_binary(operands[0])
-    assembled_line += get_register_binary(operands[1])
-    if len(operands) == max_amount_operands_needed:
-        assembled_line += get_assembled_immediate(operands[2], 4, True)
-    else:
-        assembled_line += "0000"
-
-    return assembled_line
-
-
-def assemble_no_operand(name: str) -> str:
-    return f"{assembled_name[name]}000000000000"
-
-
-def normalize_length(to_normalize: str, size_to_get: int) -> str:
-    return "0" * (size_to_get - len(to_normalize)) +  to_normalize
+    return int(address) & (2**instructions_address_bits - 1)
 
 
 def extract_int_register(register_name: str) -> int:
     return int(register_name[1:])
 
 
-def convert_int_to_binary(value: int) -> str:
-    return bin(value)[2:]
+def get_register_code(register_name: str) -> int:
+    register_code: int | None = register_codes.get(register_name)
+    if register_code is not None:
+        return register_code
+    if is_virtual_register(register_name):
+        raise RegisterOperandsException(f"Virtual register {register_name} was not allocated to a register !")
 
+    return extract_int_register(register_name) & 0b1111
 
-def get_register_binary(register_name: str) -> str:
-    register_number = extract_int_register(register_name)
-    binary_register_number = convert_int_to_binary(register_number)
 
-    return normalize_length(binary_register_number, 4)
+def get_assembled_immediate(immediate_value: str, amount_bits: int, signed: bool = False) -> int:
+    immediate_code: int | None = immediate_tables.get((amount_bits, True), {}).get(immediate_value)
+    if immediate_code is not None:
+        return immediate_code
 
+    if is_label(immediate_value):
+        return 0
 
-def get_assembled_immediate(immediate_value: str, amount_bits: int, signed: bool = False) -> str:
     if is_number(immediate_value, True):
         int_operand_value: int = int(immediate_value)
     elif immediate_value.startswith("0b"):
-        return normalize_length(immediate_value[2:], amount_bits)
+        int_operand_value: int = int(immediate_value[2:], 2)
     else:
         int_operand_value: int = chars[immediate_value[1:2].upper()]
 
-    if signed and int_operand_value < 0:
-        return format(int_operand_value & (2**amount_bits - 1), f'0{amount_bits}b')
-
-    binary_operand_value: str = convert_int_to_binary(int_operand_value)
-
-    return normalize_length(binary_operand_value, amount_bits)
+    return int_operand_value & (2**amount_bits - 1)
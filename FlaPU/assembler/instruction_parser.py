@@ -1,7 +1,8 @@
-from .config import instructions_address_bits, registers_bits, chars
+from .config import instructions_address_bits, chars
+from .operand_tables import address_table, immediate_tables, register_codes
 
-from .exceptions.immediate_value_exception import ImmediateOperandsException
-from .exceptions.register_operands_exception import RegisterOperandsException
+
+virtual_register_prefix: str = "%"
 
 
 def split_instruction_line(line: str) -> list[str]:
@@ -24,34 +25,21 @@ def split_instruction_line(line: str) -> list[str]:
     return final_tokens
 
 
-def parse_labels(instructions: list[str],
-                 labels_table: dict[str, int],
-                 labels_addresses: dict[str, list[int]]) -> tuple[dict[str, int], dict[str, list[int]]]:
-    for address, instruction in enumerate(instructions):
-        tokens: list[str] = split_instruction_line(instruction)
-
-        parse_labels_line(tokens, labels_table, labels_addresses, address)
+def is_label(operand: str) -> bool:
+    return operand.startswith(".")
 
-    return labels_table, labels_addresses
 
-
-def parse_labels_line(tokens: list[str], labels_table: dict[str, int], labels_addresses: dict[str, list[int]], address: int) -> None:
-    before_instruction: bool = True
-    for i, token in enumerate(tokens):
-        is_a_label: bool = token.startswith(".")
-        if is_a_label:
-            if before_instruction:
-                labels_table[token] = address
-            else:
-                if token in labels_addresses:
-                    labels_addresses[token].append(address)
-                else:
-                    labels_addresses[token] = [address]
-        else:
-            before_instruction = False
+def is_virtual_register(register_name: str) -> bool:
+    return register_name.startswith(virtual_register_prefix) and register_name[1:].isidentifier()
 
 
 def is_register_correct(register_name: str, register_amount: int) -> bool:
+    register_code: int | None = register_codes.get(register_name)
+    if register_code is not None:
+        return register_code < register_amount
+    if is_virtual_register(register_name):
+        return True
+
     is_valid_register_prefix: bool = register_name.startswith("r")
     is_valid_register_amount: bool = register_name[1:].isnumeric()
 
@@ -60,7 +48,14 @@ def is_register_correct(register_name: str, register_amount: int) -> bool:
 
     return int(register_name[1:]) < register_amount
 
+
 def is_immediate_value_correct(immediate_value: str, amount_bits: int, signed: bool = False) -> bool:
+    immediate_table: dict[str, int] | None = immediate_tables.get((amount_bits, signed))
+    if immediate_table is not None and immediate_value in immediate_table:
+        return True
+    if amount_bits == instructions_address_bits and immediate_value in address_table:
+        return True
+
     is_single_quoted: bool = immediate_value.startswith("'") and immediate_value.endswith("'")
     is_double_quoted: bool = immediate_value.startswith('"') and immediate_value.endswith('"')
     if is_single_quoted or is_double_quoted:
@@ -69,7 +64,7 @@ def is_immediate_value_correct(immediate_value: str, amount_bits: int, signed: b
 
     is_binary_number: bool = immediate_value.startswith("0b")
     if is_binary_number:
-        are_all_one_zero = all([value in {"0", "1"} for value in immediate_value[2:]])
+        are_all_one_zero = all(value in {"0", "1"} for value in immediate_value[2:])
 
         return are_all_one_zero
 
@@ -80,80 +75,7 @@ def is_immediate_value_correct(immediate_value: str, amount_bits: int, signed: b
 
 
 def is_number(value: str, signed: bool = False) -> bool:
-    valid_digits: set[str] = {"0", "1", "2", "3", "4", "5", "6", "7", "8", "9"}
-
-    if signed and value[0] == "-":
-        return all([value in valid_digits for value in value[1:]]) and not value == ""
-
-    return all([value in valid_digits for value in value]) and not value == ""
-
-
-def are_all_registers(registers: list[str], register_amount: int) -> bool:
-    need_to_continue: bool = True
-    i: int = 0
-    while need_to_continue and i < len(registers):
-        if not is_register_correct(registers[i], register_amount):
-            need_to_continue = False
-
-        i += 1
-
-    return is_register_correct(registers[i - 1], register_amount)
-
-
-def are_operands_regs_correct(operands: list[str],
-                              amount_available_registers: int,
-                              amount_operands_needed: int,
-                              name: str) -> bool:
-    is_operand_amount_valid(operands, amount_operands_needed, name)
-
-    if not are_all_registers(operands, amount_available_registers):
-        raise RegisterOperandsException("Operands are not all classified as valid registers !")
-
-    return True
-
-
-def are_valid_reg_n_imm(operands: list[str], amount_available_registers: int, amount_operands_needed: int, name: str) -> bool:
-    is_operand_amount_valid(operands, amount_operands_needed, name)
-
-    if not is_register_correct(operands[0], amount_available_registers):
-        raise RegisterOperandsException("Register operand is not classified as a valid register !")
-
-    if not is_immediate_value_correct(operands[1], registers_bits, True):
-        raise ImmediateOperandsException("Immediate value operand is not valid !")
-
-    return True
-
-
-def are_valid_reg2_imm_opt(operands: list[str],
-                           name: str,
-                           amount_operands_needed: int,
-                           amount_available_registers: int) -> bool:
-    max_amount_operands_needed: int = 3
-
-    if not (amount_operands_needed <= len(operands) <= max_amount_operands_needed):
-        raise RegisterOperandsException(f"Operands amount for {name} instruction does not match "
-                                        f"{amount_operands_needed} minimum needed registers !")
-
-    are_all_registers(operands, amount_available_registers)
-    if len(operands) == max_amount_operands_needed:
-        if not is_immediate_value_correct(operands[2], 4, True):
-            raise ImmediateOperandsException("Immediate value operand is not valid !")
-
-    return True
-
-
-def is_address_operand_correct(operands: list[str], amount_operands_needed: int, name: str) -> bool:
-    is_operand_amount_valid(operands, amount_operands_needed, name)
-
-    if not is_immediate_value_correct(operands[0], instructions_address_bits):
-        raise ImmediateOperandsException("Operand is not a valid address !")
-
-    return True
-
-
-def is_operand_amount_valid(operands: list[str], amount_operands_needed: int, name: str) -> bool:
-    if len(operands) != amount_operands_needed:
-        raise RegisterOperandsException(f"Operands amount for {name} instruction does not match "
-                                        f"{amount_operands_needed} needed registers !")
+    if signed and value.startswith("-"):
+        value = value[1:]
 
-    return True
+    return value.isascii() and value.isdigit()
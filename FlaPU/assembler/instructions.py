@@ -1,454 +1,167 @@
-from abc import ABC, abstractmethod
-from typing import Type
+from collections.abc import Callable
 
-from .config import assembled_name, flags, instructions_address_bits
-
-from .instruction_parser import (is_operand_amount_valid, is_address_operand_correct, are_valid_reg2_imm_opt,
-                                are_operands_regs_correct, are_valid_reg_n_imm, is_register_correct,
-                                is_immediate_value_correct)
+from .config import assembled_name, instructions_address_bits, registers_bits
+from .instruction_parser import is_register_correct, is_immediate_value_correct, is_label
 from .flag_exception import FlagException
 from .exceptions.immediate_value_exception import ImmediateOperandsException
 from .exceptions.register_operands_exception import RegisterOperandsException
-from .instruction_assembling import (normalize_length, convert_int_to_binary, get_register_binary,
-                                    assemble_address, assemble_no_operand, assemble_reg2_imm_opt,
-                                    assemble_reg_imm, assemble_reg3)
-
-
-class Instruction(ABC):
-    amount_operands_needed: int
-    name: str
-
-    def __init__(self, operands: list[str]):
-        self.operands: list[str] = operands
-
-    @abstractmethod
-    def assemble(self) -> str:
-        pass
-
-    @abstractmethod
-    def are_operands_correct(self, register_amount: int) -> bool:
-        pass
-
-
-class NOPInstruction(Instruction):
-    amount_operands_needed: int = 0
-    name: str = "NOP"
-
-    def __init__(self, operands: list[str]):
-        super().__init__(operands)
-
-    def assemble(self) -> str:
-        return assemble_no_operand(self.name)
-
-    def are_operands_correct(self, amount_available_registers: int) -> bool:
-        is_operand_amount_valid(self.operands, self.amount_operands_needed, self.name)
-
-        return True
-
-
-class HLTInstruction(Instruction):
-    amount_operands_needed: int = 0
-    name: str = "HLT"
-
-    def __init__(self, operands: list[str]):
-        super().__init__(operands)
-
-    def assemble(self) -> str:
-        return assemble_no_operand(self.name)
-
-    def are_operands_correct(self, amount_available_registers: int) -> bool:
-        is_operand_amount_valid(self.operands, self.amount_operands_needed, self.name)
-
-        return True
-
-
-class ADDInstruction(Instruction):
-    amount_operands_needed: int = 3
-    name: str = "ADD"
-
-    def __init__(self, operands: list[str]):
-        super().__init__(operands)
-
-    def assemble(self) -> str:
-        return assemble_reg3(self.name, self.operands)
-
-    def are_operands_correct(self, amount_available_registers: int) -> bool:
-        return are_operands_regs_correct(self.operands,
-                                         amount_available_registers,
-                                         self.amount_operands_needed,
-                                         self.name)
-
-
-class SUBInstruction(Instruction):
-    amount_operands_needed: int = 3
-    name: str = "SUB"
-
-    def __init__(self, operands: list[str]):
-        super().__init__(operands)
-
-    def assemble(self) -> str:
-        return assemble_reg3(self.name, self.operands)
-
-    def are_operands_correct(self, amount_available_registers: int) -> bool:
-        return are_operands_regs_correct(self.operands,
-                                         amount_available_registers,
-                                         self.amount_operands_needed,
-                                         self.name)
-
-
-class NORInstruction(Instruction):
-    amount_operands_needed: int = 3
-    name: str = "NOR"
-
-    def __init__(self, operands: list[str]):
-        super().__init__(operands)
-
-    def assemble(self) -> str:
-        return assemble_reg3(self.name, self.operands)
-
-    def are_operands_correct(self, amount_available_registers: int) -> bool:
-        return are_operands_regs_correct(self.operands,
-                                         amount_available_registers,
-                                         self.amount_operands_needed,
-                                         self.name)
-
-
-class ANDInstruction(Instruction):
-    amount_operands_needed: int = 3
-    name: str = "AND"
-
-    def __init__(self, operands: list[str]):
-        super().__init__(operands)
-
-    def assemble(self) -> str:
-        return assemble_reg3(self.name, self.operands)
-
-    def are_operands_correct(self, amount_available_registers: int) -> bool:
-        return are_operands_regs_correct(self.operands,
-                                         amount_available_registers,
-                                         self.amount_operands_needed,
-                                         self.name)
-
-
-class XORInstruction(Instruction):
-    amount_operands_needed: int = 3
-    name: str = "XOR"
-
-    def __init__(self, operands: list[str]):
-        super().__init__(operands)
-
-    def assemble(self) -> str:
-        return assemble_reg3(self.name, self.operands)
-
-    def are_operands_correct(self, amount_available_registers: int) -> bool:
-        return are_operands_regs_correct(self.operands,
-                                         amount_available_registers,
-                                         self.amount_operands_needed,
-                                         self.name)
-
-
-class RSHInstruction(Instruction):
-    amount_operands_needed: int = 2
-    name: str = "RSH"
-
-    def __init__(self, operands: list[str]):
-        super().__init__(operands)
-
-    def assemble(self) -> str:
-        base_instruction_assembled: str = assembled_name[self.name]
-        binary_operand_receive: str = get_register_binary(self.operands[0])
-        binary_operand_take: str = get_register_binary(self.operands[1])
-        assembled_line: str = f"{base_instruction_assembled}{binary_operand_receive}0000{binary_operand_take}"
-
-        return assembled_line
-
-    def are_operands_correct(self, amount_available_registers: int) -> bool:
-        return are_operands_regs_correct(self.operands,
-                                         amount_available_registers,
-                                         self.amount_operands_needed,
-                                         self.name)
-
-
-class LDIInstruction(Instruction):
-    amount_operands_needed: int = 2
-    name: str = "LDI"
-
-    def __init__(self, operands: list[str]):
-        super().__init__(operands)
-
-    def assemble(self) -> str:
-        return assemble_reg_imm(self.name, self.operands)
-
-    def are_operands_correct(self, amount_available_registers: int) -> bool:
-        return are_valid_reg_n_imm(self.operands,
-                                   amount_available_registers,
-                                   self.amount_operands_needed,
-                                   self.name)
-
-
-class ADIInstruction(Instruction):
-    amount_operands_needed: int = 2
-    name: str = "ADI"
-
-    def __init__(self, operands: list[str]):
-        super().__init__(operands)
-
-    def assemble(self) -> str:
-        return assemble_reg_imm(self.name, self.operands)
-
-    def are_operands_correct(self, amount_available_registers: int) -> bool:
-        return are_valid_reg_n_imm(self.operands,
-                                   amount_available_registers,
-                                   self.amount_operands_needed,
-                                   self.name)
-
-
-class INCInstruction(Instruction):
-    amount_operands_needed: int = 1
-    name: str = "INC"
-
-    def __init__(self, operands: list[str]):
-        super().__init__(operands)
-
-    def assemble(self) -> str:
-        adi_instruction: ADIInstruction = ADIInstruction(self.operands + ["1"])
-        return adi_instruction.assemble()
-
-    def are_operands_correct(self, amount_available_registers: int) -> bool:
-        is_operand_amount_valid(self.operands, self.amount_operands_needed, self.name)
-
-        if not is_register_correct(self.operands[0], amount_available_registers):
-            raise RegisterOperandsException("Operand is not classified as a valid register !")
-
-        return True
-
-
-class DECInstruction(Instruction):
-    amount_operands_needed: int = 1
-    name: str = "DEC"
-
-    def __init__(self, operands: list[str]):
-        super().__init__(operands)
-
-    def assemble(self) -> str:
-        adi_instruction: ADIInstruction = ADIInstruction(self.operands + ["255"])
-        return adi_instruction.assemble()
-
-    def are_operands_correct(self, amount_available_registers: int) -> bool:
-        is_operand_amount_valid(self.operands, self.amount_operands_needed, self.name)
-
-        if not is_register_correct(self.operands[0], amount_available_registers):
-            raise RegisterOperandsException("Operand is not classified as a valid register !")
-
-        return True
-
-class JMPInstruction(Instruction):
-    amount_operands_needed: int = 1
-    name: str = "JMP"
-
-    def __init__(self, operands: list[str]):
-        super().__init__(operands)
-
-    def assemble(self) -> str:
-        return assemble_address(self.name, self.operands)
-
-    def are_operands_correct(self, amount_available_registers: int) -> bool:
-        return is_address_operand_correct(self.operands, self.amount_operands_needed, self.name)
-
-
-class BRHInstruction(Instruction):
-    amount_operands_needed: int = 2
-    name: str = "BRH"
-
-    def __init__(self, operands: list[str]):
-        super().__init__(operands)
-
-    def assemble(self) -> str:
-        base_instruction_assembled: str = assembled_name[self.name]
-        binary_flag: str = flags[self.operands[0].lower()]
-        binary_address_value: str = convert_int_to_binary(int(self.operands[1]))
-        binary_operand_value_normalized: str = normalize_length(binary_address_value, instructions_address_bits)
-        assembled_line: str = f"{base_instruction_assembled}{binary_flag}{binary_operand_value_normalized}"
-
-        return assembled_line
-
-    def are_operands_correct(self, amount_available_registers: int) -> bool:
-        is_operand_amount_valid(self.operands, self.amount_operands_needed, self.name)
-
-        if self.operands[0].lower() not in flags:
-            raise FlagException(f"Operand {self.operands[0]} is not a valid flag !")
-
-        if not is_immediate_value_correct(self.operands[1], instructions_address_bits):
-            raise ImmediateOperandsException("Operand is not a valid address !")
-
-        return True
-
-
-class CMPInstruction(Instruction):
-    amount_operands_needed: int = 2
-    name: str = "CMP"
-
-    def __init__(self, operands: list[str]):
-        super().__init__(operands)
-
-    def assemble(self) -> str:
-        sub_instruction: SUBInstruction = SUBInstruction(self.operands + ["r0"])
-        return sub_instruction.assemble()
-
-    def are_operands_correct(self, amount_available_registers: int) -> bool:
-        return are_operands_regs_correct(self.operands,
-                                         amount_available_registers,
-                                         self.amount_operands_needed,
-                                         self.name)
-
-
-class CALInstruction(Instruction):
-    amount_operands_needed: int = 1
-    name: str = "CAL"
-
-    def __init__(self, operands: list[str]):
-        super().__init__(operands)
-
-    def assemble(self) -> str:
-        return assemble_address(self.name, self.operands)
-
-    def are_operands_correct(self, amount_available_registers: int) -> bool:
-        return is_address_operand_correct(self.operands, self.amount_operands_needed, self.name)
-
-
-class RETInstruction(Instruction):
-    amount_operands_needed: int = 0
-    name: str = "RET"
-
-    def __init__(self, operands: list[str]):
-        super().__init__(operands)
-
-    def assemble(self) -> str:
-        return assemble_no_operand(self.name)
-
-    def are_operands_correct(self, amount_available_registers: int) -> bool:
-        is_operand_amount_valid(self.operands, self.amount_operands_needed, self.name)
-
-        return True
-
-
-class LODInstruction(Instruction):
-    amount_operands_needed: int = 2
-    max_amount_operands_needed: int = 3
-    name: str = "LOD"
-
-    def __init__(self, operands: list[str]):
-        super().__init__(operands)
-
-    def assemble(self) -> str:
-        return assemble_reg2_imm_opt(self.name, self.operands)
-
-    def are_operands_correct(self, amount_available_registers: int) -> bool:
-        return are_valid_reg2_imm_opt(self.operands,
-                                      self.name,
-                                      self.amount_operands_needed,
-                                      amount_available_registers)
-
-
-class STRInstruction(Instruction):
-    amount_operands_needed: int = 2
-    max_amount_operands_needed: int = 3
-    name: str = "STR"
-
-    def __init__(self, operands: list[str]):
-        super().__init__(operands)
-
-    def assemble(self) -> str:
-        return assemble_reg2_imm_opt(self.name, self.operands)
-
-    def are_operands_correct(self, amount_available_registers: int) -> bool:
-        return are_valid_reg2_imm_opt(self.operands,
-                                      self.name,
-                                      self.amount_operands_needed,
-                                      amount_available_registers)
-
-
-class MOVInstruction(Instruction):
-    amount_operands_needed: int = 2
-    name: str = "MOV"
-
-    def __init__(self, operands: list[str]):
-        super().__init__(operands)
-
-    def assemble(self) -> str:
-        add_instruction: ADDInstruction = ADDInstruction([self.operands[0], "r0", self.operands[1]])
-        return add_instruction.assemble()
-
-    def are_operands_correct(self, amount_available_registers: int) -> bool:
-        return are_operands_regs_correct(self.operands,
-                                         amount_available_registers,
-                                         self.amount_operands_needed,
-                                         self.name)
-
-
-class LSHInstruction(Instruction):
-    amount_operands_needed: int = 2
-    name: str = "LSH"
-
-    def __init__(self, operands: list[str]):
-        super().__init__(operands)
-
-    def assemble(self) -> str:
-        add_instruction: ADDInstruction = ADDInstruction([self.operands[0], self.operands[0], self.operands[1]])
-        return add_instruction.assemble()
-
-    def are_operands_correct(self, amount_available_registers: int) -> bool:
-        return are_operands_regs_correct(self.operands,
-                                         amount_available_registers,
-                                         self.amount_operands_needed,
-                                         self.name)
-
-
-class NOTInstruction(Instruction):
-    amount_operands_needed: int = 2
-    name: str = "NOT"
-
-    def __init__(self, operands: list[str]):
-        super().__init__(operands)
-
-    def assemble(self) -> str:
-        nor_instruction: NORInstruction = NORInstruction([self.operands[0], "r0", self.operands[1]])
-        return nor_instruction.assemble()
-
-    def are_operands_correct(self, amount_available_registers: int) -> bool:
-        return are_operands_regs_correct(self.operands,
-                                         amount_available_registers,
-                                         self.amount_operands_needed,
-                                         self.name)
-
-
-class NEGInstruction(Instruction):
-    amount_operands_needed: int = 2
-    name: str = "NEG"
-
-    def __init__(self, operands: list[str]):
-        super().__init__(operands)
-
-    def assemble(self) -> str:
-        sub_instruction: SUBInstruction = SUBInstruction(["r0"] + self.operands)
-        return sub_instruction.assemble()
-
-    def are_operands_correct(self, amount_available_registers: int) -> bool:
-        return are_operands_regs_correct(self.operands,
-                                         amount_available_registers,
-                                         self.amount_operands_needed,
-                                         self.name)
-
-
-available_instructions: dict[str, Type[Instruction]] = {"NOP": NOPInstruction, "HLT": HLTInstruction,
-                                                        "ADD": ADDInstruction, "SUB": SUBInstruction,
-                                                        "NOR": NORInstruction, "AND": ANDInstruction,
-                                                        "XOR": XORInstruction, "RSH": RSHInstruction,
-                                                        "LDI": LDIInstruction, "ADI": ADIInstruction,
-                                                        "INC": INCInstruction, "DEC": DECInstruction,
-                                                        "JMP": JMPInstruction, "BRH": BRHInstruction,
-                                                        "CMP": CMPInstruction, "CAL": CALInstruction,
-                                                        "RET": RETInstruction, "LOD": LODInstruction,
-                                                        "STR": STRInstruction, "MOV": MOVInstruction,
-                                                        "LSH": LSHInstruction, "NOT": NOTInstruction,
-                                                        "NEG": NEGInstruction}
+from .instruction_assembling import get_opcode, get_address, get_register_code, get_assembled_immediate
+from .operand_tables import flag_codes
+
+
+offset_bits: int = 4
+
+
+class OperandKind:
+    __slots__ = ("name", "is_valid", "encode", "exception_type", "error_message", "label_field_bits")
+
+    def __init__(self,
+                 name: str,
+                 is_valid: Callable[[str, int], bool],
+                 encode: Callable[[str], int],
+                 exception_type: type[Exception],
+                 error_message: str,
+                 label_field_bits: int = 0) -> None:
+        self.name: str = name
+        self.is_valid: Callable[[str, int], bool] = is_valid
+        self.encode: Callable[[str], int] = encode
+        self.exception_type: type[Exception] = exception_type
+        self.error_message: str = error_message
+        self.label_field_bits: int = label_field_bits
+
+
+operand_kinds: dict[str, OperandKind] = {
+    "register": OperandKind("register",
+                            is_register_correct,
+                            get_register_code,
+                            RegisterOperandsException,
+                            "Operand {operand} is not classified as a valid register !"),
+    "immediate": OperandKind("immediate",
+                             lambda operand, _: (is_label(operand)
+                                                 or is_immediate_value_correct(operand, registers_bits, True)),
+                             lambda operand: get_assembled_immediate(operand, registers_bits, True),
+                             ImmediateOperandsException,
+                             "Immediate value operand is not valid !",
+                             registers_bits),
+    "offset": OperandKind("offset",
+                          lambda operand, _: is_immediate_value_correct(operand, offset_bits, True),
+                          lambda operand: get_assembled_immediate(operand, offset_bits, True),
+                          ImmediateOperandsException,
+                          "Immediate value operand is not valid !"),
+    "address": OperandKind("address",
+                           lambda operand, _: (is_label(operand)
+                                               or is_immediate_value_correct(operand, instructions_address_bits)),
+                           get_address,
+                           ImmediateOperandsException,
+                           "Operand is not a valid address !",
+                           instructions_address_bits),
+    "flag": OperandKind("flag",
+                        lambda operand, _: operand.lower() in flag_codes,
+                        lambda operand: flag_codes[operand.lower()],
+                        FlagException,
+                        "Operand {operand} is not a valid flag !")
+}
+
+instruction_formats: dict[str, tuple[tuple[str, int], ...]] = {
+    "no_operand": (),
+    "reg3": (("register", 8), ("register", 4), ("register", 0)),
+    "reg2": (("register", 8), ("register", 0)),
+    "reg_imm": (("register", 8), ("immediate", 0)),
+    "address": (("address", 0),),
+    "branch": (("flag", instructions_address_bits), ("address", 0)),
+    "reg2_offset": (("register", 8), ("register", 4), ("offset", 0))
+}
+
+optional_operands: dict[str, int] = {"reg2_offset": 1}
+
+base_instructions: dict[str, str] = {"NOP": "no_operand", "HLT": "no_operand", "ADD": "reg3", "SUB": "reg3",
+                                     "NOR": "reg3", "AND": "reg3", "XOR": "reg3", "RSH": "reg2",
+                                     "LDI": "reg_imm", "ADI": "reg_imm", "JMP": "address", "BRH": "branch",
+                                     "CAL": "address", "RET": "no_operand", "LOD": "reg2_offset", "STR": "reg2_offset"}
+
+pseudo_instructions: dict[str, tuple[str, tuple[int | str, ...]]] = {"INC": ("ADI", (0, "1")),
+                                                                     "DEC": ("ADI", (0, "255")),
+                                                                     "CMP": ("SUB", (0, 1, "r0")),
+                                                                     "MOV": ("ADD", (0, "r0", 1)),
+                                                                     "LSH": ("ADD", (0, 0, 1)),
+                                                                     "NOT": ("NOR", (0, "r0", 1)),
+                                                                     "NEG": ("SUB", ("r0", 0, 1))}
+
+
+class InstructionSpec:
+    __slots__ = ("name", "base_word", "operand_kinds", "min_operands", "fields", "label_field_bits")
+
+    def __init__(self,
+                 name: str,
+                 base_word: int,
+                 operand_kinds: tuple[OperandKind, ...],
+                 fields: tuple[tuple[int, OperandKind, int], ...],
+                 min_operands: int | None = None) -> None:
+        self.name: str = name
+        self.base_word: int = base_word
+        self.operand_kinds: tuple[OperandKind, ...] = operand_kinds
+        self.fields: tuple[tuple[int, OperandKind, int], ...] = fields
+        self.min_operands: int = len(operand_kinds) if min_operands is None else min_operands
+        self.label_field_bits: int = max((kind.label_field_bits for kind in operand_kinds), default=0)
+
+    def check_operands(self, operands: list[str], amount_available_registers: int) -> None:
+        if not self.min_operands <= len(operands) <= len(self.operand_kinds):
+            needed: str = (f"{self.min_operands} minimum" if self.min_operands != len(self.operand_kinds)
+                           else f"{self.min_operands}")
+            raise RegisterOperandsException(f"Operands amount for {self.name} instruction does not match "
+                                            f"{needed} needed registers !")
+
+        for operand, kind in zip(operands, self.operand_kinds):
+            if not kind.is_valid(operand, amount_available_registers):
+                raise kind.exception_type(kind.error_message.format(operand=operand))
+
+    def encode(self, operands: list[str]) -> int:
+        word: int = self.base_word
+        for operand_index, kind, shift in self.fields:
+            if operand_index < len(operands):
+                word |= kind.encode(operands[operand_index]) << shift
+
+        return word
+
+
+def build_instruction_spec(name: str, instruction_format: str) -> InstructionSpec:
+    layout: tuple[tuple[str, int], ...] = instruction_formats[instruction_format]
+    kinds: tuple[OperandKind, ...] = tuple(operand_kinds[kind_name] for kind_name, _ in layout)
+    fields: tuple[tuple[int, OperandKind, int], ...] = tuple((operand_index, operand_kinds[kind_name], shift)
+                                                             for operand_index, (kind_name, shift) in enumerate(layout))
+    min_operands: int = len(layout) - optional_operands.get(instruction_format, 0)
+
+    return InstructionSpec(name, get_opcode(name), kinds, fields, min_operands)
+
+
+def build_pseudo_instruction_spec(name: str,
+                                  target: InstructionSpec,
+                                  template: tuple[int | str, ...]) -> InstructionSpec:
+    base_word: int = target.base_word
+    kinds: dict[int, OperandKind] = {}
+    fields: list[tuple[int, OperandKind, int]] = []
+
+    for (_, kind, shift), source in zip(target.fields, template):
+        if isinstance(source, str):
+            base_word |= kind.encode(source) << shift
+        else:
+            kinds[source] = kind
+            fields.append((source, kind, shift))
+
+    return InstructionSpec(name, base_word, tuple(kinds[i] for i in range(len(kinds))), tuple(fields))
+
+
+def build_instruction_table() -> dict[str, InstructionSpec]:
+    instruction_table: dict[str, InstructionSpec] = {}
+    for name, instruction_format in base_instructions.items():
+        if name not in assembled_name:
+            raise ValueError(f"Instruction {name} has no opcode in the assembler config.")
+        instruction_table[name] = build_instruction_spec(name, instruction_format)
+
+    for name, (target, template) in pseudo_instructions.items():
+        instruction_table[name] = build_pseudo_instruction_spec(name, instruction_table[target], template)
+
+    return instruction_table
+
+
+available_instructions: dict[str, InstructionSpec] = build_instruction_table()
@@ -0,0 +1,52 @@
+from collections.abc import Iterable, Iterator
+
+from .instruction_parser import split_instruction_line, virtual_register_prefix
+from .source_line import SourceLine
+
+
+def tokenize_lines(lines: Iterable[str]) -> Iterator[SourceLine]:
+    for line_number, line in enumerate(lines, start=1):
+        yield tokenize_line(line, line_number)
+
+
+prepass_keywords: tuple[str, ...] = ("define", virtual_register_prefix)
+directive_keywords: tuple[str, ...] = prepass_keywords + ("export", "import")
+
+
+def tokenize_definition_lines(lines: Iterable[str]) -> Iterator[SourceLine]:
+    for line_number, line in enumerate(lines, start=1):
+        lowered_line: str = line.lower()
+        if any(keyword in lowered_line for keyword in prepass_keywords):
+            yield tokenize_line(line, line_number)
+
+
+def tokenize_directive_lines(lines: Iterable[str]) -> Iterator[SourceLine]:
+    for line_number, line in enumerate(lines, start=1):
+        lowered_line: str = line.lower()
+        if any(keyword in lowered_line for keyword in directive_keywords):
+            yield tokenize_line(line, line_number)
+
+
+def tokenize_line(line: str, line_number: int) -> SourceLine:
+    tokens: list[str] = split_instruction_line(strip_comment(line))
+
+    i: int = 0
+    while i < len(tokens) and tokens[i].startswith("."):
+        i += 1
+
+    labels: list[str] = tokens[:i]
+    if i == len(tokens):
+        return SourceLine(labels, "", [], line_number)
+
+    return SourceLine(labels, tokens[i], tokens[i + 1:], line_number)
+
+
+def strip_comment(line: str) -> str:
+    comment_symbol_index: int = line.find("//")
+    if comment_symbol_index == -1:
+        comment_symbol_index = line.find("#")
+
+    if comment_symbol_index == -1:
+        return line
+
+    return line[:comment_symbol_index]
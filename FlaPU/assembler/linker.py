@@ -0,0 +1,51 @@
+from .exceptions.linker_exception import LinkerException
+from .object_module import ObjectModule
+
+
+def collect_exported_symbols(modules: list[ObjectModule], bases: list[int]) -> dict[str, int]:
+    exported_symbols: dict[str, int] = {}
+    exporting_modules: dict[str, str] = {}
+    for module, base in zip(modules, bases):
+        for label in module.exports:
+            if label in exporting_modules:
+                raise LinkerException(f"Label '{label}' is exported by both {exporting_modules[label]} "
+                                      f"and {module.name}.")
+            exporting_modules[label] = module.name
+            exported_symbols[label] = base + module.symbols[label]
+
+    return exported_symbols
+
+
+def link_modules(modules: list[ObjectModule], max_words: int) -> list[int]:
+    bases: list[int] = []
+    linked_size: int = 0
+    for module in modules:
+        bases.append(linked_size)
+        linked_size += len(module.words)
+
+    if linked_size > max_words:
+        sizes: str = ", ".join(f"{module.name} {len(module.words)}" for module in modules)
+        raise LinkerException(f"The linked program needs {linked_size} words but the ROM holds {max_words} ({sizes}).")
+
+    exported_symbols: dict[str, int] = collect_exported_symbols(modules, bases)
+
+    machine_code: list[int] = []
+    for module, base in zip(modules, bases):
+        words: list[int] = list(module.words)
+        for address, symbol, field_bits, line_number in module.relocations:
+            if symbol in module.symbols:
+                value: int = base + module.symbols[symbol]
+            elif symbol in exported_symbols:
+                value = exported_symbols[symbol]
+            else:
+                raise LinkerException(f"Label '{symbol}' is not defined in {module.name} "
+                                      f"nor exported by a linked module (line {line_number}).")
+
+            if value >= 2**field_bits:
+                raise LinkerException(f"Label '{symbol}' address {value} does not fit in {field_bits} bits "
+                                      f"({module.name} line {line_number}).")
+            words[address] |= value
+
+        machine_code.extend(words)
+
+    return machine_code
@@ -0,0 +1,65 @@
+import json
+import os
+
+
+object_format_version: int = 1
+
+Relocation = tuple[int, str, int, int]
+
+
+class ObjectModule:
+    __slots__ = ("name", "words", "symbols", "exports", "imports", "relocations", "source_hash")
+
+    def __init__(self,
+                 name: str,
+                 words: list[int],
+                 symbols: dict[str, int],
+                 exports: list[str],
+                 imports: list[str],
+                 relocations: list[Relocation],
+                 source_hash: str = "") -> None:
+        self.name: str = name
+        self.words: list[int] = words
+        self.symbols: dict[str, int] = symbols
+        self.exports: list[str] = exports
+        self.imports: list[str] = imports
+        self.relocations: list[Relocation] = relocations
+        self.source_hash: str = source_hash
+
+    def to_dict(self) -> dict:
+        return {"version": object_format_version, "name": self.name, "source_hash": self.source_hash,
+                "words": self.words, "symbols": self.symbols, "exports": self.exports, "imports": self.imports,
+                "relocations": [list(relocation) for relocation in self.relocations]}
+
+    @classmethod
+    def from_dict(cls, content: dict) -> "ObjectModule":
+        return cls(content["name"], content["words"], content["symbols"], content["exports"], content["imports"],
+                   [(address, symbol, field_bits, line_number)
+                    for address, symbol, field_bits, line_number in content["relocations"]],
+                   content["source_hash"])
+
+    def save(self, file_path: str) -> None:
+        folder: str = os.path.dirname(file_path)
+        if folder != "":
+            os.makedirs(folder, exist_ok=True)
+
+        temporary_file_path: str = f"{file_path}.{os.getpid()}.tmp"
+        with open(temporary_file_path, "w") as f:
+            json.dump(self.to_dict(), f)
+        os.replace(temporary_file_path, file_path)
+
+    @classmethod
+    def load(cls, file_path: str) -> "ObjectModule | None":
+        if not os.path.exists(file_path):
+            return None
+
+        with open(file_path, "r") as f:
+            try:
+                content: dict = json.load(f)
+            except json.JSONDecodeError:
+                return None
+
+        if content.get("version") != object_format_version:
+            return None
+
+        return cls.from_dict(content)
@@ -0,0 +1,40 @@
+from .config import assembled_name, chars, flags, instructions_address_bits, registers_bits
+
+
+register_table_size: int = 16
+immediate_widths: tuple[int, ...] = (4, registers_bits)
+quotes: tuple[str, ...] = ("'", '"')
+
+
+def build_char_table() -> dict[str, int]:
+    char_table: dict[str, int] = {}
+    for quote in quotes:
+        for char, code in chars.items():
+            char_table[f"{quote}{char}{quote}"] = code
+            char_table[f"{quote}{char.lower()}{quote}"] = code
+
+    return char_table
+
+
+def build_immediate_table(amount_bits: int, signed: bool) -> dict[str, int]:
+    mask: int = 2**amount_bits - 1
+    immediate_table: dict[str, int] = {str(value): value for value in range(2**amount_bits)}
+    if signed:
+        immediate_table.update({str(-value): -value & mask for value in range(1, 2**amount_bits + 1)})
+
+    immediate_table.update({literal: code & mask for literal, code in char_codes.items()})
+
+    return immediate_table
+
+
+opcode_codes: dict[str, int] = {name: int(code, 2) for name, code in assembled_name.items()}
+register_codes: dict[str, int] = {f"r{register}": register for register in range(register_table_size)}
+flag_codes: dict[str, int] = {name: int(code, 2) for name, code in flags.items()}
+char_codes: dict[str, int] = build_char_table()
+
+immediate_tables: dict[tuple[int, bool], dict[str, int]] = {
+    (amount_bits, signed): build_immediate_table(amount_bits, signed)
+    for amount_bits in immediate_widths
+    for signed in (False, True)
+}
+address_table: dict[str, int] = {str(address): address for address in range(2**instructions_address_bits)}
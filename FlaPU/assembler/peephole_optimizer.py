@@ -0,0 +1,256 @@
+from .config import flag_setting_instructions, registers_bits
+from .control_flow import end_of_flow_instructions, expand_instruction, find_numeric_jump
+from .instruction_assembling import get_assembled_immediate, get_register_code
+from .instruction_parser import is_label
+from .program_optimizer import OptimizationChange, ProgramOptimizer
+from .source_line import SourceLine
+
+
+max_optimization_passes: int = 16
+byte_mask: int = 2**registers_bits - 1
+
+flags_reading_instructions: set[str] = {"JMP", "BRH", "CAL", "RET"}
+register_result_instructions: set[str] = {"ADD", "SUB", "NOR", "AND", "XOR", "RSH", "LDI", "ADI"}
+
+
+def get_immediate(operand: str) -> int | str:
+    if is_label(operand):
+        return operand
+
+    return get_assembled_immediate(operand, registers_bits, True)
+
+
+class PeepholeOptimizer(ProgramOptimizer):
+    name: str = "Peephole optimizer"
+
+    def __init__(self, amount_registers: int, max_passes: int = max_optimization_passes) -> None:
+        super().__init__(amount_registers)
+        self.max_passes: int = max_passes
+
+    def optimize(self, instructions: list[SourceLine]) -> list[SourceLine]:
+        self.input_size = self.output_size = len(instructions)
+
+        numeric_jump: SourceLine | None = find_numeric_jump(instructions, self.amount_registers)
+        if numeric_jump is not None:
+            self.disabled_reason = (f"line {numeric_jump.line_number} jumps to the address "
+                                    f"{numeric_jump.operands[-1]}, only programs using labels as jump targets "
+                                    f"are optimized")
+            return instructions
+
+        for _ in range(self.max_passes):
+            amount_changes: int = len(self.changes)
+            instructions = self.optimize_pass(instructions)
+            if len(self.changes) == amount_changes:
+                break
+
+        self.output_size = len(instructions)
+        return instructions
+
+    def optimize_pass(self, instructions: list[SourceLine]) -> list[SourceLine]:
+        expanded_lines: list[tuple[str, list[str]] | None] = [expand_instruction(instruction, self.amount_registers)
+                                                              for instruction in instructions]
+        flags_live: list[bool] = self.compute_flags_liveness(expanded_lines)
+        referenced_labels: set[str] = {operand for instruction in instructions for operand in instruction.operands
+                                       if is_label(operand)}
+
+        optimized_lines: list[SourceLine] = []
+        pending_labels: list[str] = []
+        known_values: dict[int, int | str] = {}
+        reachable: bool = True
+
+        i: int = 0
+        while i < len(instructions):
+            instruction: SourceLine = instructions[i]
+            expanded: tuple[str, list[str]] | None = expanded_lines[i]
+            is_last: bool = i == len(instructions) - 1
+            i += 1
+
+            if not reachable and not any(label in referenced_labels for label in instruction.labels):
+                self.changes.append(OptimizationChange("unreachable_code", instruction.line_number, str(instruction)))
+                continue
+
+            reachable = True
+            if len(instruction.labels) != 0:
+                known_values.clear()
+
+            if expanded is None:
+                known_values.clear()
+            else:
+                operation, operands = expanded
+
+                merged_instruction: SourceLine | None = None
+                if operation == "ADI" and not is_last and len(instructions[i].labels) == 0 and not flags_live[i]:
+                    merged_instruction = self.merge_immediate_additions(instruction, operands, instructions[i],
+                                                                        expanded_lines[i])
+
+                rule: str | None = None
+                if merged_instruction is not None:
+                    instruction = merged_instruction
+                    operands = merged_instruction.operands
+                    i += 1
+                elif operation in {"JMP", "BRH"} and not is_last and operands[-1] in instructions[i].labels:
+                    rule = "jump_to_next"
+                elif not is_last or len(instruction.labels) == len(pending_labels) == 0:
+                    rule = self.find_useless_instruction(operation, operands, known_values, flags_live[i - 1])
+
+                if rule is not None:
+                    self.changes.append(OptimizationChange(rule, instruction.line_number, str(instruction)))
+                    pending_labels.extend(instruction.labels)
+                    continue
+
+                self.update_known_values(operation, operands, known_values)
+                if operation in end_of_flow_instructions:
+                    reachable = False
+
+            if len(pending_labels) != 0:
+                instruction.labels = pending_labels + instruction.labels
+                pending_labels = []
+            optimized_lines.append(instruction)
+
+        return optimized_lines
+
+    def merge_immediate_additions(self,
+                                  first_instruction: SourceLine,
+                                  first_operands: list[str],
+                                  second_instruction: SourceLine,
+                                  second_expanded: tuple[str, list[str]] | None) -> SourceLine | None:
+        if second_expanded is None or second_expanded[0] != "ADI":
+            return None
+
+        first_register, first_immediate = first_operands
+        second_register, second_immediate = second_expanded[1]
+        if get_register_code(first_register) != get_register_code(second_register):
+            return None
+        if is_label(first_immediate) or is_label(second_immediate):
+            return None
+
+        value: int = (get_immediate(first_immediate) + get_immediate(second_immediate)) & byte_mask
+        merged_instruction = SourceLine(first_instruction.labels, "ADI", [first_register, str(value)],
+                                        first_instruction.line_number)
+        self.changes.append(OptimizationChange("merged_additions", first_instruction.line_number,
+                                           f"{first_instruction} ; {second_instruction}", str(merged_instruction)))
+
+        return merged_instruction
+
+    @staticmethod
+    def compute_flags_liveness(expanded_lines: list[tuple[str, list[str]] | None]) -> list[bool]:
+        flags_live: list[bool] = [True] * len(expanded_lines)
+
+        live_after: bool = True
+        for i in range(len(expanded_lines) - 1, -1, -1):
+            flags_live[i] = live_after
+            operation: str | None = None if expanded_lines[i] is None else expanded_lines[i][0]
+
+            if operation is None or operation in flags_reading_instructions:
+                live_after = True
+            elif operation == "HLT" or operation in flag_setting_instructions:
+                live_after = False
+
+        return flags_live
+
+    @staticmethod
+    def find_useless_instruction(operation: str,
+                                 operands: list[str],
+                                 known_values: dict[int, int | str],
+                                 flags_live: bool) -> str | None:
+        if operation not in register_result_instructions:
+            return None
+        if operation in flag_setting_instructions and flags_live:
+            return None
+
+        destination: int = PeepholeOptimizer.get_destination(operation, operands)
+        if destination == 0:
+            return "unused_result"
+
+        if PeepholeOptimizer.get_copied_register(operation, operands, known_values) == destination:
+            return "no_effect"
+
+        value: int | str | None = PeepholeOptimizer.compute_value(operation, operands, known_values)
+        if value is not None and known_values.get(destination) == value:
+            return "redundant_load" if operation == "LDI" else "no_effect"
+
+        return None
+
+    @staticmethod
+    def update_known_values(operation: str, operands: list[str], known_values: dict[int, int | str]) -> None:
+        if operation in {"CAL", "RET", "JMP", "HLT"}:
+            known_values.clear()
+            return
+        if operation == "LOD":
+            known_values.pop(get_register_code(operands[1]), None)
+            return
+        if operation not in register_result_instructions:
+            return
+
+        destination: int = PeepholeOptimizer.get_destination(operation, operands)
+        if destination == 0:
+            return
+
+        value: int | str | None = PeepholeOptimizer.compute_value(operation, operands, known_values)
+        if value is None:
+            known_values.pop(destination, None)
+        else:
+            known_values[destination] = value
+
+    @staticmethod
+    def get_destination(operation: str, operands: list[str]) -> int:
+        if operation in {"LDI", "ADI"}:
+            return get_register_code(operands[0])
+        if operation == "LOD":
+            return get_register_code(operands[1])
+
+        return get_register_code(operands[-1])
+
+    @staticmethod
+    def get_known_value(register: str, known_values: dict[int, int | str]) -> int | str | None:
+        register_code: int = get_register_code(register)
+        if register_code == 0:
+            return 0
+
+        return known_values.get(register_code)
+
+    @staticmethod
+    def get_copied_register(operation: str, operands: list[str], known_values: dict[int, int | str]) -> int | None:
+        if operation == "ADI":
+            return get_register_code(operands[0]) if get_immediate(operands[1]) == 0 else None
+        if operation not in {"ADD", "SUB", "XOR", "AND"}:
+            return None
+
+        first_value: int | str | None = PeepholeOptimizer.get_known_value(operands[0], known_values)
+        second_value: int | str | None = PeepholeOptimizer.get_known_value(operands[1], known_values)
+        if operation == "AND":
+            return get_register_code(operands[0]) if operands[0] == operands[1] else None
+        if second_value == 0:
+            return get_register_code(operands[0])
+        if first_value == 0 and operation != "SUB":
+            return get_register_code(operands[1])
+
+        return None
+
+    @staticmethod
+    def compute_value(operation: str, operands: list[str], known_values: dict[int, int | str]) -> int | str | None:
+        if operation == "LDI":
+            return get_immediate(operands[1])
+
+        first_value: int | str | None = PeepholeOptimizer.get_known_value(operands[0], known_values)
+        if not isinstance(first_value, int):
+            return None
+        if operation == "RSH":
+            return first_value >> 1
+        if operation == "ADI":
+            immediate: int | str = get_immediate(operands[1])
+            return (first_value + immediate) & byte_mask if isinstance(immediate, int) else None
+
+        second_value: int | str | None = PeepholeOptimizer.get_known_value(operands[1], known_values)
+        if not isinstance(second_value, int):
+            return None
+        if operation == "ADD":
+            return (first_value + second_value) & byte_mask
+        if operation == "SUB":
+            return (first_value - second_value) & byte_mask
+        if operation == "NOR":
+            return ~(first_value | second_value) & byte_mask
+        if operation == "AND":
+            return first_value & second_value
+
+        return first_value ^ second_value
@@ -1,96 +1,84 @@
+from collections.abc import Iterable, Iterator
+from typing import TYPE_CHECKING
+
 from .config import memory_mapped_addresses
-from .instruction_parser import split_instruction_line
 from .exceptions.preprocessing_exception import PreprocessingException
-from .preprocessor_utils import is_instruction_has_definition, replace_definition_value
-from .instruction_parser import parse_labels
+from .preprocessor_utils import (is_definition_line, is_module_directive, check_module_directive, add_definition,
+                                 resolve_definitions, substitute_definitions)
+from .source_line import SourceLine
+
+if TYPE_CHECKING:
+    from .build_stats import BuildStats
 
 
 class Preprocessor:
     @classmethod
-    def preprocess_lines(cls, instructions: list[str]) -> list[str]:
-        instructions = cls.remove_comments(instructions)
-        instructions = cls.clean_instructions(instructions)
-        instructions = cls.associate_definitions(instructions)
-        cls.replace_labels(instructions)
+    def preprocess_lines(cls,
+                         instructions: Iterable[SourceLine],
+                         definitions_table: dict[str, str],
+                         stats: "BuildStats | None" = None) -> Iterator[SourceLine]:
+        if stats is None:
+            instructions = cls.remove_comments(instructions)
+            instructions = cls.clean_instructions(instructions)
+            return cls.associate_definitions(instructions, definitions_table)
+
+        instructions = stats.measure_iterator("remove_comments", cls.remove_comments(instructions))
+        instructions = stats.measure_iterator("clean_instructions", cls.clean_instructions(instructions))
+        return stats.measure_iterator("associate_definitions",
+                                      cls.associate_definitions(instructions, definitions_table))
 
-        return instructions
+    @staticmethod
+    def associate_definitions(instructions: Iterable[SourceLine],
+                              definitions_table: dict[str, str]) -> Iterator[SourceLine]:
+        for instruction in instructions:
+            if not is_definition_line(instruction):
+                substitute_definitions(instruction.operands, definitions_table)
+                yield instruction
 
-    @classmethod
-    def associate_definitions(cls, instructions: list[str]) -> list[str]:
-        final_instructions: list[str] = []
+    @staticmethod
+    def collect_definitions(instructions: Iterable[SourceLine]) -> dict[str, str]:
         definitions_table: dict[str, str] = memory_mapped_addresses.copy()
+        builtin_definitions: set[str] = set(memory_mapped_addresses)
 
         for instruction in instructions:
-            tokens: list[str] = split_instruction_line(instruction)
-            definition_in_instruction: str = is_instruction_has_definition(tokens, list(definitions_table.keys()))
-            if tokens[0].lower() == "define":
-                if len(tokens) != 3:
-                    raise PreprocessingException(f"Invalid definition line {instruction}")
-                definitions_table[tokens[1]] = tokens[2]
-            elif definition_in_instruction != "":
-                new_instruction: str = replace_definition_value(tokens, definitions_table, definition_in_instruction)
-                final_instructions.append(new_instruction)
-            else:
-                final_instructions.append(instruction)
-
-        return final_instructions
+            if is_definition_line(instruction):
+                add_definition(instruction, definitions_table, builtin_definitions)
 
-    @staticmethod
-    def replace_labels(instructions: list[str]) -> None:
-        labels_table: dict[str, int] = {}
-        labels_addresses: dict[str, list[int]] = {}
-        parse_labels(instructions, labels_table, labels_addresses)
-
-        for label, address in labels_table.items():
-            instructions[address] = instructions[address].replace(f"{label} ", "")
+        resolve_definitions(definitions_table)
 
-        for label, addresses in labels_addresses.items():
-            if label not in labels_table:
-                raise PreprocessingException(f"Label '{label}' is not defined.")
-            for address in addresses:
-                instructions[address] = instructions[address].replace(label, str(labels_table[label]))
+        return definitions_table
 
     @staticmethod
-    def remove_comments(instructions: list[str]) -> list[str]:
-        final_instructions: list[str] = []
+    def collect_module_directives(instructions: Iterable[SourceLine], directive: str) -> list[str]:
+        names: list[str] = []
         for instruction in instructions:
-            comment_symbol_index: int = instruction.find("//")
-            if comment_symbol_index == -1:
-                comment_symbol_index = instruction.find("#")
-
-            if comment_symbol_index == -1:
-                final_instructions.append(instruction)
-            else:
-                pure_instruction: str = instruction[:comment_symbol_index]
-                if pure_instruction != "":
-                    final_instructions.append(pure_instruction.strip())
+            if instruction.opcode.lower() == directive:
+                check_module_directive(instruction)
+                names.extend(name for name in instruction.operands if name not in names)
 
-        return final_instructions
+        return names
 
     @staticmethod
-    def clean_instructions(instructions: list[str]) -> list[str]:
-        final_instructions: list[str] = []
-        i: int = 0
-        last_got_added: int = -2
+    def remove_comments(instructions: Iterable[SourceLine]) -> Iterator[SourceLine]:
+        return (instruction for instruction in instructions if not instruction.is_empty())
 
-        while i < len(instructions):
-            tokens: list[str] = split_instruction_line(instructions[i])
-
-            if tokens[0][0] == "." and len(tokens) == 1:
-                labels: list[str] = [tokens[0]]
+    @staticmethod
+    def clean_instructions(instructions: Iterable[SourceLine]) -> Iterator[SourceLine]:
+        pending_labels: list[str] = []
 
-                next_instruction: list[str] = split_instruction_line(instructions[i + 1])
-                while next_instruction[0][0] == "." and len(next_instruction) == 1:
-                    labels.append(next_instruction[0])
-                    i += 1
-                    next_instruction: list[str] = split_instruction_line(instructions[i + 1])
+        for instruction in instructions:
+            if is_module_directive(instruction):
+                continue
 
-                final_instructions.append(f"{' '.join(labels)} {instructions[i + 1]}")
+            if instruction.is_label_only():
+                pending_labels.extend(instruction.labels)
+                continue
 
-                last_got_added = i
-            elif last_got_added + 1 != i:
-                final_instructions.append(" ".join(tokens))
+            if len(pending_labels) != 0:
+                instruction.labels = pending_labels + instruction.labels
+                pending_labels = []
 
-            i += 1
+            yield instruction
 
-        return final_instructions
+        if len(pending_labels) != 0:
+            raise PreprocessingException(f"Labels {' '.join(pending_labels)} are not followed by an instruction.")
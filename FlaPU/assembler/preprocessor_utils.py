@@ -1,21 +1,50 @@
-def is_instruction_has_definition(instruction_tokens: list[str], definitions: list[str]) -> str:
-    definition_found: bool = False
-    i: int = 0
-    definition_in_instruction: str = ""
+from .exceptions.preprocessing_exception import PreprocessingException
+from .source_line import SourceLine
 
-    while not definition_found and i < len(definitions):
-        definition: str = definitions[i]
-        if definition in instruction_tokens:
-            definition_found = True
-            definition_in_instruction = definition
 
-        i += 1
+module_directives: set[str] = {"export", "import"}
 
-    return definition_in_instruction
 
+def is_definition_line(instruction: SourceLine) -> bool:
+    return instruction.opcode.lower() == "define"
 
-def replace_definition_value(tokens: list[str], definitions_table: dict[str, str], selected_definition: str) -> str:
-    token_to_merge: str = definitions_table[selected_definition]
-    index_token_to_replace: int = tokens.index(selected_definition)
-    tokens[index_token_to_replace] = token_to_merge
-    return " ".join(tokens)
+
+def is_module_directive(instruction: SourceLine) -> bool:
+    return instruction.opcode.lower() in module_directives
+
+
+def check_module_directive(instruction: SourceLine) -> None:
+    if len(instruction.operands) == 0 or len(instruction.labels) != 0:
+        raise PreprocessingException(f"Invalid {instruction.opcode.lower()} line {instruction} "
+                                     f"(line {instruction.line_number})")
+
+
+def add_definition(instruction: SourceLine, definitions_table: dict[str, str], builtin_definitions: set[str]) -> None:
+    if len(instruction.operands) != 2 or len(instruction.labels) != 0:
+        raise PreprocessingException(f"Invalid definition line {instruction} (line {instruction.line_number})")
+
+    name, value = instruction.operands
+    if name in definitions_table and name not in builtin_definitions:
+        raise PreprocessingException(f"Definition '{name}' is defined more than once (line {instruction.line_number})")
+
+    definitions_table[name] = value
+    builtin_definitions.discard(name)
+
+
+def resolve_definitions(definitions_table: dict[str, str]) -> None:
+    for name in definitions_table:
+        seen_names: set[str] = {name}
+        value: str = definitions_table[name]
+        while value in definitions_table:
+            if value in seen_names:
+                raise PreprocessingException(f"Definition '{name}' refers to itself.")
+            seen_names.add(value)
+            value = definitions_table[value]
+        definitions_table[name] = value
+
+
+def substitute_definitions(tokens: list[str], definitions_table: dict[str, str]) -> None:
+    for i, token in enumerate(tokens):
+        value: str | None = definitions_table.get(token)
+        if value is not None:
+            tokens[i] = value
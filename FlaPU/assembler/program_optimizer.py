@@ -0,0 +1,56 @@
+from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator
+
+from .build_stats import BuildStats
+from .source_line import SourceLine
+
+
+class OptimizationChange:
+    __slots__ = ("rule", "line_number", "before", "after")
+
+    def __init__(self, rule: str, line_number: int, before: str, after: str | None = None) -> None:
+        self.rule: str = rule
+        self.line_number: int = line_number
+        self.before: str = before
+        self.after: str | None = after
+
+    def __str__(self) -> str:
+        after: str = "removed" if self.after is None else self.after
+        return f"line {self.line_number} : {self.before} -> {after} ({self.rule})"
+
+
+class ProgramOptimizer(ABC):
+    name: str = "Optimizer"
+
+    def __init__(self, amount_registers: int) -> None:
+        self.amount_registers: int = amount_registers
+        self.changes: list[OptimizationChange] = []
+        self.disabled_reason: str | None = None
+        self.input_size: int = 0
+        self.output_size: int = 0
+
+    @abstractmethod
+    def optimize(self, instructions: list[SourceLine]) -> list[SourceLine]:
+        pass
+
+    def optimize_lines(self,
+                       instructions: Iterable[SourceLine],
+                       stats: BuildStats | None = None) -> Iterator[SourceLine]:
+        optimized_lines: list[SourceLine] = self.optimize(list(instructions))
+
+        if stats is not None:
+            stats.count("optimize", "removed_instructions", self.input_size - self.output_size)
+            for change in self.changes:
+                stats.count("optimize", change.rule)
+
+        yield from optimized_lines
+
+    def report(self) -> str:
+        if self.disabled_reason is not None:
+            return f"{self.name} skipped : {self.disabled_reason}."
+
+        lines: list[str] = [str(change) for change in sorted(self.changes, key=lambda change: change.line_number)]
+        lines.append(f"{self.name} removed {self.input_size - self.output_size} instruction(s) "
+                     f"({self.input_size} -> {self.output_size}).")
+
+        return "\n".join(lines)
@@ -0,0 +1,273 @@
+from collections.abc import Iterable, Iterator
+
+from .build_stats import BuildStats
+from .config import memory_mapped_addresses, registers_bits
+from .control_flow import expand_instruction, find_numeric_jump
+from .dataflow import (ConstantsProblem, FlowGraph, InstructionEffect, LivenessProblem, Resource, flag_names,
+                       get_instruction_effect, solve_dataflow)
+from .exceptions.register_allocation_exception import RegisterAllocationException
+from .instruction_assembling import get_register_code
+from .instruction_parser import is_virtual_register
+from .peephole_optimizer import byte_mask, get_immediate
+from .source_line import SourceLine
+
+
+spill_memory_top: int = min(int(address) for address in memory_mapped_addresses.values()) - 1
+spill_temporary_name: str = "%spill"
+max_allocation_rounds: int = 8
+offset_sign: int = 1 << (registers_bits - 1)
+
+
+def find_virtual_registers(instructions: Iterable[SourceLine]) -> list[str]:
+    virtual_registers: dict[str, None] = {}
+    for instruction in instructions:
+        for operand in instruction.operands:
+            if is_virtual_register(operand):
+                virtual_registers[operand] = None
+
+    return list(virtual_registers)
+
+
+class RegisterAllocator:
+    def __init__(self, amount_registers: int, max_rounds: int = max_allocation_rounds) -> None:
+        self.amount_registers: int = amount_registers
+        self.max_rounds: int = max_rounds
+        self.virtual_registers: list[str] = []
+        self.temporary_registers: set[str] = set()
+        self.assignments: dict[str, int] = {}
+        self.spill_slots: dict[str, int] = {}
+        self.spill_lines: set[int] = set()
+        self.virtual_accesses: int = 0
+        self.spilled_accesses: int = 0
+        self.spill_loads: int = 0
+        self.spill_stores: int = 0
+
+    def allocate_lines(self,
+                       instructions: Iterable[SourceLine],
+                       stats: BuildStats | None = None) -> Iterator[SourceLine]:
+        allocated_lines: list[SourceLine] = self.allocate(list(instructions))
+
+        if stats is not None:
+            stats.count("allocate_registers", "virtual_registers", len(self.virtual_registers))
+            stats.count("allocate_registers", "spilled_registers", len(self.spill_slots))
+            stats.count("allocate_registers", "spilled_accesses", self.spilled_accesses)
+            stats.count("allocate_registers", "spill_loads", self.spill_loads)
+            stats.count("allocate_registers", "spill_stores", self.spill_stores)
+
+        yield from allocated_lines
+
+    def allocate(self, instructions: list[SourceLine]) -> list[SourceLine]:
+        self.virtual_registers = find_virtual_registers(instructions)
+        if len(self.virtual_registers) == 0:
+            return instructions
+
+        original_accesses: dict[str, int] = self.count_accesses(instructions)
+        self.virtual_accesses = sum(original_accesses.values())
+        self.check_instructions(instructions)
+
+        for _ in range(self.max_rounds):
+            graph: FlowGraph = FlowGraph(instructions, self.amount_registers, self.temporary_registers)
+            interferences: dict[str, set[Resource]] = self.build_interferences(graph)
+            assignments, spilled_registers = self.color_registers(interferences, self.count_accesses(instructions))
+            if len(spilled_registers) == 0:
+                self.assignments = {register: assignments[register] for register in self.virtual_registers
+                                    if register in assignments}
+                self.spilled_accesses = sum(original_accesses[register] for register in self.spill_slots)
+                instructions = self.rename_registers(instructions, assignments)
+                self.check_spill_area(instructions)
+                return instructions
+
+            instructions = self.insert_spill_code(instructions, spilled_registers)
+
+        raise RegisterAllocationException(f"Virtual registers could not be allocated after {self.max_rounds} rounds "
+                                          f"of spilling.")
+
+    def check_instructions(self, instructions: list[SourceLine]) -> None:
+        numeric_jump: SourceLine | None = find_numeric_jump(instructions, self.amount_registers)
+        if numeric_jump is not None:
+            raise RegisterAllocationException(f"Programs using virtual registers must jump to labels, line "
+                                              f"{numeric_jump.line_number} jumps to the address "
+                                              f"{numeric_jump.operands[-1]}.")
+
+        for instruction in instructions:
+            if expand_instruction(instruction, self.amount_registers) is None:
+                raise RegisterAllocationException(f"Cannot allocate the virtual registers, '{instruction}' is not a "
+                                                  f"valid instruction (line {instruction.line_number}).")
+
+    @staticmethod
+    def count_accesses(instructions: list[SourceLine]) -> dict[str, int]:
+        accesses: dict[str, int] = {}
+        for instruction in instructions:
+            for operand in instruction.operands:
+                if is_virtual_register(operand):
+                    accesses[operand] = accesses.get(operand, 0) + 1
+
+        return accesses
+
+    def build_interferences(self, graph: FlowGraph) -> dict[str, set[Resource]]:
+        live_resources: list[frozenset | None] = solve_dataflow(graph, LivenessProblem(graph.resources))
+        physical_registers: frozenset[int] = frozenset(range(1, self.amount_registers))
+        flag_resources: frozenset[str] = frozenset(flag_names)
+
+        labels: set[str] = {label for instruction in graph.instructions for label in instruction.labels}
+
+        interferences: dict[str, set[Resource]] = {register: set()
+                                                   for register in find_virtual_registers(graph.instructions)}
+        for index, effect in enumerate(graph.effects):
+            defined_registers: frozenset[Resource] = effect.defined
+            if effect.clobbers and effect.operands[-1] not in labels:
+                defined_registers = physical_registers
+            for defined_register in defined_registers - flag_resources:
+                for live_register in live_resources[index] - flag_resources:
+                    if defined_register == live_register:
+                        continue
+                    if defined_register in interferences:
+                        interferences[defined_register].add(live_register)
+                    if live_register in interferences:
+                        interferences[live_register].add(defined_register)
+
+        return interferences
+
+    def color_registers(self,
+                        interferences: dict[str, set[Resource]],
+                        accesses: dict[str, int]) -> tuple[dict[str, int], list[str]]:
+        amount_colors: int = self.amount_registers - 1
+        remaining_registers: dict[str, None] = dict.fromkeys(interferences)
+        stack: list[str] = []
+        while len(remaining_registers) != 0:
+            degrees: dict[str, int] = {register: sum(1 for neighbor in interferences[register]
+                                                     if isinstance(neighbor, int) or neighbor in remaining_registers)
+                                       for register in remaining_registers}
+            register: str | None = next((register for register, degree in degrees.items()
+                                         if degree < amount_colors), None)
+            if register is None:
+                register = min(remaining_registers,
+                               key=lambda candidate: (candidate in self.temporary_registers,
+                                                      accesses.get(candidate, 0) / (degrees[candidate] + 1)))
+            stack.append(register)
+            del remaining_registers[register]
+
+        assignments: dict[str, int] = {}
+        spilled_registers: list[str] = []
+        blocked_temporary: str | None = None
+        for register in reversed(stack):
+            used_colors: set[int] = {neighbor if isinstance(neighbor, int) else assignments.get(neighbor, 0)
+                                     for neighbor in interferences[register]}
+            color: int | None = next((color for color in range(1, self.amount_registers) if color not in used_colors),
+                                     None)
+            if color is not None:
+                assignments[register] = color
+            elif register in self.temporary_registers:
+                blocked_temporary = register
+            else:
+                spilled_registers.append(register)
+
+        if blocked_temporary is not None and len(spilled_registers) == 0:
+            raise RegisterAllocationException(f"Too many registers are live at the same time to load the spilled "
+                                              f"register {blocked_temporary}.")
+
+        return assignments, spilled_registers
+
+    def create_temporary_register(self, names: set[str]) -> str:
+        register: str = f"{spill_temporary_name}{len(self.temporary_registers)}"
+        while register in names:
+            register += "_"
+
+        names.add(register)
+        self.temporary_registers.add(register)
+        return register
+
+    def insert_spill_code(self, instructions: list[SourceLine], spilled_registers: list[str]) -> list[SourceLine]:
+        for register in spilled_registers:
+            if register not in self.spill_slots:
+                slot: int = spill_memory_top - len(self.spill_slots)
+                if slot < 0:
+                    raise RegisterAllocationException("There is no data memory left to spill virtual registers.")
+                self.spill_slots[register] = slot
+
+        names: set[str] = set(find_virtual_registers(instructions))
+        spilled_lines: list[SourceLine] = []
+        for instruction in instructions:
+            operation, operands = expand_instruction(instruction, self.amount_registers)
+            effect: InstructionEffect = get_instruction_effect(operation, operands, frozenset())
+            loaded_registers: list[str] = [register for register in spilled_registers if register in effect.used]
+            stored_registers: list[str] = [register for register in spilled_registers if register in effect.defined]
+            if len(loaded_registers) == 0 and len(stored_registers) == 0:
+                spilled_lines.append(instruction)
+                continue
+
+            temporaries: dict[str, str] = {register: self.create_temporary_register(names)
+                                           for register in loaded_registers + stored_registers}
+            labels: list[str] = instruction.labels
+            for register in loaded_registers:
+                temporary: str = temporaries[register]
+                spilled_lines.append(SourceLine(labels, "LDI", [temporary, str(self.spill_slots[register])],
+                                                instruction.line_number))
+                spilled_lines.append(SourceLine([], "LOD", [temporary, temporary, "0"], instruction.line_number))
+                self.spill_lines.add(id(spilled_lines[-1]))
+                self.spill_loads += 1
+                labels = []
+
+            spilled_lines.append(SourceLine(labels, instruction.opcode,
+                                            [temporaries.get(operand, operand) for operand in instruction.operands],
+                                            instruction.line_number))
+
+            for register in stored_registers:
+                address_register: str = self.create_temporary_register(names)
+                spilled_lines.append(SourceLine([], "LDI", [address_register, str(self.spill_slots[register])],
+                                                instruction.line_number))
+                spilled_lines.append(SourceLine([], "STR", [address_register, temporaries[register], "0"],
+                                                instruction.line_number))
+                self.spill_lines.add(id(spilled_lines[-1]))
+                self.spill_stores += 1
+
+        return spilled_lines
+
+    def check_spill_area(self, instructions: list[SourceLine]) -> None:
+        if len(self.spill_slots) == 0:
+            return
+
+        lowest_slot: int = min(self.spill_slots.values())
+        graph: FlowGraph = FlowGraph(instructions, self.amount_registers)
+        known_values: list[frozenset | None] = solve_dataflow(graph, ConstantsProblem())
+        for index, effect in enumerate(graph.effects):
+            instruction: SourceLine = instructions[index]
+            if (effect.operation not in {"LOD", "STR"} or id(instruction) in self.spill_lines
+                    or known_values[index] is None):
+                continue
+
+            base_register: int = get_register_code(effect.operands[0])
+            base: int | str | None = 0 if base_register == 0 else dict(known_values[index]).get(base_register)
+            offset: int | str = get_immediate(effect.operands[2])
+            if not isinstance(base, int) or not isinstance(offset, int):
+                continue
+
+            address: int = (base + ((offset & (2 * offset_sign - 1)) ^ offset_sign) - offset_sign) & byte_mask
+            if lowest_slot <= address <= spill_memory_top:
+                raise RegisterAllocationException(f"Line {instruction.line_number} accesses the data memory address "
+                                                  f"{address} where virtual registers are spilled ({lowest_slot} to "
+                                                  f"{spill_memory_top}), keep the program data below {lowest_slot}.")
+
+    @staticmethod
+    def rename_registers(instructions: list[SourceLine], assignments: dict[str, int]) -> list[SourceLine]:
+        for instruction in instructions:
+            instruction.operands = [f"r{assignments[operand]}" if operand in assignments else operand
+                                    for operand in instruction.operands]
+
+        return instructions
+
+    def report(self) -> str:
+        lines: list[str] = []
+        for register in self.virtual_registers:
+            if register in self.spill_slots:
+                lines.append(f"{register} -> memory {self.spill_slots[register]}")
+            elif register in self.assignments:
+                lines.append(f"{register} -> r{self.assignments[register]}")
+
+        used_registers: int = len(set(self.assignments.values()))
+        lines.append(f"Register allocator mapped {len(self.assignments)} of {len(self.virtual_registers)} virtual "
+                     f"register(s) to {used_registers} register(s) and spilled {len(self.spill_slots)} : "
+                     f"{self.spilled_accesses} of {self.virtual_accesses} virtual register accesses go to memory "
+                     f"({self.spill_loads} load(s) and {self.spill_stores} store(s) added).")
+
+        return "\n".join(lines)
@@ -0,0 +1,26 @@
+class SourceLine:
+    __slots__ = ("labels", "opcode", "operands", "line_number")
+
+    def __init__(self, labels: list[str], opcode: str, operands: list[str], line_number: int) -> None:
+        self.labels: list[str] = labels
+        self.opcode: str = opcode
+        self.operands: list[str] = operands
+        self.line_number: int = line_number
+
+    def is_empty(self) -> bool:
+        return self.opcode == "" and not self.labels
+
+    def is_label_only(self) -> bool:
+        return self.opcode == "" and len(self.labels) != 0
+
+    def tokens(self) -> list[str]:
+        if self.opcode == "":
+            return self.labels + self.operands
+
+        return self.labels + [self.opcode] + self.operands
+
+    def __str__(self) -> str:
+        return " ".join(self.tokens())
+
+    def __repr__(self) -> str:
+        return f"SourceLine({self.labels!r}, {self.opcode!r}, {self.operands!r}, {self.line_number})"
@@ -0,0 +1,185 @@
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from argparse import ArgumentParser, Namespace
+from collections.abc import Callable
+
+from assembler.assembler import Assembler
+from assembler.file_manipulations import write_machine_code_file
+from assembler.lexer import tokenize_lines
+from assembler.preprocessor import Preprocessor
+from assembler.source_line import SourceLine
+from builder.program_builder import amount_registers, max_instructions
+from schematic.schematic import create_schematic_from_machine_code
+from .program_generator import generate_program
+
+
+default_repeat: int = 5
+default_tolerance: float = 0.2
+
+Stage = tuple[str, Callable[[], list], Callable[[list], object]]
+
+
+def tokenize(source_lines: list[str]) -> list[SourceLine]:
+    return list(tokenize_lines(source_lines))
+
+
+def remove_comments(instructions: list[SourceLine]) -> list[SourceLine]:
+    return list(Preprocessor.remove_comments(instructions))
+
+
+def clean_instructions(instructions: list[SourceLine]) -> list[SourceLine]:
+    return list(Preprocessor.clean_instructions(instructions))
+
+
+def associate_definitions(instructions: list[SourceLine]) -> list[SourceLine]:
+    definitions_table: dict[str, str] = Preprocessor.collect_definitions(instructions)
+    return list(Preprocessor.associate_definitions(instructions, definitions_table))
+
+
+def assemble_lines(instructions: list[SourceLine]) -> list[int]:
+    return list(Assembler(amount_registers).assemble_lines(instructions))
+
+
+def build_stages(source_lines: list[str], work_folder: str) -> list[Stage]:
+    def preprocessed() -> list[SourceLine]:
+        return associate_definitions(clean_instructions(remove_comments(tokenize(source_lines))))
+
+    def write_machine_code(machine_code: list[int]) -> None:
+        for extension in (".mc", ".bin", ".hex"):
+            write_machine_code_file(os.path.join(work_folder, f"benchmark{extension}"), machine_code)
+
+    def create_schematic(machine_code: list[int]) -> None:
+        create_schematic_from_machine_code(max_instructions, machine_code, os.path.join(work_folder, "benchmark"))
+
+    return [("tokenize", lambda: source_lines, tokenize),
+            ("remove_comments", lambda: tokenize(source_lines), remove_comments),
+            ("clean_instructions", lambda: remove_comments(tokenize(source_lines)), clean_instructions),
+            ("associate_definitions", lambda: clean_instructions(remove_comments(tokenize(source_lines))),
+             associate_definitions),
+            ("assemble_lines", preprocessed, assemble_lines),
+            ("write_machine_code", lambda: assemble_lines(preprocessed()), write_machine_code),
+            ("create_schematic", lambda: assemble_lines(preprocessed())[:max_instructions], create_schematic)]
+
+
+def measure_stage(prepare: Callable[[], list], run: Callable[[list], object], repeat: int) -> dict[str, float]:
+    best_time: float = float("inf")
+    amount_lines: int = 0
+    for _ in range(repeat):
+        stage_input: list = prepare()
+        amount_lines = len(stage_input)
+        start_time: float = time.perf_counter()
+        run(stage_input)
+        best_time = min(best_time, time.perf_counter() - start_time)
+
+    stage_input: list = prepare()
+    tracemalloc.start()
+    run(stage_input)
+    peak_memory: int = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {"lines": amount_lines,
+            "seconds": best_time,
+            "lines_per_second": amount_lines / max(best_time, 1e-9),
+            "peak_memory": peak_memory}
+
+
+def run_benchmarks(parameters: dict, repeat: int) -> dict[str, dict[str, float]]:
+    source_lines: list[str] = list(generate_program(**parameters))
+
+    with tempfile.TemporaryDirectory() as work_folder:
+        return {name: measure_stage(prepare, run, repeat)
+                for name, prepare, run in build_stages(source_lines, work_folder)}
+
+
+def find_regressions(results: dict[str, dict[str, float]],
+                     baseline_results: dict[str, dict[str, float]],
+                     tolerance: float) -> list[str]:
+    regressions: list[str] = []
+    for name, baseline in baseline_results.items():
+        if name not in results:
+            continue
+
+        result: dict[str, float] = results[name]
+        if result["lines_per_second"] < baseline["lines_per_second"] * (1 - tolerance):
+            regressions.append(f"{name} throughput dropped from {baseline['lines_per_second']:,.0f} "
+                               f"to {result['lines_per_second']:,.0f} lines/s")
+        if result["peak_memory"] > baseline["peak_memory"] * (1 + tolerance):
+            regressions.append(f"{name} peak memory grew from {baseline['peak_memory'] / 1e6:.2f} "
+                               f"to {result['peak_memory'] / 1e6:.2f} MB")
+
+    return regressions
+
+
+def print_results(results: dict[str, dict[str, float]], baseline_results: dict[str, dict[str, float]]) -> None:
+    print(f"{'stage':<24}{'lines':>10}{'time (ms)':>12}{'lines/s':>14}{'peak (MB)':>12}{'vs baseline':>14}")
+    for name, result in results.items():
+        comparison: str = ""
+        if name in baseline_results:
+            comparison = f"{result['lines_per_second'] / baseline_results[name]['lines_per_second']:.2f}x"
+        print(f"{name:<24}{result['lines']:>10}{result['seconds'] * 1000:>12.2f}"
+              f"{result['lines_per_second']:>14,.0f}{result['peak_memory'] / 1e6:>12.2f}{comparison:>14}")
+
+
+def parse_instruction_mix(instruction_mix: str | None) -> dict[str, float] | None:
+    if instruction_mix is None:
+        return None
+
+    weights: dict[str, float] = {}
+    for entry in instruction_mix.split(","):
+        name, _, weight = entry.partition("=")
+        weights[name.strip().upper()] = float(weight) if weight != "" else 1.0
+
+    return weights
+
+
+def parse_arguments() -> Namespace:
+    parser = ArgumentParser(description="Time every stage of the FlaPU pipeline on a generated program.")
+    parser.add_argument("--size", type=int, default=20_000, help="amount of instructions to generate")
+    parser.add_argument("--label-density", type=float, default=0.05, help="share of labelled instructions")
+    parser.add_argument("--defines", type=int, default=16, help="amount of define lines")
+    parser.add_argument("--comment-density", type=float, default=0.1, help="share of lines with a comment")
+    parser.add_argument("--mix", help="instruction weights like ADD=3,LDI=2,JMP (every instruction by default)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the program generator")
+    parser.add_argument("--repeat", type=int, default=default_repeat, help="runs per stage, the best one is kept")
+    parser.add_argument("--save-baseline", metavar="FILE", help="write the results to FILE")
+    parser.add_argument("--compare", metavar="FILE", help="compare the results with a saved baseline")
+    parser.add_argument("--tolerance", type=float, default=default_tolerance,
+                        help="allowed relative slowdown or memory growth before failing")
+
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    arguments: Namespace = parse_arguments()
+    parameters: dict = {"size": arguments.size,
+                        "label_density": arguments.label_density,
+                        "define_count": arguments.defines,
+                        "instruction_mix": parse_instruction_mix(arguments.mix),
+                        "comment_density": arguments.comment_density,
+                        "seed": arguments.seed}
+
+    baseline: dict = {}
+    if arguments.compare is not None:
+        with open(arguments.compare, "r") as f:
+            baseline = json.load(f)
+        if baseline.get("parameters") != parameters:
+            print("The baseline was measured with other parameters, the comparison may not be meaningful.")
+
+    results: dict[str, dict[str, float]] = run_benchmarks(parameters, arguments.repeat)
+    print_results(results, baseline.get("results", {}))
+
+    if arguments.save_baseline is not None:
+        with open(arguments.save_baseline, "w") as f:
+            json.dump({"parameters": parameters, "results": results}, f, indent=4)
+
+    regressions: list[str] = find_regressions(results, baseline.get("results", {}), arguments.tolerance)
+    for regression in regressions:
+        print(f"Regression : {regression}")
+
+    if len(regressions) != 0:
+        sys.exit(1)
@@ -0,0 +1,101 @@
+import random
+
+from collections.abc import Iterator
+
+from assembler.config import flags, instructions_address_bits, memory_mapped_addresses, registers_bits
+from assembler.instructions import InstructionSpec, available_instructions
+
+
+char_literals: str = "ABCDEFGHIJKLMNOPQRSTUVWXYZ.!?"
+
+
+def validate_instruction_mix(instruction_mix: dict[str, float]) -> None:
+    unknown_instructions: set[str] = set(instruction_mix) - set(available_instructions)
+    if len(unknown_instructions) != 0:
+        raise ValueError(f"Unknown instructions in the mix : {', '.join(sorted(unknown_instructions))}")
+
+    if sum(instruction_mix.values()) <= 0:
+        raise ValueError("The instruction mix needs at least one positive weight.")
+
+
+def generate_program(size: int,
+                     label_density: float = 0.05,
+                     define_count: int = 8,
+                     instruction_mix: dict[str, float] | None = None,
+                     comment_density: float = 0.1,
+                     amount_registers: int = 16,
+                     seed: int = 0) -> Iterator[str]:
+    if instruction_mix is None:
+        instruction_mix = {name: 1.0 for name in available_instructions}
+    validate_instruction_mix(instruction_mix)
+
+    rng = random.Random(seed)
+    names: list[str] = list(instruction_mix)
+    weights: list[float] = list(instruction_mix.values())
+
+    labels: dict[int, str] = {address: f".label_{address}"
+                              for address in range(min(size, 2**instructions_address_bits))
+                              if rng.random() < label_density}
+    address_labels: list[str] = list(labels.values())
+    immediate_labels: list[str] = [label for address, label in labels.items() if address < 2**registers_bits]
+
+    definitions: list[str] = [f"CONST_{i}" for i in range(define_count)]
+    definition_lines: dict[int, list[str]] = {}
+    for name in definitions:
+        definition_lines.setdefault(rng.randrange(max(size, 1)), []).append(f"define {name} {rng.randrange(256)}")
+
+    for address in range(size):
+        yield from definition_lines.get(address, [])
+        if rng.random() < comment_density:
+            yield "// generated comment"
+
+        name: str = rng.choices(names, weights)[0]
+        instruction: InstructionSpec = available_instructions[name]
+        operands: list[str] = [generate_operand(kind.name, rng, amount_registers, address_labels, immediate_labels,
+                                                definitions, size)
+                               for kind in instruction.operand_kinds]
+        if len(operands) != instruction.min_operands and rng.random() < 0.5:
+            operands = operands[:instruction.min_operands]
+
+        line: str = " ".join([name] + operands)
+        if rng.random() < comment_density:
+            line += " # generated comment"
+
+        if address in labels:
+            if rng.random() < 0.5:
+                yield labels[address]
+            else:
+                line = f"{labels[address]} {line}"
+
+        yield line
+
+
+def generate_operand(shape: str,
+                     rng: random.Random,
+                     amount_registers: int,
+                     address_labels: list[str],
+                     immediate_labels: list[str],
+                     definitions: list[str],
+                     size: int) -> str:
+    if shape == "register":
+        return f"r{rng.randrange(amount_registers)}"
+    if shape == "flag":
+        return rng.choice(list(flags))
+    if shape == "offset":
+        return str(rng.randrange(8))
+    if shape == "address":
+        if len(address_labels) != 0 and rng.random() < 0.8:
+            return rng.choice(address_labels)
+        return str(rng.randrange(min(max(size, 1), 2**instructions_address_bits)))
+
+    kind: float = rng.random()
+    if kind < 0.15 and len(definitions) != 0:
+        return rng.choice(definitions)
+    if kind < 0.25:
+        return rng.choice(list(memory_mapped_addresses))
+    if kind < 0.35:
+        return f"'{rng.choice(char_literals)}'"
+    if kind < 0.45 and len(immediate_labels) != 0:
+        return rng.choice(immediate_labels)
+
+    return str(rng.randrange(2**registers_bits))
@@ -0,0 +1,106 @@
+import hashlib
+import json
+import os
+
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from assembler.encoding_cache import compute_config_hash
+from .module_imports import find_linked_libraries, get_library_file
+from .program_builder import build_program, get_output_files, default_outputs
+
+
+manifest_file_name: str = ".build_manifest.json"
+
+
+def find_programs(asm_folder: str) -> list[str]:
+    return sorted(os.path.splitext(file_name)[0] for file_name in os.listdir(asm_folder) if file_name.endswith(".as"))
+
+
+def compute_program_hash(program_name: str, asm_folder: str, config_hash: str) -> str:
+    program_file: str = f"{os.path.join(asm_folder, program_name)}.as"
+    source_files: list[str] = [program_file] + [get_library_file(asm_folder, library_name)
+                                                for library_name in find_linked_libraries(program_file, asm_folder)]
+
+    program_hash = hashlib.sha256(config_hash.encode())
+    for source_file in source_files:
+        with open(source_file, "rb") as f:
+            program_hash.update(f.read())
+
+    return program_hash.hexdigest()
+
+
+def load_manifest(mc_folder: str) -> dict[str, dict[str, str]]:
+    manifest_path: str = os.path.join(mc_folder, manifest_file_name)
+    if not os.path.exists(manifest_path):
+        return {}
+
+    with open(manifest_path, "r") as f:
+        manifest: dict = json.load(f)
+
+    return {program_name: outputs for program_name, outputs in manifest.items() if isinstance(outputs, dict)}
+
+
+def save_manifest(mc_folder: str, manifest: dict[str, dict[str, str]]) -> None:
+    with open(os.path.join(mc_folder, manifest_file_name), "w") as f:
+        json.dump(manifest, f, indent=4, sort_keys=True)
+
+
+def is_program_stale(program_name: str,
+                     program_hash: str,
+                     manifest: dict[str, dict[str, str]],
+                     mc_folder: str,
+                     schem_folder: str,
+                     outputs: frozenset[str] = default_outputs) -> bool:
+    built_outputs: dict[str, str] = manifest.get(program_name, {})
+    output_files: dict[str, str] = get_output_files(program_name, mc_folder, schem_folder)
+
+    return not all(built_outputs.get(output) == program_hash and os.path.exists(output_files[output])
+                   for output in outputs)
+
+
+def build_all(asm_folder: str,
+              mc_folder: str,
+              schem_folder: str,
+              max_workers: int | None = None,
+              outputs: frozenset[str] = default_outputs) -> tuple[list[str], list[str], dict[str, str]]:
+    manifest: dict[str, dict[str, str]] = load_manifest(mc_folder)
+    config_hash: str = compute_config_hash()
+
+    stale_programs: dict[str, str] = {}
+    skipped_programs: list[str] = []
+    failed_programs: dict[str, str] = {}
+    for program_name in find_programs(asm_folder):
+        try:
+            program_hash: str = compute_program_hash(program_name, asm_folder, config_hash)
+        except Exception as e:
+            failed_programs[program_name] = str(e)
+            continue
+
+        if is_program_stale(program_name, program_hash, manifest, mc_folder, schem_folder, outputs):
+            stale_programs[program_name] = program_hash
+        else:
+            skipped_programs.append(program_name)
+
+    built_programs: list[str] = []
+    if len(stale_programs) != 0:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures: dict[str, Future] = {program_name: executor.submit(build_program, program_name, asm_folder,
+                                                                        mc_folder, schem_folder, outputs=outputs,
+                                                                        persistent_cache=True)
+                                          for program_name in stale_programs}
+
+            for program_name, future in futures.items():
+                try:
+                    future.result()
+                except Exception as e:
+                    failed_programs[program_name] = str(e)
+                    manifest.pop(program_name, None)
+                else:
+                    built_programs.append(program_name)
+                    built_outputs: dict[str, str] = manifest.setdefault(program_name, {})
+                    for output in outputs:
+                        built_outputs[output] = stale_programs[program_name]
+
+        save_manifest(mc_folder, manifest)
+
+    return built_programs, skipped_programs, failed_programs
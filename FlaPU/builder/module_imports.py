@@ -0,0 +1,37 @@
+import os
+
+from assembler.exceptions.linker_exception import LinkerException
+from assembler.file_manipulations import extract_file_content
+from assembler.lexer import tokenize_directive_lines
+from assembler.preprocessor import Preprocessor
+
+
+library_folder_name: str = "libraries"
+
+
+def get_library_file(asm_folder: str, library_name: str) -> str:
+    return f"{os.path.join(asm_folder, library_folder_name, library_name)}.as"
+
+
+def read_imports(source_file: str) -> list[str]:
+    return Preprocessor.collect_module_directives(tokenize_directive_lines(extract_file_content(source_file)), "import")
+
+
+def find_linked_libraries(source_file: str, asm_folder: str) -> list[str]:
+    libraries: list[str] = []
+    pending_imports: list[tuple[str, str]] = [(library_name, source_file)
+                                              for library_name in reversed(read_imports(source_file))]
+    while len(pending_imports) != 0:
+        library_name, importing_file = pending_imports.pop()
+        if library_name in libraries:
+            continue
+
+        library_file: str = get_library_file(asm_folder, library_name)
+        if not os.path.exists(library_file):
+            raise LinkerException(f"Library {library_name} imported by {importing_file} does not exist "
+                                  f"({library_file}).")
+
+        libraries.append(library_name)
+        pending_imports.extend((imported_name, library_file) for imported_name in reversed(read_imports(library_file)))
+
+    return libraries
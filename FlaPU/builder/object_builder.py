@@ -0,0 +1,63 @@
+import hashlib
+import os
+
+from contextlib import nullcontext
+
+from assembler.assembler import Assembler
+from assembler.build_stats import BuildStats
+from assembler.encoding_cache import compute_config_hash
+from assembler.linker import link_modules
+from assembler.object_module import ObjectModule
+from .module_imports import get_library_file
+
+
+objects_folder_name: str = ".objects"
+
+
+def get_object_file(mc_folder: str, library_name: str) -> str:
+    return os.path.join(mc_folder, objects_folder_name, f"{library_name}.json")
+
+
+def compute_source_hash(source_file: str, amount_registers: int) -> str:
+    with open(source_file, "rb") as f:
+        source: bytes = f.read()
+
+    return hashlib.sha256(f"{compute_config_hash()}:{amount_registers}:".encode() + source).hexdigest()
+
+
+def load_library_object(library_name: str, asm_folder: str, mc_folder: str, assembler: Assembler) -> ObjectModule:
+    library_file: str = get_library_file(asm_folder, library_name)
+    object_file: str = get_object_file(mc_folder, library_name)
+    source_hash: str = compute_source_hash(library_file, assembler.amount_available_registers)
+
+    library_object: ObjectModule | None = ObjectModule.load(object_file)
+    if (library_object is not None and library_object.source_hash == source_hash
+            and assembler.source_map is None):
+        if assembler.stats is not None:
+            assembler.stats.count("assemble_objects", "reused_objects")
+        return library_object
+
+    library_object = assembler.assemble_object(library_file, library_name)
+    library_object.source_hash = source_hash
+    library_object.save(object_file)
+    if assembler.stats is not None:
+        assembler.stats.count("assemble_objects", "assembled_objects")
+
+    return library_object
+
+
+def link_program(program_name: str,
+                 source_file: str,
+                 libraries: list[str],
+                 asm_folder: str,
+                 mc_folder: str,
+                 assembler: Assembler,
+                 max_words: int) -> list[int]:
+    stats: BuildStats | None = assembler.stats
+    with stats.measure("assemble_objects") if stats is not None else nullcontext():
+        modules: list[ObjectModule] = [assembler.assemble_object(source_file, program_name)]
+        modules.extend(load_library_object(library_name, asm_folder, mc_folder, assembler)
+                       for library_name in libraries)
+
+    with stats.measure("link") if stats is not None else nullcontext():
+        return link_modules(modules, max_words)
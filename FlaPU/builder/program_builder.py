@@ -0,0 +1,82 @@
+import os
+
+from contextlib import nullcontext
+from typing import TYPE_CHECKING
+
+from assembler.assembler import Assembler
+from assembler.file_manipulations import write_machine_code_file
+from .module_imports import find_linked_libraries
+
+if TYPE_CHECKING:
+    from assembler.build_stats import BuildStats
+    from assembler.encoding_cache import EncodingCache
+    from assembler.program_optimizer import ProgramOptimizer
+
+
+max_instructions: int = 1024
+amount_registers: int = 16
+encoding_cache_folder: str = ".encoding_cache"
+
+machine_code_outputs: tuple[str, ...] = ("mc", "bin", "hex")
+default_outputs: frozenset[str] = frozenset({"mc", "bin", "schem"})
+
+
+def get_output_files(program_name: str, mc_folder: str, schem_folder: str) -> dict[str, str]:
+    output_files: dict[str, str] = {output: f"{os.path.join(mc_folder, program_name)}.{output}"
+                                    for output in machine_code_outputs}
+    output_files["schem"] = f"{os.path.join(schem_folder, program_name)}.schem"
+
+    return output_files
+
+
+def build_program(program_name: str,
+                  asm_folder: str,
+                  mc_folder: str,
+                  schem_folder: str,
+                  incremental_schematic: bool = False,
+                  encoding_cache: "EncodingCache | None" = None,
+                  outputs: frozenset[str] = default_outputs,
+                  stats: "BuildStats | None" = None,
+                  optimizers: "tuple[ProgramOptimizer, ...]" = (),
+                  persistent_cache: bool = False) -> Assembler:
+    full_as_file: str = f"{os.path.join(asm_folder, program_name)}.as"
+    output_files: dict[str, str] = get_output_files(program_name, mc_folder, schem_folder)
+
+    if not os.path.exists(full_as_file):
+        raise FileNotFoundError(f"The file {full_as_file} does not exist.")
+
+    encoding_cache_file: str = os.path.join(mc_folder, encoding_cache_folder, f"{program_name}.json")
+    if encoding_cache is None and persistent_cache:
+        from assembler.encoding_cache import EncodingCache
+
+        encoding_cache = EncodingCache()
+        with stats.measure("cache_load") if stats is not None else nullcontext():
+            encoding_cache.load(encoding_cache_file)
+
+    assembler = Assembler(amount_registers, encoding_cache, stats, optimizers)
+    machine_code_files: list[str] = [output_files[output] for output in machine_code_outputs if output in outputs]
+    libraries: list[str] = find_linked_libraries(full_as_file, asm_folder)
+    if len(libraries) == 0:
+        machine_code: list[int] = assembler.assemble_file(full_as_file, *machine_code_files,
+                                                          keep_machine_code="schem" in outputs)
+    else:
+        from .object_builder import link_program
+
+        machine_code = link_program(program_name, full_as_file, libraries, asm_folder, mc_folder, assembler,
+                                    max_instructions)
+        with stats.measure("write") if stats is not None else nullcontext():
+            for machine_code_file in machine_code_files:
+                write_machine_code_file(machine_code_file, machine_code)
+
+    if encoding_cache is not None and persistent_cache:
+        with stats.measure("cache_save") if stats is not None else nullcontext():
+            encoding_cache.save(encoding_cache_file)
+
+    if "schem" in outputs:
+        from schematic.schematic import create_schematic_from_machine_code
+
+        full_schem_file: str = os.path.splitext(output_files["schem"])[0]
+        create_schematic_from_machine_code(max_instructions, machine_code, full_schem_file, incremental_schematic,
+                                           stats)
+
+    return assembler
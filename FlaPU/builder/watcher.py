@@ -0,0 +1,132 @@
+import os
+import time
+
+from assembler.encoding_cache import EncodingCache
+from .batch_builder import find_programs
+from .module_imports import find_linked_libraries, library_folder_name
+from .program_builder import build_program, encoding_cache_folder, default_outputs
+
+
+default_poll_interval: float = 0.05
+default_debounce_delay: float = 0.15
+
+
+class ProgramWatcher:
+    def __init__(self,
+                 asm_folder: str,
+                 mc_folder: str,
+                 schem_folder: str,
+                 poll_interval: float = default_poll_interval,
+                 debounce_delay: float = default_debounce_delay,
+                 outputs: frozenset[str] = default_outputs) -> None:
+        self.asm_folder: str = asm_folder
+        self.mc_folder: str = mc_folder
+        self.schem_folder: str = schem_folder
+        self.poll_interval: float = poll_interval
+        self.debounce_delay: float = debounce_delay
+        self.outputs: frozenset[str] = outputs
+
+        self.modification_times: dict[str, int] = self.scan()
+        self.library_modification_times: dict[str, int] = self.scan_libraries()
+        self.pending_programs: dict[str, float] = {}
+        self.encoding_caches: dict[str, EncodingCache] = {}
+
+    def scan(self) -> dict[str, int]:
+        modification_times: dict[str, int] = {}
+        for program_name in find_programs(self.asm_folder):
+            try:
+                modification_times[program_name] = os.stat(self.get_source_file(program_name)).st_mtime_ns
+            except FileNotFoundError:
+                pass
+
+        return modification_times
+
+    def scan_libraries(self) -> dict[str, int]:
+        library_folder: str = os.path.join(self.asm_folder, library_folder_name)
+        if not os.path.isdir(library_folder):
+            return {}
+
+        modification_times: dict[str, int] = {}
+        for library_name in find_programs(library_folder):
+            try:
+                modification_times[library_name] = os.stat(
+                    f"{os.path.join(library_folder, library_name)}.as").st_mtime_ns
+            except FileNotFoundError:
+                pass
+
+        return modification_times
+
+    def find_importing_programs(self, library_names: set[str]) -> list[str]:
+        importing_programs: list[str] = []
+        for program_name in self.modification_times:
+            try:
+                libraries: list[str] = find_linked_libraries(self.get_source_file(program_name), self.asm_folder)
+            except Exception:
+                continue
+            if any(library_name in library_names for library_name in libraries):
+                importing_programs.append(program_name)
+
+        return importing_programs
+
+    def get_source_file(self, program_name: str) -> str:
+        return f"{os.path.join(self.asm_folder, program_name)}.as"
+
+    def get_encoding_cache(self, program_name: str) -> EncodingCache:
+        if program_name not in self.encoding_caches:
+            encoding_cache = EncodingCache()
+            encoding_cache.load(os.path.join(self.mc_folder, encoding_cache_folder, f"{program_name}.json"))
+            self.encoding_caches[program_name] = encoding_cache
+
+        return self.encoding_caches[program_name]
+
+    def poll(self) -> list[str]:
+        now: float = time.monotonic()
+        modification_times: dict[str, int] = self.scan()
+        for program_name, modification_time in modification_times.items():
+            if self.modification_times.get(program_name) != modification_time:
+                self.pending_programs[program_name] = now
+        self.modification_times = modification_times
+
+        library_modification_times: dict[str, int] = self.scan_libraries()
+        changed_libraries: set[str] = {library_name for library_name, modification_time
+                                       in library_modification_times.items()
+                                       if self.library_modification_times.get(library_name) != modification_time}
+        self.library_modification_times = library_modification_times
+        if len(changed_libraries) != 0:
+            for program_name in self.find_importing_programs(changed_libraries):
+                self.pending_programs[program_name] = now
+
+        ready_programs: list[str] = [program_name for program_name, last_change in self.pending_programs.items()
+                                     if now - last_change >= self.debounce_delay]
+        for program_name in ready_programs:
+            del self.pending_programs[program_name]
+
+        return ready_programs
+
+    def rebuild(self, program_name: str) -> float:
+        encoding_cache: EncodingCache = self.get_encoding_cache(program_name)
+        encoding_cache.reset_counters()
+
+        start_time: float = time.perf_counter()
+        build_program(program_name, self.asm_folder, self.mc_folder, self.schem_folder,
+                      incremental_schematic=True, encoding_cache=encoding_cache, outputs=self.outputs,
+                      persistent_cache=True)
+
+        return time.perf_counter() - start_time
+
+    def watch(self) -> None:
+        print(f"Watching {self.asm_folder} for changes (Ctrl+C to stop).")
+        try:
+            while True:
+                for program_name in self.poll():
+                    try:
+                        elapsed_time: float = self.rebuild(program_name)
+                    except Exception as e:
+                        print(f"Failed to build {program_name} : {e}")
+                    else:
+                        encoding_cache: EncodingCache = self.encoding_caches[program_name]
+                        print(f"Rebuilt {program_name} in {elapsed_time * 1000:.1f} ms "
+                              f"(encoding cache hit rate {encoding_cache.hit_rate():.0%})")
+                time.sleep(self.poll_interval)
+        except KeyboardInterrupt:
+            pass
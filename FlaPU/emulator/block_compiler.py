@@ -0,0 +1,202 @@
+from typing import Callable, Sequence
+
+from assembler.config import call_stack_depth, data_memory_size
+from .emulator import (Emulator, rom_size, discarded_register, HLT, ADD, SUB, NOR, AND, XOR, RSH, LDI, ADI, JMP,
+                       BRH, CAL, RET, LOD, STR)
+from .emulator_exception import EmulatorException
+
+
+Block = Callable[[list[int], list[int], list[int], list[bool]], int]
+
+block_terminators: set[int] = {JMP, BRH, CAL, RET, HLT}
+flag_setters: set[int] = {ADD, SUB, NOR, AND, XOR, ADI}
+branch_conditions: dict[int, str] = {0: "z", 1: "not z", 2: "c", 3: "not c"}
+
+
+def register_read(register: int) -> str:
+    return "0" if register == 0 else f"r[{register}]"
+
+
+class BlockCompilerEmulator(Emulator):
+    def __init__(self, machine_code: Sequence[int]) -> None:
+        super().__init__(machine_code)
+
+        self.leaders: set[int] = self.find_leaders()
+        self.blocks: dict[int, Block] = {}
+        self.blocks_length: dict[int, int] = {}
+        self.flags: list[bool] = [False, False]
+
+    def find_leaders(self) -> set[int]:
+        leaders: set[int] = {0}
+        for address, opcode in enumerate(self.opcodes):
+            if opcode in {JMP, BRH, CAL}:
+                leaders.add(self.operands_x[address])
+            if opcode in block_terminators:
+                leaders.add((address + 1) % rom_size)
+
+        return leaders
+
+    def find_block_end(self, start: int) -> int:
+        address: int = start
+        while self.opcodes[address] not in block_terminators:
+            if address + 1 == rom_size or address + 1 in self.leaders:
+                return address
+            address += 1
+
+        return address
+
+    def compile_block(self, start: int) -> Block:
+        end: int = self.find_block_end(start)
+
+        last_flag_setter: int = -1
+        for address in range(start, end + 1):
+            if self.opcodes[address] in flag_setters:
+                last_flag_setter = address
+
+        ends_with_terminator: bool = self.opcodes[end] in block_terminators
+        last_body_address: int = end - 1 if ends_with_terminator else end
+
+        body: list[str] = []
+        if self.opcodes[end] == BRH and last_flag_setter == -1:
+            body.append("z = f[0]; c = f[1]")
+
+        for address in range(start, last_body_address + 1):
+            body.extend(self.compile_instruction(address, address == last_flag_setter))
+
+        if last_flag_setter != -1:
+            body.append("f[0] = z; f[1] = c")
+
+        if ends_with_terminator:
+            body.extend(self.compile_terminator(end))
+        else:
+            body.append(f"return {(end + 1) % rom_size}")
+
+        source: str = "def block(r, m, s, f):\n" + "\n".join(f"    {line}" for line in body) + "\n"
+        namespace: dict = {"EmulatorException": EmulatorException}
+        exec(compile(source, f"<block {start}>", "exec"), namespace)
+
+        self.blocks[start] = namespace["block"]
+        self.blocks_length[start] = end - start + 1
+
+        return namespace["block"]
+
+    def compile_instruction(self, address: int, sets_flags: bool) -> list[str]:
+        opcode: int = self.opcodes[address]
+        operand_x: int = self.operands_x[address]
+        operand_y: int = self.operands_y[address]
+        operand_z: int = self.operands_z[address]
+
+        if opcode in flag_setters:
+            if opcode == ADD:
+                expression: str = f"{register_read(operand_x)} + {register_read(operand_y)}"
+            elif opcode == SUB:
+                expression = f"{register_read(operand_x)} + ({register_read(operand_y)} ^ 0xFF) + 1"
+            elif opcode == ADI:
+                expression = f"{register_read(operand_x)} + {operand_y}"
+            elif opcode == AND:
+                expression = f"{register_read(operand_x)} & {register_read(operand_y)}"
+            elif opcode == XOR:
+                expression = f"{register_read(operand_x)} ^ {register_read(operand_y)}"
+            else:
+                expression = f"({register_read(operand_x)} | {register_read(operand_y)}) ^ 0xFF"
+
+            has_carry: bool = opcode in {ADD, SUB, ADI}
+            lines: list[str] = []
+            if sets_flags:
+                if has_carry:
+                    lines.append(f"v = {expression}; c = v > 0xFF; v &= 0xFF; z = v == 0")
+                else:
+                    lines.append(f"v = {expression}; c = False; z = v == 0")
+                if operand_z != discarded_register:
+                    lines.append(f"r[{operand_z}] = v")
+            elif operand_z != discarded_register:
+                masked_expression: str = f"({expression}) & 0xFF" if has_carry else expression
+                lines.append(f"r[{operand_z}] = {masked_expression}")
+
+            return lines
+
+        if opcode == RSH:
+            return [] if operand_z == discarded_register else [f"r[{operand_z}] = {register_read(operand_x)} >> 1"]
+        if opcode == LDI:
+            return [] if operand_z == discarded_register else [f"r[{operand_z}] = {operand_y}"]
+        if opcode == LOD:
+            load: str = f"m[({register_read(operand_x)} + {operand_y}) & {data_memory_size - 1}]"
+            return [load] if operand_z == discarded_register else [f"r[{operand_z}] = {load}"]
+        if opcode == STR:
+            return [f"m[({register_read(operand_x)} + {operand_y}) & {data_memory_size - 1}] = "
+                    f"{register_read(operand_z)}"]
+
+        return []
+
+    def compile_terminator(self, address: int) -> list[str]:
+        opcode: int = self.opcodes[address]
+        operand_x: int = self.operands_x[address]
+        operand_y: int = self.operands_y[address]
+        next_address: int = (address + 1) % rom_size
+
+        if opcode == JMP:
+            return [f"return {operand_x}"]
+        if opcode == BRH:
+            return [f"return {operand_x} if {branch_conditions[operand_y]} else {next_address}"]
+        if opcode == CAL:
+            return [f"if len(s) == {call_stack_depth}: "
+                    f"raise EmulatorException('Call stack overflow at address {address}.')",
+                    f"s.append({next_address})",
+                    f"return {operand_x}"]
+        if opcode == RET:
+            return [f"if len(s) == 0: raise EmulatorException('Return with an empty call stack at address {address}.')",
+                    "return s.pop()"]
+
+        return [f"return {-address - 1}"]
+
+    def reset(self) -> None:
+        super().reset()
+        self.flags = [False, False]
+
+    def run(self, max_steps: int | None = None) -> int:
+        if self.halted:
+            return 0
+
+        blocks: dict[int, Block] = self.blocks
+        blocks_length: dict[int, int] = self.blocks_length
+        r: list[int] = self.register_file
+        memory: list[int] = self.memory
+        call_stack: list[int] = self.call_stack
+        flags: list[bool] = self.flags
+        flags[0], flags[1] = self.zero_flag, self.carry_flag
+
+        pc: int = self.pc
+        steps: int = 0
+        limit: int = -1 if max_steps is None else max_steps
+
+        try:
+            while True:
+                block: Block | None = blocks.get(pc)
+                if block is None:
+                    block = self.compile_block(pc)
+                length: int = blocks_length[pc]
+
+                if limit != -1 and steps + length > limit:
+                    break
+
+                try:
+                    pc = block(r, memory, call_stack, flags)
+                except EmulatorException:
+                    pc += length - 1
+                    steps += length
+                    raise
+                steps += length
+
+                if pc < 0:
+                    pc = -pc - 1
+                    self.halted = True
+                    break
+        finally:
+            self.pc = pc
+            self.zero_flag, self.carry_flag = flags[0], flags[1]
+            self.executed_instructions += steps
+
+        if not self.halted and limit != -1 and steps < limit:
+            steps += super().run(limit - steps)
+
+        return steps
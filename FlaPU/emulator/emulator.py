@@ -0,0 +1,207 @@
+from typing import Sequence
+
+from assembler.config import assembled_name, instructions_address_bits, data_memory_size, call_stack_depth
+from .emulator_exception import EmulatorException
+
+
+rom_size: int = 2**instructions_address_bits
+amount_registers: int = 16
+discarded_register: int = amount_registers
+
+NOP: int = int(assembled_name["NOP"], 2)
+HLT: int = int(assembled_name["HLT"], 2)
+ADD: int = int(assembled_name["ADD"], 2)
+SUB: int = int(assembled_name["SUB"], 2)
+NOR: int = int(assembled_name["NOR"], 2)
+AND: int = int(assembled_name["AND"], 2)
+XOR: int = int(assembled_name["XOR"], 2)
+RSH: int = int(assembled_name["RSH"], 2)
+LDI: int = int(assembled_name["LDI"], 2)
+ADI: int = int(assembled_name["ADI"], 2)
+JMP: int = int(assembled_name["JMP"], 2)
+BRH: int = int(assembled_name["BRH"], 2)
+CAL: int = int(assembled_name["CAL"], 2)
+RET: int = int(assembled_name["RET"], 2)
+LOD: int = int(assembled_name["LOD"], 2)
+STR: int = int(assembled_name["STR"], 2)
+
+
+def destination_register(register: int) -> int:
+    return discarded_register if register == 0 else register
+
+
+def signed_offset(value: int) -> int:
+    return value - 16 if value >= 8 else value
+
+
+def predecode_word(word: int) -> tuple[int, int, int, int]:
+    opcode: int = word >> 12
+    register_a: int = (word >> 8) & 0b1111
+    register_b: int = (word >> 4) & 0b1111
+    register_c: int = word & 0b1111
+
+    if opcode in {ADD, SUB, NOR, AND, XOR}:
+        return opcode, register_a, register_b, destination_register(register_c)
+    if opcode == RSH:
+        return opcode, register_a, 0, destination_register(register_c)
+    if opcode in {LDI, ADI}:
+        return opcode, register_a, word & 0xFF, destination_register(register_a)
+    if opcode in {JMP, CAL}:
+        return opcode, word & (rom_size - 1), 0, 0
+    if opcode == BRH:
+        return opcode, word & (rom_size - 1), (word >> instructions_address_bits) & 0b11, 0
+    if opcode == LOD:
+        return opcode, register_a, signed_offset(register_c), destination_register(register_b)
+    if opcode == STR:
+        return opcode, register_a, signed_offset(register_c), register_b
+
+    return opcode, 0, 0, 0
+
+
+class Emulator:
+    def __init__(self, machine_code: Sequence[int]) -> None:
+        if len(machine_code) > rom_size:
+            raise EmulatorException(f"The program contains more than {rom_size} instructions.")
+
+        self.machine_code: list[int] = list(machine_code) + [0] * (rom_size - len(machine_code))
+
+        self.opcodes: list[int] = []
+        self.operands_x: list[int] = []
+        self.operands_y: list[int] = []
+        self.operands_z: list[int] = []
+        for word in self.machine_code:
+            opcode, operand_x, operand_y, operand_z = predecode_word(word)
+            self.opcodes.append(opcode)
+            self.operands_x.append(operand_x)
+            self.operands_y.append(operand_y)
+            self.operands_z.append(operand_z)
+
+        self.reset()
+
+    def reset(self) -> None:
+        self.register_file: list[int] = [0] * (amount_registers + 1)
+        self.memory: list[int] = [0] * data_memory_size
+        self.call_stack: list[int] = []
+        self.zero_flag: bool = False
+        self.carry_flag: bool = False
+        self.pc: int = 0
+        self.halted: bool = False
+        self.executed_instructions: int = 0
+
+    @property
+    def registers(self) -> list[int]:
+        return self.register_file[:amount_registers]
+
+    def step(self) -> int:
+        return self.run(1)
+
+    def run(self, max_steps: int | None = None) -> int:
+        if self.halted:
+            return 0
+
+        opcodes: list[int] = self.opcodes
+        operands_x: list[int] = self.operands_x
+        operands_y: list[int] = self.operands_y
+        operands_z: list[int] = self.operands_z
+        r: list[int] = self.register_file
+        memory: list[int] = self.memory
+        call_stack: list[int] = self.call_stack
+        pc_mask: int = rom_size - 1
+        memory_mask: int = data_memory_size - 1
+
+        pc: int = self.pc
+        zero: bool = self.zero_flag
+        carry: bool = self.carry_flag
+        steps: int = 0
+        limit: int = -1 if max_steps is None else max_steps
+
+        try:
+            while steps != limit:
+                opcode: int = opcodes[pc]
+                steps += 1
+
+                if opcode == ADI:
+                    value: int = r[operands_x[pc]] + operands_y[pc]
+                    carry = value > 0xFF
+                    value &= 0xFF
+                    zero = value == 0
+                    r[operands_z[pc]] = value
+                    pc = (pc + 1) & pc_mask
+                elif opcode == BRH:
+                    condition: int = operands_y[pc]
+                    if condition == 0:
+                        taken: bool = zero
+                    elif condition == 1:
+                        taken = not zero
+                    elif condition == 2:
+                        taken = carry
+                    else:
+                        taken = not carry
+                    pc = operands_x[pc] if taken else (pc + 1) & pc_mask
+                elif opcode == ADD:
+                    value = r[operands_x[pc]] + r[operands_y[pc]]
+                    carry = value > 0xFF
+                    value &= 0xFF
+                    zero = value == 0
+                    r[operands_z[pc]] = value
+                    pc = (pc + 1) & pc_mask
+                elif opcode == SUB:
+                    value = r[operands_x[pc]] + (r[operands_y[pc]] ^ 0xFF) + 1
+                    carry = value > 0xFF
+                    value &= 0xFF
+                    zero = value == 0
+                    r[operands_z[pc]] = value
+                    pc = (pc + 1) & pc_mask
+                elif opcode == LDI:
+                    r[operands_z[pc]] = operands_y[pc]
+                    pc = (pc + 1) & pc_mask
+                elif opcode == JMP:
+                    pc = operands_x[pc]
+                elif opcode == LOD:
+                    r[operands_z[pc]] = memory[(r[operands_x[pc]] + operands_y[pc]) & memory_mask]
+                    pc = (pc + 1) & pc_mask
+                elif opcode == STR:
+                    memory[(r[operands_x[pc]] + operands_y[pc]) & memory_mask] = r[operands_z[pc]]
+                    pc = (pc + 1) & pc_mask
+                elif opcode == AND:
+                    value = r[operands_x[pc]] & r[operands_y[pc]]
+                    carry = False
+                    zero = value == 0
+                    r[operands_z[pc]] = value
+                    pc = (pc + 1) & pc_mask
+                elif opcode == XOR:
+                    value = r[operands_x[pc]] ^ r[operands_y[pc]]
+                    carry = False
+                    zero = value == 0
+                    r[operands_z[pc]] = value
+                    pc = (pc + 1) & pc_mask
+                elif opcode == NOR:
+                    value = (r[operands_x[pc]] | r[operands_y[pc]]) ^ 0xFF
+                    carry = False
+                    zero = value == 0
+                    r[operands_z[pc]] = value
+                    pc = (pc + 1) & pc_mask
+                elif opcode == RSH:
+                    r[operands_z[pc]] = r[operands_x[pc]] >> 1
+                    pc = (pc + 1) & pc_mask
+                elif opcode == CAL:
+                    if len(call_stack) == call_stack_depth:
+                        raise EmulatorException(f"Call stack overflow at address {pc}.")
+                    call_stack.append((pc + 1) & pc_mask)
+                    pc = operands_x[pc]
+                elif opcode == RET:
+                    if len(call_stack) == 0:
+                        raise EmulatorException(f"Return with an empty call stack at address {pc}.")
+                    pc = call_stack.pop()
+                elif opcode == HLT:
+                    self.halted = True
+                    break
+                else:
+                    pc = (pc + 1) & pc_mask
+        finally:
+            self.pc = pc
+            self.zero_flag = zero
+            self.carry_flag = carry
+            self.executed_instructions += steps
+
+        return steps
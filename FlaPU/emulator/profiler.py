@@ -0,0 +1,167 @@
+import json
+
+from typing import Sequence
+
+from assembler.config import assembled_name
+from assembler.source_line import SourceLine
+from .emulator import Emulator, rom_size, CAL, RET
+from .emulator_exception import EmulatorException
+
+
+default_instruction_ticks: int = 10
+default_tick_costs: dict[str, int] = {name: default_instruction_ticks for name in assembled_name}
+
+root_frame: str = "main"
+start_region: str = "<start>"
+
+
+def load_tick_costs(tick_costs_file: str) -> dict[str, int]:
+    with open(tick_costs_file, "r", encoding="utf-8") as f:
+        tick_costs: dict[str, int] = {name.upper(): int(ticks) for name, ticks in json.load(f).items()}
+
+    unknown_opcodes: set[str] = set(tick_costs) - set(assembled_name)
+    if len(unknown_opcodes) != 0:
+        raise EmulatorException(f"Unknown opcodes in the tick costs : {', '.join(sorted(unknown_opcodes))}")
+
+    return default_tick_costs | tick_costs
+
+
+def find_label_regions(source_map: Sequence[SourceLine]) -> list[str]:
+    regions: list[str] = []
+    region: str = start_region
+    for instruction in source_map:
+        if len(instruction.labels) != 0:
+            region = instruction.labels[0]
+        regions.append(region)
+
+    return regions
+
+
+class Profiler:
+    def __init__(self,
+                 machine_code: Sequence[int],
+                 source_map: Sequence[SourceLine] | None = None,
+                 tick_costs: dict[str, int] | None = None) -> None:
+        self.emulator = Emulator(machine_code)
+        self.source_map: Sequence[SourceLine] = [] if source_map is None else source_map
+        self.regions: list[str] = find_label_regions(self.source_map)
+
+        if tick_costs is None:
+            tick_costs = default_tick_costs
+        self.opcode_ticks: list[int] = [0] * len(assembled_name)
+        for name, code in assembled_name.items():
+            self.opcode_ticks[int(code, 2)] = tick_costs.get(name, default_instruction_ticks)
+
+        self.frames: tuple[str, ...] = (root_frame,)
+        self.call_stack: list[tuple[str, ...]] = []
+        self.frame_counts: dict[tuple[str, ...], list[int]] = {self.frames: [0] * rom_size}
+        self.executed_instructions: int = 0
+
+    def get_region(self, address: int) -> str:
+        if address < len(self.regions):
+            return self.regions[address]
+
+        return f"{address:#05x}"
+
+    def get_routine_name(self, address: int) -> str:
+        if address < len(self.source_map) and len(self.source_map[address].labels) != 0:
+            return self.source_map[address].labels[0]
+
+        return f"{address:#05x}"
+
+    def run(self, max_instructions: int) -> int:
+        emulator: Emulator = self.emulator
+        opcodes: list[int] = emulator.opcodes
+
+        call_stack: list[tuple[str, ...]] = self.call_stack
+        frames: tuple[str, ...] = self.frames
+        counts: list[int] = self.frame_counts[frames]
+        executed_instructions: int = 0
+
+        while executed_instructions < max_instructions and not emulator.halted:
+            address: int = emulator.pc
+            emulator.run(1)
+            counts[address] += 1
+            executed_instructions += 1
+
+            opcode: int = opcodes[address]
+            if opcode == CAL:
+                call_stack.append(frames)
+                frames = frames + (self.get_routine_name(emulator.pc),)
+                counts = self.frame_counts.setdefault(frames, [0] * rom_size)
+            elif opcode == RET and len(call_stack) != 0:
+                frames = call_stack.pop()
+                counts = self.frame_counts[frames]
+
+        self.frames = frames
+        self.executed_instructions += executed_instructions
+
+        return executed_instructions
+
+    def get_address_counts(self) -> list[int]:
+        address_counts: list[int] = [0] * rom_size
+        for counts in self.frame_counts.values():
+            for address, count in enumerate(counts):
+                address_counts[address] += count
+
+        return address_counts
+
+    def get_ticks(self, address: int, count: int) -> int:
+        return count * self.opcode_ticks[self.emulator.opcodes[address]]
+
+    def get_total_ticks(self) -> int:
+        return sum(self.get_ticks(address, count) for address, count in enumerate(self.get_address_counts()))
+
+    def get_label_hotspots(self) -> list[tuple[str, int, int]]:
+        label_totals: dict[str, list[int]] = {}
+        for address, count in enumerate(self.get_address_counts()):
+            if count != 0:
+                totals: list[int] = label_totals.setdefault(self.get_region(address), [0, 0])
+                totals[0] += count
+                totals[1] += self.get_ticks(address, count)
+
+        return sorted(((label, count, ticks) for label, (count, ticks) in label_totals.items()),
+                      key=lambda hotspot: hotspot[2], reverse=True)
+
+    def get_line_hotspots(self) -> list[tuple[int, int, int]]:
+        return sorted(((address, count, self.get_ticks(address, count))
+                       for address, count in enumerate(self.get_address_counts()) if count != 0),
+                      key=lambda hotspot: hotspot[2], reverse=True)
+
+    def get_collapsed_stacks(self) -> dict[tuple[str, ...], int]:
+        stack_ticks: dict[tuple[str, ...], int] = {}
+        for frames, counts in self.frame_counts.items():
+            for address, count in enumerate(counts):
+                if count != 0:
+                    region: str = self.get_region(address)
+                    stack: tuple[str, ...] = frames if frames[-1] == region else frames + (region,)
+                    stack_ticks[stack] = stack_ticks.get(stack, 0) + self.get_ticks(address, count)
+
+        return stack_ticks
+
+    def describe_address(self, address: int) -> str:
+        if address >= len(self.source_map):
+            return f"{address:#05x}"
+
+        instruction: SourceLine = self.source_map[address]
+        return f"line {instruction.line_number} : {instruction}"
+
+    def report(self, max_lines: int = 20) -> str:
+        total_ticks: int = self.get_total_ticks()
+        lines: list[str] = [f"Executed {self.executed_instructions} instructions, {total_ticks} estimated ticks.",
+                            "",
+                            f"{'label':<24}{'instructions':>14}{'ticks':>14}{'share':>8}"]
+        for label, count, ticks in self.get_label_hotspots():
+            lines.append(f"{label:<24}{count:>14}{ticks:>14}{ticks / max(total_ticks, 1):>8.1%}")
+
+        lines.extend(["", f"{'address':<10}{'instructions':>14}{'ticks':>14}{'share':>8}  source"])
+        for address, count, ticks in self.get_line_hotspots()[:max_lines]:
+            lines.append(f"{address:<10}{count:>14}{ticks:>14}{ticks / max(total_ticks, 1):>8.1%}  "
+                         f"{self.describe_address(address)}")
+
+        return "\n".join(lines)
+
+    def write_collapsed_stacks(self, collapsed_stacks_file: str) -> None:
+        with open(collapsed_stacks_file, "w", encoding="utf-8") as f:
+            for stack, ticks in sorted(self.get_collapsed_stacks().items()):
+                f.write(f"{';'.join(stack)} {ticks}\n")
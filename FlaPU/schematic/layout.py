@@ -0,0 +1,137 @@
+from functools import lru_cache
+from typing import Sequence
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+instruction_bits: int = 16
+
+start_x, start_y, start_z = -33, -1, 4
+x_other_side_pos: int = 3
+z_distance_instructions: int = 7
+
+block_palette: tuple[str, str, str] = ("minecraft:purple_wool",
+                                       "minecraft:repeater[facing=north]",
+                                       "minecraft:repeater[facing=south]")
+
+BlockTable = tuple[Sequence[int], Sequence[int], Sequence[int], Sequence[int]]
+
+
+def determine_side_and_facing(address: int, total_instructions: int) -> tuple[bool, str, int]:
+    half_instructions: int = total_instructions // 2
+    quarter_instructions: int = total_instructions // 4
+    three_quarters_instructions: int = quarter_instructions * 3
+
+    facing: str = "north" if address < half_instructions else "south"
+    facing_offset: int = 2 if address >= half_instructions else 0
+    if quarter_instructions <= address < half_instructions or address >= three_quarters_instructions:
+        return True, facing, facing_offset
+    return False, facing, facing_offset
+
+
+def calculate_x_offset(index: int, x_offset_stagger: int) -> int:
+    return (index // 16) % 16 * 2 + x_offset_stagger
+
+
+def update_stagger(side: bool, x_offset_stagger: int) -> int:
+    if x_offset_stagger in {1, -1}:
+        return 0
+    return 1 if not side else -1
+
+
+def bit_y_offset(bit_index: int) -> int:
+    return start_y - 2 * bit_index - (2 if bit_index >= instruction_bits // 2 else 0)
+
+
+def compute_block_table(machine_code: Sequence[int], max_instructions: int) -> BlockTable:
+    xs, ys, zs, repeater_ids = compute_positions(max_instructions)
+
+    if np is None:
+        block_ids: list[int] = compute_block_ids_python(machine_code, max_instructions, repeater_ids)
+    else:
+        block_ids: list[int] = compute_block_ids_numpy(machine_code, max_instructions, repeater_ids)
+
+    return xs, ys, zs, block_ids
+
+
+@lru_cache(maxsize=8)
+def compute_positions(max_instructions: int) -> BlockTable:
+    if np is None:
+        return compute_positions_python(max_instructions)
+
+    return compute_positions_numpy(max_instructions)
+
+
+def compute_positions_numpy(max_instructions: int) -> BlockTable:
+    addresses = np.arange(max_instructions)
+    half_instructions: int = max_instructions // 2
+    quarter_instructions: int = max_instructions // 4
+
+    is_other_side = (((quarter_instructions <= addresses) & (addresses < half_instructions))
+                     | (addresses >= quarter_instructions * 3))
+    is_south = addresses >= half_instructions
+    stagger = np.where(addresses % 2 == 1, np.where(np.roll(is_other_side, 1), -1, 1), 0)
+
+    xs = np.where(is_other_side, x_other_side_pos, start_x) + (addresses // 16) % 16 * 2 + stagger
+    zs = start_z + (addresses % 16) * z_distance_instructions + np.where(is_south, 2, 0)
+
+    bit_indices = np.arange(instruction_bits)
+    ys = start_y - 2 * bit_indices - np.where(bit_indices >= instruction_bits // 2, 2, 0)
+
+    return (tuple(np.repeat(xs, instruction_bits).tolist()),
+            tuple(np.tile(ys, max_instructions).tolist()),
+            tuple(np.repeat(zs, instruction_bits).tolist()),
+            tuple(np.where(is_south, 2, 1).tolist()))
+
+
+def compute_positions_python(max_instructions: int) -> BlockTable:
+    xs: list[int] = []
+    ys: list[int] = []
+    zs: list[int] = []
+    repeater_ids: list[int] = []
+    bits_y: list[int] = [bit_y_offset(bit_index) for bit_index in range(instruction_bits)]
+
+    x_offset_stagger: int = 0
+    for i in range(max_instructions):
+        is_other_side, facing, z_facing_offset = determine_side_and_facing(i, max_instructions)
+        x: int = (x_other_side_pos if is_other_side else start_x) + calculate_x_offset(i, x_offset_stagger)
+        z: int = start_z + (i % 16) * z_distance_instructions + z_facing_offset
+        repeater_ids.append(1 if facing == "north" else 2)
+
+        xs.extend([x] * instruction_bits)
+        ys.extend(bits_y)
+        zs.extend([z] * instruction_bits)
+
+        x_offset_stagger = update_stagger(is_other_side, x_offset_stagger)
+
+    return tuple(xs), tuple(ys), tuple(zs), tuple(repeater_ids)
+
+
+def compute_block_ids_numpy(machine_code: Sequence[int],
+                            max_instructions: int,
+                            repeater_ids: Sequence[int]) -> list[int]:
+    rom = np.zeros(max_instructions, dtype=np.uint16)
+    rom[:len(machine_code)] = np.asarray(machine_code, dtype=np.uint16)
+
+    shifts = np.arange(instruction_bits - 1, -1, -1, dtype=np.uint16)
+    bits = (rom[:, None] >> shifts) & 1
+
+    return (bits * np.asarray(repeater_ids)[:, None]).ravel().tolist()
+
+
+def compute_block_ids_python(machine_code: Sequence[int],
+                             max_instructions: int,
+                             repeater_ids: Sequence[int]) -> list[int]:
+    block_ids: list[int] = []
+    amount_instructions: int = len(machine_code)
+
+    for i in range(max_instructions):
+        instruction: int = machine_code[i] if i < amount_instructions else 0
+        repeater_id: int = repeater_ids[i]
+        for bit_index in range(instruction_bits - 1, -1, -1):
+            block_ids.append(repeater_id if instruction >> bit_index & 1 else 0)
+
+    return block_ids
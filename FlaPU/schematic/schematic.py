@@ -1,96 +1,134 @@
-from mcschematic import MCSchematic, Version
-
-from .schematic_exception import SchematicException
+import os
 
+from contextlib import nullcontext
+from typing import Sequence
 
-def place_instruction(instruction: str, x: int, y: int, z: int, schematic: MCSchematic, facing: str) -> None:
-    if len(instruction) != 16:
-        raise SchematicException(f"Instruction : {instruction} is not long of 16 characters.")
-
-    for i, bit in enumerate(instruction):
-        if bit == "1":
-            schematic.setBlock((x, y, z), f'minecraft:repeater[facing={facing}]')
-        elif bit == "0":
-            schematic.setBlock((x, y, z), 'minecraft:purple_wool')
-        else:
-            raise SchematicException(f"Instruction : {instruction} does not only contain '1' or '0'.")
+from assembler.build_stats import BuildStats
+from assembler.file_manipulations import BinaryMachineCodeWriter, read_binary_machine_code
+from .layout import instruction_bits, block_palette, compute_block_table
+from .schematic_exception import SchematicException
+from .sponge_writer import SpongeSchematicWriter
 
-        y -= 2
 
-        if i == (len(instruction) // 2) - 1:
-            y -= 2
+previous_rom_extension: str = ".rom"
+delta_extension: str = ".delta.mcfunction"
 
 
-def load_machine_code(file_path: str, max_instructions: int) -> list[str]:
-    with open(file_path, "r") as f:
-        machine_code: list[str] = [line.strip() for line in f.readlines()]
+def load_machine_code(file_path: str, max_instructions: int) -> Sequence[int]:
+    if os.path.splitext(file_path)[1].lower() == ".bin":
+        try:
+            machine_code: Sequence[int] = read_binary_machine_code(file_path)
+        except ValueError as e:
+            raise SchematicException(str(e)) from e
+    else:
+        machine_code: Sequence[int] = load_text_machine_code(file_path)
 
     if len(machine_code) > max_instructions:
         raise SchematicException(f"File : {file_path} contains more than {max_instructions} instructions.")
 
-    while len(machine_code) != max_instructions:
-        machine_code.append("0000000000000000")
-
     return machine_code
 
 
-def place_instruction_and_handle_exception(instruction: str,
-                                           final_x: int,
-                                           y: int,
-                                           final_z: int,
-                                           schematic: MCSchematic,
-                                           facing: str,
-                                           instruction_line: int):
-    try:
-        place_instruction(instruction, final_x, y, final_z, schematic, facing)
-    except SchematicException as e:
-        new_message: str = f"{str(e)} (line {instruction_line + 1})"
-        raise SchematicException(new_message) from e
+def load_text_machine_code(file_path: str) -> list[int]:
+    machine_code: list[int] = []
+    with open(file_path, "r") as f:
+        for instruction_line, line in enumerate(f):
+            instruction: str = line.strip()
+            if len(instruction) != instruction_bits:
+                raise SchematicException(f"Instruction : {instruction} is not long of {instruction_bits} characters. "
+                                         f"(line {instruction_line + 1})")
+            if instruction.strip("01") != "":
+                raise SchematicException(f"Instruction : {instruction} does not only contain '1' or '0'. "
+                                         f"(line {instruction_line + 1})")
+            machine_code.append(int(instruction, 2))
 
+    return machine_code
 
-def determine_side_and_facing(address: int, total_instructions: int) -> tuple[bool, str, int]:
-    half_instructions: int = total_instructions // 2
-    quarter_instructions: int = total_instructions // 4
-    three_quarters_instructions: int = quarter_instructions * 3
 
-    facing: str = "north" if address < half_instructions else "south"
-    facing_offset: int = 2 if address >= half_instructions else 0
-    if quarter_instructions <= address < half_instructions or address >= three_quarters_instructions:
-        return True, facing, facing_offset
-    return False, facing, facing_offset
+def create_schematic(max_instructions: int,
+                     machine_code_file_path: str,
+                     schem_file_path: str,
+                     incremental: bool = False,
+                     stats: BuildStats | None = None) -> list[int]:
+    with stats.measure("schematic_read") if stats is not None else nullcontext():
+        machine_code: Sequence[int] = load_machine_code(machine_code_file_path, max_instructions)
 
+    return create_schematic_from_machine_code(max_instructions, machine_code, schem_file_path, incremental, stats)
 
-def calculate_x_offset(index: int, x_offset_stagger: int) -> int:
-    return (index // 16) % 16 * 2 + x_offset_stagger
 
+def create_schematic_from_machine_code(max_instructions: int,
+                                       machine_code: Sequence[int],
+                                       schem_file_path: str,
+                                       incremental: bool = False,
+                                       stats: BuildStats | None = None) -> list[int]:
+    if len(machine_code) > max_instructions:
+        raise SchematicException(f"The program contains more than {max_instructions} instructions.")
 
-def update_stagger(side: bool, x_offset_stagger: int) -> int:
-    if x_offset_stagger in {1, -1}:
-        return 0
-    return 1 if not side else -1
+    full_schem_file: str = f"{schem_file_path}.schem"
+    rom_file: str = f"{schem_file_path}{previous_rom_extension}"
 
+    with stats.measure("schematic_delta") if stats is not None else nullcontext():
+        if incremental and os.path.exists(full_schem_file):
+            changed_addresses: list[int] = find_changed_addresses(machine_code, rom_file, max_instructions)
+        else:
+            changed_addresses: list[int] = list(range(max_instructions))
+
+    with stats.measure("schematic_layout") if stats is not None else nullcontext():
+        xs, ys, zs, block_ids = compute_block_table(machine_code, max_instructions)
 
-def create_schematic(max_instructions: int, machine_code_file_path: str, schem_file_path: str) -> None:
-    schematic = MCSchematic()
-    machine_code = load_machine_code(machine_code_file_path, max_instructions)
+    with stats.measure("schematic_delta") if stats is not None else nullcontext():
+        if incremental:
+            write_setblock_commands(f"{schem_file_path}{delta_extension}", changed_addresses, xs, ys, zs, block_ids)
 
-    start_x, y, start_z = -33, -1, 4
-    x_other_side_pos: int = 3
-    z, x_offset_stagger = start_z, 0
-    z_distance_instructions = 7
+    with stats.measure("schematic_write") if stats is not None else nullcontext():
+        if len(changed_addresses) != 0:
+            SpongeSchematicWriter(block_palette).write(full_schem_file, xs, ys, zs, block_ids)
+            with BinaryMachineCodeWriter(rom_file) as rom_writer:
+                rom_writer.write_words(machine_code)
 
-    for i, instruction in enumerate(machine_code):
-        is_other_side, facing, z_facing_offset = determine_side_and_facing(i, max_instructions)
-        x = x_other_side_pos if is_other_side else start_x
-        final_x = x + calculate_x_offset(i, x_offset_stagger)
-        final_z = z + z_facing_offset
+    if stats is not None:
+        stats.stage("schematic_layout").lines += max_instructions
+        stats.count("schematic_layout", "blocks_placed", sum(1 for block_id in block_ids if block_id != 0))
+        stats.count("schematic_delta", "changed_instructions", len(changed_addresses))
+        if incremental:
+            stats.count("schematic_delta", "setblock_commands", len(changed_addresses) * instruction_bits)
+        stats.count("schematic_write", "blocks_written", len(block_ids) if len(changed_addresses) != 0 else 0)
 
-        place_instruction_and_handle_exception(instruction, final_x, y, final_z, schematic, facing, i + 1)
+    return changed_addresses
 
-        z += z_distance_instructions
-        x_offset_stagger = update_stagger(is_other_side, x_offset_stagger)
 
-        if (i + 1) % 16 == 0:
-            z = start_z
+def find_changed_addresses(machine_code: Sequence[int], previous_rom_file: str, max_instructions: int) -> list[int]:
+    if not os.path.exists(previous_rom_file):
+        return list(range(max_instructions))
 
-    schematic.save('.', schem_file_path, version=Version.JE_1_18_2)
+    try:
+        previous_machine_code: Sequence[int] = read_binary_machine_code(previous_rom_file)
+    except ValueError:
+        return list(range(max_instructions))
+
+    amount_instructions: int = len(machine_code)
+    amount_previous_instructions: int = len(previous_machine_code)
+
+    changed_addresses: list[int] = []
+    for address in range(max_instructions):
+        word: int = machine_code[address] if address < amount_instructions else 0
+        previous_word: int = previous_machine_code[address] if address < amount_previous_instructions else 0
+        if word != previous_word:
+            changed_addresses.append(address)
+
+    return changed_addresses
+
+
+def write_setblock_commands(file_path: str,
+                            addresses: list[int],
+                            xs: Sequence[int],
+                            ys: Sequence[int],
+                            zs: Sequence[int],
+                            block_ids: Sequence[int]) -> None:
+    commands: list[str] = []
+    for address in addresses:
+        for i in range(address * instruction_bits, (address + 1) * instruction_bits):
+            commands.append(f"setblock ~{xs[i]} ~{ys[i]} ~{zs[i]} {block_palette[block_ids[i]]}")
+
+    with open(file_path, "w") as f:
+        f.write("\n".join(commands) + "\n" if len(commands) != 0 else "")
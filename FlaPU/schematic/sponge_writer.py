@@ -0,0 +1,129 @@
+import gzip
+import struct
+
+from typing import BinaryIO, Sequence
+
+
+sponge_schematic_version: int = 2
+data_version_1_18_2: int = 2975
+
+TAG_END: int = 0
+TAG_SHORT: int = 2
+TAG_INT: int = 3
+TAG_BYTE_ARRAY: int = 7
+TAG_LIST: int = 9
+TAG_COMPOUND: int = 10
+TAG_INT_ARRAY: int = 11
+
+
+def write_tag_header(f: BinaryIO, tag_type: int, name: str) -> None:
+    encoded_name: bytes = name.encode("utf-8")
+    f.write(struct.pack(">bH", tag_type, len(encoded_name)))
+    f.write(encoded_name)
+
+
+def write_short(f: BinaryIO, name: str, value: int) -> None:
+    write_tag_header(f, TAG_SHORT, name)
+    f.write(struct.pack(">h", value))
+
+
+def write_int(f: BinaryIO, name: str, value: int) -> None:
+    write_tag_header(f, TAG_INT, name)
+    f.write(struct.pack(">i", value))
+
+
+def write_int_array(f: BinaryIO, name: str, values: Sequence[int]) -> None:
+    write_tag_header(f, TAG_INT_ARRAY, name)
+    f.write(struct.pack(f">i{len(values)}i", len(values), *values))
+
+
+def write_byte_array(f: BinaryIO, name: str, values: bytes | bytearray) -> None:
+    write_tag_header(f, TAG_BYTE_ARRAY, name)
+    f.write(struct.pack(">i", len(values)))
+    f.write(values)
+
+
+def write_empty_compound_list(f: BinaryIO, name: str) -> None:
+    write_tag_header(f, TAG_LIST, name)
+    f.write(struct.pack(">bi", TAG_COMPOUND, 0))
+
+
+def write_compound_end(f: BinaryIO) -> None:
+    f.write(bytes([TAG_END]))
+
+
+def encode_varints(values: Sequence[int]) -> bytearray:
+    encoded: bytearray = bytearray()
+    for value in values:
+        while value >= 0x80:
+            encoded.append(value & 0x7F | 0x80)
+            value >>= 7
+        encoded.append(value)
+
+    return encoded
+
+
+class SpongeSchematicWriter:
+    def __init__(self, palette: Sequence[str]) -> None:
+        self.palette: list[str] = ["minecraft:air"] + list(palette)
+
+    def write(self,
+              file_path: str,
+              xs: Sequence[int],
+              ys: Sequence[int],
+              zs: Sequence[int],
+              block_ids: Sequence[int]) -> None:
+        min_x, min_y, min_z = min(xs), min(ys), min(zs)
+        width: int = max(xs) - min_x + 1
+        height: int = max(ys) - min_y + 1
+        length: int = max(zs) - min_z + 1
+
+        block_data: bytearray = self.build_block_data(xs, ys, zs, block_ids, (min_x, min_y, min_z),
+                                                      width, length, width * height * length)
+
+        with gzip.open(file_path, "wb") as f:
+            write_tag_header(f, TAG_COMPOUND, "Schematic")
+            write_int(f, "Version", sponge_schematic_version)
+            write_int(f, "DataVersion", data_version_1_18_2)
+
+            write_tag_header(f, TAG_COMPOUND, "Metadata")
+            write_int(f, "WEOffsetX", min_x)
+            write_int(f, "WEOffsetY", min_y)
+            write_int(f, "WEOffsetZ", min_z)
+            write_compound_end(f)
+
+            write_short(f, "Width", width)
+            write_short(f, "Height", height)
+            write_short(f, "Length", length)
+            write_int_array(f, "Offset", (min_x, min_y, min_z))
+
+            write_int(f, "PaletteMax", len(self.palette))
+            write_tag_header(f, TAG_COMPOUND, "Palette")
+            for palette_id, block_state in enumerate(self.palette):
+                write_int(f, block_state, palette_id)
+            write_compound_end(f)
+
+            write_byte_array(f, "BlockData", block_data)
+            write_empty_compound_list(f, "BlockEntities")
+            write_compound_end(f)
+
+    def build_block_data(self,
+                         xs: Sequence[int],
+                         ys: Sequence[int],
+                         zs: Sequence[int],
+                         block_ids: Sequence[int],
+                         origin: tuple[int, int, int],
+                         width: int,
+                         length: int,
+                         volume: int) -> bytearray:
+        min_x, min_y, min_z = origin
+        layer_size: int = width * length
+
+        palette_ids: bytearray | list[int] = bytearray(volume) if len(self.palette) <= 0x80 else [0] * volume
+        for x, y, z, block_id in zip(xs, ys, zs, block_ids):
+            palette_ids[(x - min_x) + (z - min_z) * width + (y - min_y) * layer_size] = block_id + 1
+
+        if isinstance(palette_ids, bytearray):
+            return palette_ids
+
+        return encode_varints(palette_ids)
@@ -0,0 +1,89 @@
+import random
+
+from assembler.assembler import Assembler
+from assembler.lexer import tokenize_lines
+from assembler.program_optimizer import ProgramOptimizer
+from assembler.source_line import SourceLine
+from emulator.emulator import Emulator
+from emulator.emulator_exception import EmulatorException
+
+
+register_operations: tuple[str, ...] = ("ADD", "SUB", "NOR", "AND", "XOR")
+copy_operations: tuple[str, ...] = ("MOV", "CMP", "NOT", "NEG", "LSH", "RSH")
+conditions: tuple[str, ...] = ("z", "nz", "c", "nc", "eq", "<")
+program_registers: tuple[int, ...] = (0, 1, 2, 3, 3, 2)
+max_run_steps: int = 20000
+
+
+def pick_register(rng: random.Random) -> str:
+    return f"r{rng.choice(program_registers)}"
+
+
+def generate_instruction(rng: random.Random, target: str | None, with_calls: bool) -> str:
+    choice: float = rng.random()
+    if choice < 0.25:
+        return f"{rng.choice(register_operations)} {pick_register(rng)} {pick_register(rng)} {pick_register(rng)}"
+    if choice < 0.32:
+        return f"LDI {pick_register(rng)} {rng.choice((0, 1, 2, 255, 5))}"
+    if choice < 0.45:
+        return f"{rng.choice(('INC', 'DEC'))} {pick_register(rng)}"
+    if choice < 0.5:
+        return f"ADI {pick_register(rng)} {rng.choice((0, 1, -1, 3))}"
+    if choice < 0.58:
+        return f"{rng.choice(copy_operations)} {pick_register(rng)} {pick_register(rng)}"
+    if choice < 0.62:
+        return f"STR {pick_register(rng)} {pick_register(rng)}"
+    if choice < 0.64:
+        return f"LOD {pick_register(rng)} {pick_register(rng)}"
+    if choice < 0.8 and target is not None:
+        return f"BRH {rng.choice(conditions)} {target}"
+    if choice < 0.86 and target is not None:
+        return f"JMP {target}"
+    if choice < 0.89 and target is not None and with_calls:
+        return f"CAL {target}"
+    if choice < 0.9 and with_calls:
+        return "RET"
+    if choice < 0.92:
+        return "HLT"
+
+    return "NOP"
+
+
+def generate_program(rng: random.Random, with_calls: bool = False) -> list[str]:
+    size: int = rng.randrange(5, 60)
+    label_positions: dict[int, list[str]] = {}
+    for label_index in range(size // 3):
+        label_positions.setdefault(rng.randrange(size), []).append(f".l{label_index}")
+    labels: list[str] = [label for position_labels in label_positions.values() for label in position_labels]
+
+    lines: list[str] = []
+    for address in range(size):
+        forward_labels: list[str] = [label for position, position_labels in label_positions.items()
+                                     if position > address for label in position_labels]
+        target: str | None = None
+        if len(forward_labels) != 0:
+            target = rng.choice(labels if rng.random() < 0.3 else forward_labels)
+
+        lines.append(" ".join(label_positions.get(address, []) + [generate_instruction(rng, target, with_calls)]))
+
+    if rng.random() < 0.7:
+        lines.append("HLT")
+    return lines
+
+
+def build_program(lines: list[str], optimizers: tuple[ProgramOptimizer, ...] = ()) -> list[int]:
+    instructions: list[SourceLine] = list(tokenize_lines(lines))
+    for optimizer in optimizers:
+        instructions = optimizer.optimize(instructions)
+
+    return list(Assembler(16).assemble_lines(instructions))
+
+
+def run_program(machine_code: list[int]) -> tuple | None:
+    emulator: Emulator = Emulator(machine_code)
+    try:
+        emulator.run(max_run_steps)
+    except EmulatorException:
+        return None
+
+    return (emulator.registers, emulator.memory) if emulator.halted else None
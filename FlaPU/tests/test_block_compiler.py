@@ -0,0 +1,53 @@
+import random
+import unittest
+
+from emulator.block_compiler import BlockCompilerEmulator
+from emulator.emulator import Emulator
+from emulator.emulator_exception import EmulatorException
+
+
+branch_opcodes: tuple[int, ...] = (10, 11, 12)
+
+
+def generate_rom(rng: random.Random) -> list[int]:
+    size: int = rng.randint(5, 60)
+    rom: list[int] = []
+    for _ in range(size):
+        opcode: int = rng.choice(range(16))
+        if opcode in branch_opcodes:
+            rom.append((opcode << 12) | (rng.randint(0, 3) << 10) | rng.randint(0, size))
+        else:
+            rom.append((opcode << 12) | rng.randint(0, 4095))
+
+    return rom
+
+
+def run_emulator(emulator: Emulator) -> tuple:
+    error: str | None = None
+    try:
+        for max_steps in (7, 13, 1000, 5000):
+            emulator.run(max_steps)
+    except EmulatorException as e:
+        error = str(e)
+
+    return (error, emulator.registers, emulator.memory, emulator.call_stack, emulator.zero_flag,
+            emulator.carry_flag, emulator.pc, emulator.halted, emulator.executed_instructions)
+
+
+class BlockCompilerTest(unittest.TestCase):
+    def test_same_state_as_interpreter_on_random_roms(self) -> None:
+        for seed in range(200):
+            rom: list[int] = generate_rom(random.Random(seed))
+            with self.subTest(seed=seed):
+                self.assertEqual(run_emulator(BlockCompilerEmulator(rom)), run_emulator(Emulator(rom)))
+
+    def test_fault_reports_faulting_address(self) -> None:
+        emulator: BlockCompilerEmulator = BlockCompilerEmulator([0b1000000100000001, 0b1101000000000000])
+
+        with self.assertRaises(EmulatorException):
+            emulator.run(10)
+        self.assertEqual((emulator.pc, emulator.executed_instructions, emulator.registers[1]), (1, 2, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import random
+import unittest
+
+from assembler.block_layout import BlockLayoutOptimizer
+from assembler.lexer import tokenize_lines
+from assembler.peephole_optimizer import PeepholeOptimizer
+from assembler.source_line import SourceLine
+from .random_programs import build_program, generate_program, run_program
+
+
+def optimize(lines: list[str]) -> list[str]:
+    optimized_lines: list[SourceLine] = BlockLayoutOptimizer(16).optimize(list(tokenize_lines(lines)))
+    return [str(line) for line in optimized_lines]
+
+
+class BlockLayoutOptimizerTest(unittest.TestCase):
+    def test_threads_jump_to_jump(self) -> None:
+        optimized_lines: list[str] = optimize(["BRH z .middle", "HLT", ".middle JMP .end", ".end LDI r1 1", "HLT"])
+
+        self.assertIn("BRH z .end", optimized_lines[0])
+
+    def test_drops_unreachable_blocks(self) -> None:
+        self.assertEqual(len(optimize(["JMP .end", "LDI r1 1", "LDI r2 2", ".end HLT"])), 1)
+
+    def test_removes_jump_after_branch(self) -> None:
+        optimized_lines: list[str] = optimize(["CMP r1 r2", "BRH z .skip", "JMP .far", ".skip LDI r1 1", "HLT",
+                                               ".far LDI r2 2", "HLT"])
+
+        self.assertEqual(len(optimized_lines), 6)
+        self.assertFalse(any("JMP" in line for line in optimized_lines))
+
+    def test_behavior_unchanged_on_random_programs(self) -> None:
+        for seed in range(150):
+            lines: list[str] = generate_program(random.Random(seed))
+            expected_result: tuple | None = run_program(build_program(lines))
+            if expected_result is None:
+                continue
+
+            with self.subTest(seed=seed):
+                self.assertEqual(run_program(build_program(lines, (BlockLayoutOptimizer(16),))), expected_result)
+                self.assertEqual(run_program(build_program(lines, (BlockLayoutOptimizer(16),
+                                                                   PeepholeOptimizer(16)))), expected_result)
+
+
+if __name__ == "__main__":
+    unittest.main()
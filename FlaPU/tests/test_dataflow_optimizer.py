@@ -0,0 +1,58 @@
+import random
+import unittest
+
+from assembler.block_layout import BlockLayoutOptimizer
+from assembler.dataflow_optimizer import DataflowOptimizer
+from assembler.lexer import tokenize_lines
+from assembler.peephole_optimizer import PeepholeOptimizer
+from assembler.source_line import SourceLine
+from .random_programs import build_program, generate_program, run_program
+
+
+def optimize(lines: list[str]) -> list[str]:
+    optimized_lines: list[SourceLine] = DataflowOptimizer(16).optimize(list(tokenize_lines(lines)))
+    return [str(line) for line in optimized_lines]
+
+
+class DataflowOptimizerTest(unittest.TestCase):
+    def test_removes_load_of_value_held_on_every_path(self) -> None:
+        optimized_lines: list[str] = optimize(["LDI r1 5", "BRH z .other", "LDI r2 1", "JMP .join",
+                                               ".other LDI r2 2", ".join LDI r1 5", "ADD r1 r2 r3", "STR r0 r3",
+                                               "HLT"])
+
+        self.assertEqual(sum(line.endswith("LDI r1 5") for line in optimized_lines), 1)
+
+    def test_removes_compare_after_subtraction(self) -> None:
+        optimized_lines: list[str] = optimize(["SUB r1 r2 r3", "CMP r1 r2", "BRH z .equal", "STR r0 r3",
+                                               ".equal HLT"])
+
+        self.assertNotIn("CMP r1 r2", optimized_lines)
+
+    def test_folds_addition_of_known_value(self) -> None:
+        self.assertIn("LDI r1 8", optimize(["LDI r1 5", "ADI r1 3", "STR r0 r1", "HLT"]))
+
+    def test_keeps_values_across_call(self) -> None:
+        lines: list[str] = ["LDI r1 5", "CAL .change", "LDI r1 5", "STR r0 r1", "HLT", ".change LDI r1 7", "RET"]
+
+        self.assertEqual(len(optimize(lines)), len(lines))
+
+    def test_load_into_register_analyzed(self) -> None:
+        optimized_lines: list[str] = optimize(["LDI r1 3", "LOD r1 r2 0", "STR r0 r2", "HLT"])
+
+        self.assertEqual(len(optimized_lines), 4)
+
+    def test_behavior_unchanged_on_random_programs(self) -> None:
+        for seed in range(150):
+            lines: list[str] = generate_program(random.Random(seed), with_calls=True)
+            expected_result: tuple | None = run_program(build_program(lines))
+            if expected_result is None:
+                continue
+
+            with self.subTest(seed=seed):
+                self.assertEqual(run_program(build_program(lines, (DataflowOptimizer(16),))), expected_result)
+                self.assertEqual(run_program(build_program(lines, (BlockLayoutOptimizer(16), DataflowOptimizer(16),
+                                                                   PeepholeOptimizer(16)))), expected_result)
+
+
+if __name__ == "__main__":
+    unittest.main()
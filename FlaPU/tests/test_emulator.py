@@ -0,0 +1,59 @@
+import unittest
+
+from assembler.assembler import Assembler
+from assembler.lexer import tokenize_lines
+from emulator.emulator import Emulator
+from emulator.emulator_exception import EmulatorException
+
+
+def run_lines(lines: list[str], max_steps: int = 1000) -> Emulator:
+    emulator: Emulator = Emulator(list(Assembler(16).assemble_lines(tokenize_lines(lines))))
+    emulator.run(max_steps)
+    return emulator
+
+
+class EmulatorTest(unittest.TestCase):
+    def test_addition_sets_carry(self) -> None:
+        emulator: Emulator = run_lines(["LDI r1 200", "LDI r2 100", "ADD r1 r2 r3", "HLT"])
+
+        self.assertTrue(emulator.halted)
+        self.assertEqual(emulator.registers[3], 44)
+        self.assertTrue(emulator.carry_flag)
+        self.assertFalse(emulator.zero_flag)
+
+    def test_register_zero_discards_writes(self) -> None:
+        emulator: Emulator = run_lines(["LDI r0 5", "ADD r0 r0 r1", "HLT"])
+
+        self.assertEqual(emulator.registers[:2], [0, 0])
+        self.assertTrue(emulator.zero_flag)
+
+    def test_loop_with_branch(self) -> None:
+        emulator: Emulator = run_lines(["LDI r1 5", ".loop ADI r2 3", "DEC r1", "BRH nz .loop", "HLT"])
+
+        self.assertEqual(emulator.registers[2], 15)
+        self.assertEqual(emulator.executed_instructions, 17)
+
+    def test_memory_and_subroutine(self) -> None:
+        emulator: Emulator = run_lines(["LDI r1 10", "LDI r2 42", "CAL .store", "LOD r1 r3 -1", "HLT",
+                                        ".store STR r1 r2 -1", "RET"])
+
+        self.assertEqual(emulator.memory[9], 42)
+        self.assertEqual(emulator.registers[3], 42)
+        self.assertEqual(emulator.call_stack, [])
+
+    def test_step_limit(self) -> None:
+        emulator: Emulator = run_lines([".loop JMP .loop"], max_steps=50)
+
+        self.assertFalse(emulator.halted)
+        self.assertEqual(emulator.executed_instructions, 50)
+
+    def test_return_with_empty_stack(self) -> None:
+        emulator: Emulator = Emulator(list(Assembler(16).assemble_lines(tokenize_lines(["LDI r1 1", "RET"]))))
+
+        with self.assertRaises(EmulatorException):
+            emulator.run(10)
+        self.assertEqual((emulator.pc, emulator.executed_instructions), (1, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
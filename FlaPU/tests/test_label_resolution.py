@@ -0,0 +1,36 @@
+import os
+import tempfile
+import unittest
+
+from assembler.assembler import Assembler
+from assembler.exceptions.assembling_exception import AssemblingException
+from assembler.lexer import tokenize_lines
+
+
+def assemble(lines: list[str]) -> list[int]:
+    return list(Assembler(16).assemble_lines(tokenize_lines(lines)))
+
+
+class LabelResolutionTest(unittest.TestCase):
+    def test_forward_and_backward_references(self) -> None:
+        machine_code: list[int] = assemble(["JMP .end", ".loop NOP", "JMP .loop", ".end HLT"])
+
+        self.assertEqual(machine_code[0] & 0x3FF, 3)
+        self.assertEqual(machine_code[2] & 0x3FF, 1)
+
+    def test_duplicate_label_rejected(self) -> None:
+        with self.assertRaisesRegex(AssemblingException, "lines 2 and 3"):
+            assemble(["JMP .a", ".a NOP", ".a HLT", "JMP .a"])
+
+    def test_duplicate_label_rejected_in_object(self) -> None:
+        with tempfile.TemporaryDirectory() as folder:
+            asm_file: str = os.path.join(folder, "library.as")
+            with open(asm_file, "w") as f:
+                f.write(".a NOP\n.a HLT\n")
+
+            with self.assertRaisesRegex(AssemblingException, "library"):
+                Assembler(16).assemble_object(asm_file, "library")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import os
+import tempfile
+import unittest
+
+from assembler.assembler import Assembler
+from assembler.exceptions.linker_exception import LinkerException
+from assembler.linker import link_modules
+from assembler.object_module import ObjectModule
+from builder.program_builder import build_program
+from emulator.emulator import Emulator
+
+
+def assemble_module(folder: str, module_name: str, source: str) -> ObjectModule:
+    asm_file: str = os.path.join(folder, f"{module_name}.as")
+    with open(asm_file, "w") as f:
+        f.write(source)
+
+    return Assembler(16).assemble_object(asm_file, module_name)
+
+
+class LinkerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temporary_folder = tempfile.TemporaryDirectory()
+        self.folder: str = self.temporary_folder.name
+
+    def tearDown(self) -> None:
+        self.temporary_folder.cleanup()
+
+    def test_exported_labels_resolved(self) -> None:
+        modules: list[ObjectModule] = [
+            assemble_module(self.folder, "main", "import math\nLDI r1 6\nCAL .double\nHLT\n"),
+            assemble_module(self.folder, "math", "export .double\n.double ADD r1 r1 r1\nRET\n"),
+        ]
+        emulator: Emulator = Emulator(link_modules(modules, 1024))
+        emulator.run(100)
+
+        self.assertTrue(emulator.halted)
+        self.assertEqual(emulator.registers[1], 12)
+
+    def test_private_labels_stay_in_their_module(self) -> None:
+        modules: list[ObjectModule] = [
+            assemble_module(self.folder, "main", "import first\nimport second\nCAL .first\nCAL .second\nHLT\n"),
+            assemble_module(self.folder, "first", "export .first\n.first LDI r1 2\n.loop DEC r1\nBRH nz .loop\nRET\n"),
+            assemble_module(self.folder, "second", "export .second\n.second LDI r2 3\n.loop ADI r3 1\nDEC r2\n"
+                                                   "BRH nz .loop\nRET\n"),
+        ]
+        emulator: Emulator = Emulator(link_modules(modules, 1024))
+        emulator.run(100)
+
+        self.assertTrue(emulator.halted)
+        self.assertEqual(emulator.registers[1:4], [0, 0, 3])
+
+    def test_missing_label_rejected(self) -> None:
+        modules: list[ObjectModule] = [assemble_module(self.folder, "main", "CAL .missing\nHLT\n")]
+
+        with self.assertRaises(LinkerException):
+            link_modules(modules, 1024)
+
+    def test_label_exported_twice_rejected(self) -> None:
+        modules: list[ObjectModule] = [assemble_module(self.folder, "first", "export .f\n.f RET\n"),
+                                       assemble_module(self.folder, "second", "export .f\n.f RET\n")]
+
+        with self.assertRaises(LinkerException):
+            link_modules(modules, 1024)
+
+    def test_program_too_large_rejected(self) -> None:
+        modules: list[ObjectModule] = [assemble_module(self.folder, "main", "NOP\nNOP\nHLT\n")]
+
+        with self.assertRaises(LinkerException):
+            link_modules(modules, 2)
+
+    def test_build_program_links_libraries(self) -> None:
+        asm_folder: str = os.path.join(self.folder, "asm")
+        mc_folder: str = os.path.join(self.folder, "mc")
+        os.makedirs(os.path.join(asm_folder, "libraries"))
+        os.makedirs(mc_folder)
+        with open(os.path.join(asm_folder, "program.as"), "w") as f:
+            f.write("import math\nLDI r1 4\nCAL .double\nHLT\n")
+        with open(os.path.join(asm_folder, "libraries", "math.as"), "w") as f:
+            f.write("export .double\n.double ADD r1 r1 r1\nRET\n")
+
+        for _ in range(2):
+            build_program("program", asm_folder, mc_folder, self.folder, outputs=frozenset({"mc"}))
+            with open(os.path.join(mc_folder, "program.mc"), "r") as f:
+                emulator: Emulator = Emulator([int(line, 2) for line in f if line.strip() != ""])
+            emulator.run(100)
+
+            self.assertEqual(emulator.registers[1], 8)
+        self.assertTrue(os.path.exists(os.path.join(mc_folder, ".objects", "math.json")))
+
+
+if __name__ == "__main__":
+    unittest.main()
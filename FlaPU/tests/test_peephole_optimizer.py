@@ -0,0 +1,42 @@
+import random
+import unittest
+
+from assembler.lexer import tokenize_lines
+from assembler.peephole_optimizer import PeepholeOptimizer
+from assembler.source_line import SourceLine
+from .random_programs import build_program, generate_program, run_program
+
+
+def optimize(lines: list[str]) -> list[str]:
+    optimized_lines: list[SourceLine] = PeepholeOptimizer(16).optimize(list(tokenize_lines(lines)))
+    return [str(line) for line in optimized_lines]
+
+
+class PeepholeOptimizerTest(unittest.TestCase):
+    def test_removes_move_into_itself(self) -> None:
+        self.assertEqual(len(optimize(["LDI r1 3", "MOV r1 r1", "HLT"])), 2)
+
+    def test_merges_increments(self) -> None:
+        self.assertEqual(len(optimize(["LDI r1 3", "INC r2", "INC r2", "DEC r2", "INC r2", "STR r1 r2", "HLT"])), 4)
+
+    def test_removes_jump_to_next_instruction(self) -> None:
+        self.assertEqual(len(optimize(["JMP .next", ".next HLT"])), 1)
+
+    def test_keeps_flags_read_by_branch(self) -> None:
+        lines: list[str] = ["LDI r1 1", "ADD r1 r1 r0", ".loop BRH c .loop", "HLT"]
+
+        self.assertEqual(len(optimize(lines)), len(lines))
+
+    def test_behavior_unchanged_on_random_programs(self) -> None:
+        for seed in range(150):
+            lines: list[str] = generate_program(random.Random(seed))
+            expected_result: tuple | None = run_program(build_program(lines))
+            if expected_result is None:
+                continue
+
+            with self.subTest(seed=seed):
+                self.assertEqual(run_program(build_program(lines, (PeepholeOptimizer(16),))), expected_result)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+
+from assembler.assembler import Assembler
+from assembler.exceptions.register_allocation_exception import RegisterAllocationException
+from assembler.lexer import tokenize_lines
+from assembler.register_allocator import RegisterAllocator
+from emulator.emulator import Emulator
+
+
+def assemble_program(source: str, assembler: Assembler) -> list[int]:
+    with tempfile.TemporaryDirectory() as folder:
+        asm_file: str = os.path.join(folder, "program.as")
+        with open(asm_file, "w") as f:
+            f.write(source)
+        return list(assembler.assemble_file(asm_file))
+
+
+def run_program(source: str, assembler: Assembler | None = None) -> Emulator:
+    emulator: Emulator = Emulator(assemble_program(source, Assembler(16) if assembler is None else assembler))
+    emulator.run(1000)
+    return emulator
+
+
+class RegisterAllocatorTest(unittest.TestCase):
+    def test_virtual_registers_read_by_subroutine(self) -> None:
+        emulator: Emulator = run_program("LDI %a 5\nLDI %b 7\nCAL .f\nHLT\n.f ADD %a %b r1\nRET\n")
+
+        self.assertTrue(emulator.halted)
+        self.assertEqual(emulator.registers[1], 12)
+
+    def test_virtual_register_written_by_subroutine(self) -> None:
+        emulator: Emulator = run_program("LDI %a 5\nCAL .f\nADD %a %r r1\nHLT\n.f LDI %r 9\nRET\n")
+
+        self.assertTrue(emulator.halted)
+        self.assertEqual(emulator.registers[1], 14)
+
+    def test_virtual_registers_kept_in_registers_across_call(self) -> None:
+        assembler: Assembler = Assembler(16)
+        emulator: Emulator = run_program("LDI %i 10\nLDI %sum 0\n.loop CAL .work\nADD %sum %x %sum\nDEC %i\n"
+                                         "BRH nz .loop\nMOV %sum r1\nHLT\n.work LDI %x 3\nRET\n", assembler)
+
+        self.assertEqual(assembler.register_allocators[0].spill_slots, {})
+        self.assertEqual(emulator.registers[1], 30)
+
+    def test_report_counts_original_accesses(self) -> None:
+        accesses: dict[str, int] = {"%a": 4, "%b": 2, "%c": 4, "%d": 2}
+        register_allocator: RegisterAllocator = RegisterAllocator(4)
+        register_allocator.allocate(list(tokenize_lines(["LDI %a 1", "LDI %b 2", "LDI %c 3", "LDI %d 4",
+                                                         "ADD %a %b %a", "ADD %c %d %c", "ADD %a %c r1", "HLT"])))
+
+        self.assertNotEqual(register_allocator.spill_slots, {})
+        self.assertEqual(register_allocator.virtual_accesses, 12)
+        self.assertEqual(register_allocator.spilled_accesses,
+                         sum(accesses[register] for register in register_allocator.spill_slots))
+        self.assertIn(f"{register_allocator.spilled_accesses} of 12 virtual register accesses",
+                      register_allocator.report())
+
+    def test_program_data_in_spill_area_rejected(self) -> None:
+        spilling_lines: list[str] = ["LDI %a 1", "LDI %b 2", "LDI %c 3", "LDI %d 4", "ADD %a %b %a", "ADD %c %d %c",
+                                     "ADD %a %c r1"]
+
+        with self.assertRaises(RegisterAllocationException):
+            RegisterAllocator(4).allocate(list(tokenize_lines(spilling_lines + ["LDI r2 236", "STR r2 r1 3", "HLT"])))
+        RegisterAllocator(4).allocate(list(tokenize_lines(spilling_lines + ["LDI r2 236", "STR r2 r1 -1", "HLT"])))
+
+if __name__ == "__main__":
+    unittest.main()
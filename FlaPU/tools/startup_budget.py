@@ -0,0 +1,54 @@
+import os
+import subprocess
+import sys
+
+
+startup_budget_ms: float = 60
+measurement_runs: int = 5
+forbidden_modules: tuple[str, ...] = ("numpy", "schematic.schematic", "schematic.layout", "concurrent.futures")
+
+flapu_folder: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure_imports(*arguments: str) -> dict[str, int]:
+    process = subprocess.run([sys.executable, "-X", "importtime", *arguments],
+                             cwd=flapu_folder, capture_output=True, text=True, check=True)
+
+    cumulative_times: dict[str, int] = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        fields: list[str] = line.removeprefix("import time:").split("|")
+        if not fields[1].strip().isdigit():
+            continue
+        cumulative_times[fields[2][1:].rstrip()] = int(fields[1])
+
+    return cumulative_times
+
+
+def check_startup_budget(program_name: str = "example_program") -> bool:
+    interpreter_modules: set[str] = set(measure_imports("-c", "pass"))
+    runs: list[tuple[int, dict[str, int]]] = []
+    for _ in range(measurement_runs):
+        cumulative_times: dict[str, int] = measure_imports("__main__.py", "--mc", program_name)
+        runs.append((sum(cumulative_time for module, cumulative_time in cumulative_times.items()
+                         if module == module.lstrip() and module not in interpreter_modules), cumulative_times))
+
+    top_level_times, cumulative_times = min(runs, key=lambda run: run[0])
+    total_ms: float = top_level_times / 1000
+
+    print(f"Imports of an assemble-only run took {total_ms:.1f}ms on top of the interpreter "
+          f"(budget {startup_budget_ms}ms).")
+    for module, cumulative_time in sorted(cumulative_times.items(), key=lambda item: -item[1])[:10]:
+        print(f"{cumulative_time / 1000:8.1f}ms  {module.strip()}")
+
+    imported_modules: set[str] = {module.strip() for module in cumulative_times}
+    loaded_heavy_modules: list[str] = [module for module in forbidden_modules if module in imported_modules]
+    for module in loaded_heavy_modules:
+        print(f"{module} should not be imported by an assemble-only run.")
+
+    return total_ms <= startup_budget_ms and len(loaded_heavy_modules) == 0
+
+
+if __name__ == '__main__':
+    sys.exit(0 if check_startup_budget(*sys.argv[1:]) else 1)